@@ -0,0 +1,59 @@
+"""Measure the memory a simulator retains per node and per edge.
+
+Models are copied while allocations are traced and then released by the
+caller, so whatever the simulator keeps of them is counted:
+
+    python -m benchmarks.memory --nodes 2000 20000
+"""
+import argparse
+import copy
+import gc
+import json
+import tracemalloc
+import warnings
+from typing import Dict
+
+from semiconductor_resilience.core.simulation import SupplyChainSimulator
+
+from .suite import synthetic_network
+
+
+def measure(num_nodes: int, max_out_degree: int = 5) -> Dict[str, float]:
+    """Load a synthetic network into a simulator and return bytes retained per object."""
+    network = synthetic_network(num_nodes, max_out_degree)
+    nodes, edges = network.to_models()
+
+    gc.collect()
+    tracemalloc.start()
+    simulator = SupplyChainSimulator()
+    for node in copy.deepcopy(nodes):
+        simulator.add_node(node)
+    gc.collect()
+    after_nodes = tracemalloc.get_traced_memory()[0]
+    for edge in copy.deepcopy(edges):
+        simulator.add_edge(edge)
+    gc.collect()
+    after_edges = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {
+        "nodes": network.num_nodes,
+        "edges": network.num_edges,
+        "bytes_per_node": after_nodes / network.num_nodes,
+        "bytes_per_edge": (after_edges - after_nodes) / max(1, network.num_edges),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--max-out-degree", type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    for num_nodes in args.nodes:
+        print(json.dumps(measure(num_nodes, args.max_out_degree)))
+
+
+if __name__ == "__main__":
+    main()
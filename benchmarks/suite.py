@@ -0,0 +1,383 @@
+"""Time and peak-memory benchmarks for the simulator, generator and API.
+
+Every benchmark is run for each requested network size up to its own size
+limit, and results are written as JSON:
+
+    python -m benchmarks.suite --sizes 30 1000 10000 --output results.json
+    python -m benchmarks.suite --compare baseline.json --threshold 1.25
+
+With `--compare`, benchmarks whose median time exceeds `threshold` times
+the baseline are reported and the exit status is 1.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator, SyntheticNetwork
+from semiconductor_resilience.core.metrics_store import MetricsStore
+from semiconductor_resilience.core.simulation import SupplyChainSimulator
+from semiconductor_resilience.data.models import DisruptionScenario
+
+DEFAULT_SIZES = [30, 1000, 10000]
+SEED = 7
+
+# The metrics history grows to `retention_steps` rows per node, so
+# simulators built here keep a short window to fit large networks in memory
+RETENTION_STEPS = 8
+
+
+class Benchmark:
+    """A named operation measured on networks of up to `max_nodes` nodes.
+
+    `setup(size)` builds whatever the operation needs and returns a
+    zero-argument callable that performs it once; only that call is timed.
+    """
+
+    def __init__(self, name: str, setup: Callable[[int], Callable[[], Any]], max_nodes: int, repeat: int):
+        self.name = name
+        self.setup = setup
+        self.max_nodes = max_nodes
+        self.repeat = repeat
+
+    def run(self, size: int) -> Dict[str, Any]:
+        operation = self.setup(size)
+        times = []
+        for _ in range(self.repeat):
+            gc.collect()
+            start = time.perf_counter()
+            operation()
+            times.append(time.perf_counter() - start)
+
+        # Peak memory is measured in a separate call, since tracing slows it down
+        gc.collect()
+        tracemalloc.start()
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            "benchmark": self.name,
+            "nodes": size,
+            "repeat": self.repeat,
+            "min_s": min(times),
+            "median_s": statistics.median(times),
+            "mean_s": statistics.fmean(times),
+            "peak_bytes": peak,
+        }
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(max_nodes: int = 1_000_000, repeat: int = 5, name: Optional[str] = None) -> Callable:
+    """Register a setup function as a benchmark."""
+
+    def register(setup: Callable[[int], Callable[[], Any]]) -> Callable[[int], Callable[[], Any]]:
+        key = name or setup.__name__
+        BENCHMARKS[key] = Benchmark(key, setup, max_nodes, repeat)
+        return setup
+
+    return register
+
+
+# ----------------------------------------------------------------------
+# Fixtures
+# ----------------------------------------------------------------------
+def tier_counts(num_nodes: int) -> Dict[str, int]:
+    """Split a node count into fabs, suppliers and customers."""
+    num_fabs = max(1, num_nodes // 5)
+    num_suppliers = max(1, num_nodes // 2)
+    return {
+        "num_fabs": num_fabs,
+        "num_suppliers": num_suppliers,
+        "num_customers": max(1, num_nodes - num_fabs - num_suppliers),
+    }
+
+
+@lru_cache(maxsize=None)
+def synthetic_network(num_nodes: int, max_out_degree: int = 5, seed: int = SEED) -> SyntheticNetwork:
+    """Return a reproducible columnar network of `num_nodes` nodes."""
+    return SupplyChainDataGenerator(seed).generate_network(
+        **tier_counts(num_nodes), max_out_degree=max_out_degree
+    )
+
+
+@lru_cache(maxsize=None)
+def network_models(num_nodes: int) -> tuple:
+    return synthetic_network(num_nodes).to_models()
+
+
+def loaded_simulator(num_nodes: int, engine: str = "python") -> SupplyChainSimulator:
+    """Return a simulator with the models of `synthetic_network(num_nodes)` added."""
+    nodes, edges = network_models(num_nodes)
+    simulator = SupplyChainSimulator(
+        engine=engine, metrics_store=MetricsStore(retention_steps=RETENTION_STEPS)
+    )
+    for node in nodes:
+        simulator.add_node(node)
+    for edge in edges:
+        simulator.add_edge(edge)
+    return simulator
+
+
+def array_simulator(num_nodes: int, engine: str = "vectorized") -> SupplyChainSimulator:
+    """Return an array-only simulator over `synthetic_network(num_nodes)`."""
+    simulator = SupplyChainSimulator(
+        engine=engine, metrics_store=MetricsStore(retention_steps=RETENTION_STEPS)
+    )
+    simulator.arrays = synthetic_network(num_nodes).to_arrays()
+    return simulator
+
+
+def regional_scenario() -> DisruptionScenario:
+    """Return the first predefined scenario, which hits a region rather than every node."""
+    return SupplyChainDataGenerator(SEED).scenario_catalogue()[0]
+
+
+def fresh(scenario: DisruptionScenario) -> DisruptionScenario:
+    return scenario.copy(update={"affected_nodes": [], "affected_edges": []})
+
+
+# ----------------------------------------------------------------------
+# Generator
+# ----------------------------------------------------------------------
+@benchmark(max_nodes=1000, repeat=3)
+def generate_supply_chain(size: int) -> Callable[[], Any]:
+    counts = tier_counts(size)
+    return lambda: SupplyChainDataGenerator(SEED).generate_supply_chain(**counts)
+
+
+@benchmark(repeat=3)
+def generate_network(size: int) -> Callable[[], Any]:
+    counts = tier_counts(size)
+    return lambda: SupplyChainDataGenerator(SEED).generate_network(**counts, max_out_degree=5)
+
+
+# ----------------------------------------------------------------------
+# Simulator
+# ----------------------------------------------------------------------
+@benchmark(max_nodes=100_000, repeat=3)
+def bulk_load(size: int) -> Callable[[], Any]:
+    """`add_node` and `add_edge` for every model of the network."""
+    network_models(size)
+    return lambda: loaded_simulator(size)
+
+
+@benchmark(max_nodes=100_000)
+def apply_disruption(size: int) -> Callable[[], Any]:
+    simulator = loaded_simulator(size)
+    scenario = regional_scenario()
+    return lambda: simulator.apply_disruption(fresh(scenario))
+
+
+@benchmark(max_nodes=10_000, name="simulate_step[python]")
+def simulate_step_python(size: int) -> Callable[[], Any]:
+    simulator = loaded_simulator(size, engine="python")
+    return simulator.simulate_step
+
+
+@benchmark(max_nodes=100_000, name="simulate_step[incremental]")
+def simulate_step_incremental(size: int) -> Callable[[], Any]:
+    """Array engine step including `SupplyChainMetrics` model construction."""
+    simulator = loaded_simulator(size, engine="incremental")
+    return simulator.simulate_step
+
+
+@benchmark(name="simulate_step_arrays[vectorized]")
+def simulate_step_arrays_vectorized(size: int) -> Callable[[], Any]:
+    return array_simulator(size, engine="vectorized").simulate_step_arrays
+
+
+@benchmark(name="simulate_step_arrays[incremental]")
+def simulate_step_arrays_incremental(size: int) -> Callable[[], Any]:
+    simulator = array_simulator(size, engine="incremental")
+    simulator.simulate_step_arrays()
+    return simulator.simulate_step_arrays
+
+
+@benchmark(max_nodes=100_000, repeat=3)
+def calculate_risk_assessment(size: int) -> Callable[[], Any]:
+    """One assessment per node against a single scenario."""
+    simulator = loaded_simulator(size)
+    # `RiskAssessment` rejects impact scores above 1, so the scenario is kept
+    # mild enough for every node to pass; the work done does not depend on it
+    scenario = regional_scenario().copy(update={"impact_severity": 1e-6})
+    node_ids = list(simulator.state.nodes)
+    return lambda: [simulator.calculate_risk_assessment(node_id, scenario) for node_id in node_ids]
+
+
+@benchmark(max_nodes=100_000, repeat=3)
+def calculate_risk_matrix(size: int) -> Callable[[], Any]:
+    """Every node against every predefined scenario, then the top 10 per scenario."""
+    simulator = loaded_simulator(size)
+    scenarios = SupplyChainDataGenerator(SEED).scenario_catalogue()
+    return lambda: simulator.calculate_risk_matrix(scenarios).top_k(10)
+
+
+@benchmark()
+def get_supply_chain_health(size: int) -> Callable[[], Any]:
+    return array_simulator(size).get_supply_chain_health
+
+
+# ----------------------------------------------------------------------
+# API, through an in-process test client
+# ----------------------------------------------------------------------
+def api_session(size: int) -> tuple:
+    """Return a test client and the id of a session holding the size's network."""
+    from fastapi.testclient import TestClient
+
+    from semiconductor_resilience.api import main
+
+    simulator = loaded_simulator(size, engine="incremental")
+    simulator.simulate_step()
+    session = main.registry.create(simulator, SupplyChainDataGenerator(SEED))
+    return TestClient(main.app), session.sim_id
+
+
+def checked(response: Any) -> Any:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text[:200]}")
+    return response
+
+
+@benchmark(max_nodes=1000, repeat=3)
+def api_initialize(size: int) -> Callable[[], Any]:
+    from fastapi.testclient import TestClient
+
+    from semiconductor_resilience.api import main
+
+    client = TestClient(main.app)
+    return lambda: checked(client.post("/simulation/initialize", params=tier_counts(size)))
+
+
+@benchmark(max_nodes=10_000, repeat=3)
+def api_step(size: int) -> Callable[[], Any]:
+    """Full state response."""
+    client, sim_id = api_session(size)
+    return lambda: checked(client.post(f"/simulations/{sim_id}/step"))
+
+
+@benchmark(max_nodes=100_000)
+def api_step_delta(size: int) -> Callable[[], Any]:
+    """Delta response against the previous step's version."""
+    client, sim_id = api_session(size)
+    version = [checked(client.post(f"/simulations/{sim_id}/step")).json()["version"]]
+
+    def step() -> None:
+        response = checked(client.post(f"/simulations/{sim_id}/step", params={"since_version": version[0]}))
+        version[0] = response.json()["version"]
+
+    return step
+
+
+@benchmark(max_nodes=10_000)
+def api_disruption(size: int) -> Callable[[], Any]:
+    client, sim_id = api_session(size)
+    body = json.loads(fresh(regional_scenario()).json())
+    return lambda: checked(client.post(f"/simulations/{sim_id}/disruption", json=body))
+
+
+@benchmark(max_nodes=100_000)
+def api_health(size: int) -> Callable[[], Any]:
+    client, sim_id = api_session(size)
+    return lambda: checked(client.get(f"/simulations/{sim_id}/health"))
+
+
+@benchmark(max_nodes=100_000)
+def api_risk_matrix(size: int) -> Callable[[], Any]:
+    client, sim_id = api_session(size)
+    return lambda: checked(client.post(f"/simulations/{sim_id}/risk/matrix", json={"top_k": 10}))
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+def environment() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def run(names: List[str], sizes: List[int]) -> Dict[str, Any]:
+    results = []
+    for name in names:
+        bench = BENCHMARKS[name]
+        for size in sizes:
+            if size > bench.max_nodes:
+                continue
+            result = bench.run(size)
+            results.append(result)
+            print(
+                f"{name:<36} {size:>9} nodes  median {result['median_s'] * 1000:10.2f} ms"
+                f"  peak {result['peak_bytes'] / 2**20:9.1f} MB",
+                file=sys.stderr,
+            )
+    return {"environment": environment(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return descriptions of benchmarks more than `threshold` times slower than the baseline."""
+    reference = {(result["benchmark"], result["nodes"]): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = reference.get((result["benchmark"], result["nodes"]))
+        if previous is None:
+            continue
+        ratio = result["median_s"] / previous["median_s"]
+        if ratio > threshold:
+            regressions.append(
+                f"{result['benchmark']} at {result['nodes']} nodes: {ratio:.2f}x slower "
+                f"({previous['median_s'] * 1000:.2f} ms -> {result['median_s'] * 1000:.2f} ms)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--output", type=Path, help="write results here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="baseline results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    results = run(args.only or list(BENCHMARKS), args.sizes)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare is not None:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
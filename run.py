@@ -2,7 +2,6 @@ import multiprocessing
 import subprocess
 import sys
 import time
-from pathlib import Path
 
 import uvicorn
 
@@ -20,7 +19,7 @@ def run_backend():
 def run_frontend():
     """Run the Dash frontend server."""
     subprocess.run(
-        [sys.executable, str(Path("semiconductor_resilience/web/app.py"))],
+        [sys.executable, "-m", "semiconductor_resilience.web.app"],
         check=True,
     )
 
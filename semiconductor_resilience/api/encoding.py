@@ -0,0 +1,327 @@
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from fastapi import HTTPException
+
+from ..core.engine import METRIC_NAMES
+from ..core.metrics_store import metric_ids
+from ..core.simulation import SupplyChainSimulator
+from ..data.models import NodeRecord
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Order of the tables in columnar responses
+TABLE_NAMES = ("nodes", "edges", "metrics")
+
+Column = Union[np.ndarray, List[str]]
+
+
+def available_media_types() -> List[str]:
+    media_types = [JSON_MEDIA_TYPE]
+    if pa is not None:
+        media_types.append(ARROW_MEDIA_TYPE)
+    if msgpack is not None:
+        media_types.append(MSGPACK_MEDIA_TYPE)
+    return media_types
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response media type for an Accept header.
+
+    Media types are tried by descending quality, then in header order.
+    Encodings whose library is not installed are skipped; if nothing
+    acceptable remains, a 406 is raised.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, _, parameters = part.partition(";")
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type.strip().lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+        if media_type == ARROW_MEDIA_TYPE and pa is not None:
+            return ARROW_MEDIA_TYPE
+        if media_type in (MSGPACK_MEDIA_TYPE, "application/x-msgpack") and msgpack is not None:
+            return MSGPACK_MEDIA_TYPE
+    raise HTTPException(
+        status_code=406,
+        detail=f"No acceptable encoding is available. Supported: {', '.join(available_media_types())}.",
+    )
+
+
+def _node_rows(
+    simulator: SupplyChainSimulator, node_ids: Optional[List[str]]
+) -> Tuple[List[str], List[NodeRecord], Dict[str, np.ndarray]]:
+    """Ids, records and numeric columns of `node_ids`, or of all nodes if None."""
+    table = simulator.state.nodes
+    if node_ids is None:
+        node_ids = list(table)
+    records = [table.record(node_id) for node_id in node_ids]
+    slots = np.fromiter((record.slot for record in records), dtype=np.intp, count=len(records))
+    arrays = simulator.arrays
+    return node_ids, records, {name: arrays.node_column(name)[slots] for name in arrays.NODE_FIELDS}
+
+
+def _edge_slots(simulator: SupplyChainSimulator, edge_ids: Optional[List[str]]) -> np.ndarray:
+    """Slots of `edge_ids`, or of all edges if None."""
+    table = simulator.state.edges
+    if edge_ids is None:
+        return table.slots()
+    return np.array([table.slot(edge_id) for edge_id in edge_ids], dtype=np.intp)
+
+
+def _edge_endpoints(simulator: SupplyChainSimulator, slots: np.ndarray) -> Tuple[List[str], ...]:
+    arrays = simulator.arrays
+    edge_ids, node_ids = arrays.edge_ids, arrays.node_ids
+    return (
+        [edge_ids[slot] for slot in slots.tolist()],
+        [node_ids[node] for node in arrays.edge_source[slots].tolist()],
+        [node_ids[node] for node in arrays.edge_target[slots].tolist()],
+    )
+
+
+def state_tables(
+    simulator: SupplyChainSimulator,
+    node_ids: Optional[List[str]],
+    edge_ids: Optional[List[str]],
+    metrics: Dict[str, np.ndarray],
+) -> Dict[str, Dict[str, Column]]:
+    """Lay out nodes, edges and `MetricsStore.to_columns` output as tables.
+
+    Only `node_ids` and `edge_ids` are included, or every node or edge if
+    None. Numeric columns are gathered from the simulator's arrays and the
+    rest from its node records, without building models.
+    """
+    node_ids, records, node_values = _node_rows(simulator, node_ids)
+    slots = _edge_slots(simulator, edge_ids)
+    edge_ids, source_ids, target_ids = _edge_endpoints(simulator, slots)
+    arrays = simulator.arrays
+    return {
+        "nodes": {
+            "id": node_ids,
+            "name": [record.name for record in records],
+            "type": [record.type.value for record in records],
+            "country": [record.country for record in records],
+            "region": [record.region for record in records],
+            "city": [record.city for record in records],
+            "latitude": np.array([record.latitude for record in records], dtype=np.float64),
+            "longitude": np.array([record.longitude for record in records], dtype=np.float64),
+            **{name: node_values[name].astype(np.float64) for name in arrays.NODE_FIELDS},
+        },
+        "edges": {
+            "id": edge_ids,
+            "source_id": source_ids,
+            "target_id": target_ids,
+            "lead_time_days": arrays.edge_column("lead_time_days")[slots].astype(np.int64),
+            **{
+                name: arrays.edge_column(name)[slots].astype(np.float64)
+                for name in ("reliability_score", "capacity", "cost_per_unit")
+            },
+        },
+        "metrics": metrics,
+    }
+
+
+def encode_json(
+    header: Dict,
+    simulator: SupplyChainSimulator,
+    node_ids: Optional[List[str]],
+    edge_ids: Optional[List[str]],
+    metrics: Dict[str, np.ndarray],
+    metric_node_ids: List[str],
+    all_nodes: bool,
+) -> bytes:
+    """Serialize a state in the `SimulationResponse` layout with orjson.
+
+    Node and edge rows are plain dicts in the layout of `SupplyChainNode`
+    and `SupplyChainEdge`, built from the simulator's records and arrays;
+    `node_ids` and `edge_ids` select them as in `state_tables`. Metric rows
+    are built straight from the columnar history instead of being validated
+    as `SupplyChainMetrics` one by one, with the same ids and timestamps
+    `MetricsStore.to_models` gives them. With `all_nodes`, nodes without
+    metric rows are listed with empty histories.
+    """
+    order = np.argsort(metrics["node"], kind="stable")
+    node_codes, starts = np.unique(metrics["node"][order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+
+    ids = metric_ids(metric_node_ids, metrics["node"][order], metrics["timestamp"][order])
+    timestamps = metrics["timestamp"][order].astype(datetime).tolist()
+    columns = {name: metrics[name][order].tolist() for name in METRIC_NAMES}
+
+    history: Dict[str, List[Dict]] = (
+        {node_id: [] for node_id in metric_node_ids} if all_nodes else {}
+    )
+    for code, start, end in zip(node_codes.tolist(), starts.tolist(), ends.tolist()):
+        node_id = metric_node_ids[code]
+        history[node_id] = [
+            {
+                "id": ids[row],
+                "timestamp": timestamps[row],
+                "node_id": node_id,
+                **{name: columns[name][row] for name in METRIC_NAMES},
+                "created_at": timestamps[row],
+                "updated_at": timestamps[row],
+            }
+            for row in range(start, end)
+        ]
+
+    node_ids, records, node_values = _node_rows(simulator, node_ids)
+    capacity, utilization, risk_score = (
+        node_values[name].tolist() for name in ("capacity", "utilization", "risk_score")
+    )
+    nodes = [
+        {
+            "id": node_id,
+            "name": record.name,
+            "type": record.type,
+            "location": {
+                "id": record.location_id,
+                "country": record.country,
+                "region": record.region,
+                "city": record.city,
+                "latitude": record.latitude,
+                "longitude": record.longitude,
+                "risk_score": record.location_risk,
+            },
+            "capacity": capacity[row],
+            "utilization": utilization[row],
+            "process_nodes": record.process_nodes,
+            "chip_types": record.chip_types,
+            "risk_score": risk_score[row],
+            "created_at": record.created_at,
+            "updated_at": record.updated_at,
+        }
+        for row, (node_id, record) in enumerate(zip(node_ids, records))
+    ]
+
+    slots = _edge_slots(simulator, edge_ids)
+    edge_ids, source_ids, target_ids = _edge_endpoints(simulator, slots)
+    arrays, table = simulator.arrays, simulator.state.edges
+    edge_columns = {
+        name: arrays.edge_column(name)[slots].tolist()
+        for name in ("lead_time_days", "reliability_score", "capacity", "cost_per_unit")
+    }
+    lead_times = [int(days) for days in edge_columns["lead_time_days"]]
+    created_at = table.created_at[slots].tolist()
+    updated_at = table.updated_at[slots].tolist()
+    edges = [
+        {
+            "id": edge_id,
+            "source_id": source_ids[row],
+            "target_id": target_ids[row],
+            "lead_time_days": lead_times[row],
+            "reliability_score": edge_columns["reliability_score"][row],
+            "capacity": edge_columns["capacity"][row],
+            "cost_per_unit": edge_columns["cost_per_unit"][row],
+            "created_at": created_at[row],
+            "updated_at": updated_at[row],
+        }
+        for row, edge_id in enumerate(edge_ids)
+    ]
+
+    payload = dict(header, nodes=nodes, edges=edges, metrics=history)
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def encode_arrow(
+    header: Dict,
+    tables: Dict[str, Dict[str, Column]],
+    metric_node_ids: List[str],
+) -> bytes:
+    """Serialize tables as consecutive Arrow IPC streams, in `TABLE_NAMES` order.
+
+    Metric node ids are dictionary encoded, and the header fields are stored
+    JSON-encoded in the schema metadata of every stream.
+    """
+    metadata = {key: json.dumps(value) for key, value in header.items()}
+    sink = pa.BufferOutputStream()
+    for name in TABLE_NAMES:
+        columns = dict(tables[name])
+        if name == "metrics":
+            codes = columns.pop("node")
+            columns = dict(
+                node_id=pa.DictionaryArray.from_arrays(
+                    pa.array(codes, type=pa.int32()), pa.array(metric_node_ids, type=pa.string())
+                ),
+                **columns,
+            )
+        table = pa.table(columns).replace_schema_metadata(metadata)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_msgpack(
+    header: Dict,
+    tables: Dict[str, Dict[str, Column]],
+    metric_node_ids: List[str],
+) -> bytes:
+    """Serialize tables as msgpack maps of NumPy-packed columns.
+
+    Numeric columns are `{"dtype", "data"}` maps holding the raw array
+    bytes; string columns are plain lists. The metrics table's `node`
+    column indexes into the top-level `metric_node_ids` list.
+    """
+
+    def pack(column: Column) -> Union[Dict, List[str]]:
+        if isinstance(column, np.ndarray):
+            column = np.ascontiguousarray(column)
+            return {"dtype": column.dtype.str, "data": column.tobytes()}
+        return column
+
+    payload = dict(header, metric_node_ids=metric_node_ids)
+    for name in TABLE_NAMES:
+        payload[name] = {key: pack(column) for key, column in tables[name].items()}
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def read_arrow_state(body: bytes) -> Dict[str, "pa.Table"]:
+    """Decode an Arrow state response into `{table_name: pyarrow.Table}`."""
+    reader = pa.BufferReader(body)
+    return {name: pa.ipc.open_stream(reader).read_all() for name in TABLE_NAMES}
+
+
+def read_msgpack_state(body: bytes) -> Dict:
+    """Decode a msgpack state response, restoring numeric columns as NumPy arrays."""
+    payload = msgpack.unpackb(body, raw=False)
+    for name in TABLE_NAMES:
+        payload[name] = {
+            key: np.frombuffer(column["data"], dtype=column["dtype"])
+            if isinstance(column, dict)
+            else column
+            for key, column in payload[name].items()
+        }
+    return payload
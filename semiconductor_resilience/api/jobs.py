@@ -0,0 +1,170 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from ..core.instrumentation import current_profiler
+from ..core.monte_carlo import ensemble_executor
+
+
+class JobQueueFull(Exception):
+    """Raised when too many background jobs are queued or running."""
+
+
+class Job:
+    """A background simulation task and its progress."""
+
+    def __init__(self, kind: str, sim_id: Optional[str] = None):
+        self.job_id = str(uuid4())
+        self.kind = kind
+        self.sim_id = sim_id
+        self.status = "queued"
+        self.progress = 0.0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def report(self, completed: int, total: int) -> None:
+        """Progress callback accepted by `simulate_many` and `MonteCarloEnsemble.run`."""
+        self.progress = completed / total if total else 1.0
+
+    def info(self, include_result: bool = True) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "sim_id": self.sim_id,
+            "status": self.status,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result if include_result else None,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Bounded executors for simulation work.
+
+    Request handlers hand their CPU-bound work to `run`, which executes it
+    on a small thread pool so the event loop stays free for cheap endpoints.
+    Long runs are submitted as background jobs to a separate pool, so they
+    cannot starve interactive requests; at most `max_queued` jobs may be
+    queued or running at once, and only the latest `max_finished` finished
+    jobs are kept for polling. Ensembles share one process pool of
+    `max_processes` workers, started on first use.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_job_workers: int = 2,
+        max_queued: int = 64,
+        max_finished: int = 1024,
+        max_processes: Optional[int] = None,
+    ):
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.max_processes = max_processes
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="simulation")
+        self._job_executor = ThreadPoolExecutor(max_job_workers, thread_name_prefix="simulation-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """Run a blocking call on the request pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _profiled(func, *args))
+
+    async def run_long(self, func: Callable, *args: Any) -> Any:
+        """Like `run`, but on the background pool used for jobs and long runs."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._job_executor, _profiled(func, *args))
+
+    def processes(self) -> ProcessPoolExecutor:
+        """Return the process pool shared by all ensembles."""
+        with self._lock:
+            if self._process_executor is None:
+                self._process_executor = ensemble_executor(self.max_processes)
+            return self._process_executor
+
+    def submit(self, kind: str, func: Callable[[Job], Any], sim_id: Optional[str] = None) -> Job:
+        """Queue `func(job)` as a background job. Raises JobQueueFull when saturated."""
+        job = Job(kind, sim_id)
+        with self._lock:
+            active = sum(1 for existing in self._jobs.values() if not existing.done)
+            if active >= self.max_queued:
+                raise JobQueueFull(f"{active} jobs already queued or running.")
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._job_executor.submit(self._execute, job, func)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Return a job. Raises KeyError if it is unknown or has been pruned."""
+        with self._lock:
+            return self._jobs[job_id]
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.info(include_result=False) for job in self._jobs.values()]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._job_executor.shutdown(wait=False)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job: Job, func: Callable[[Job], Any]) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = func(job)
+            job.progress = 1.0
+            job.status = "succeeded"
+        except HTTPException as exc:
+            job.error = str(exc.detail)
+            job.status = "failed"
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond `max_finished`."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+def _profiled(func: Callable, *args: Any) -> Callable[[], Any]:
+    """Bind `func(*args)`, sampled by the current request's profiler if it has one."""
+    profiler = current_profiler.get()
+    if profiler is None:
+        return partial(func, *args)
+    return partial(profiler.run, func, *args)
+
+
+def jobs_from_environment() -> JobManager:
+    """Build a job manager configured by SIMULATION_* environment variables."""
+    return JobManager(
+        max_workers=int(os.environ.get("SIMULATION_WORKERS", 4)),
+        max_job_workers=int(os.environ.get("SIMULATION_JOB_WORKERS", 2)),
+        max_queued=int(os.environ.get("SIMULATION_MAX_QUEUED_JOBS", 64)),
+        max_processes=int(os.environ.get("SIMULATION_PROCESSES", 0)) or None,
+    )
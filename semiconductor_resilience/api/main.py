@@ -1,11 +1,20 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import aclosing, contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
-from uuid import UUID
+from typing import Dict, Iterator, List, Optional, Union
+from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
+from ..core.aggregation import cluster_network, downsample, metric_series
 from ..core.data_generator import SupplyChainDataGenerator
+from ..core.instrumentation import SamplingProfiler, current_profiler, instrumentation
+from ..core.monte_carlo import MonteCarloEnsemble
 from ..core.simulation import SupplyChainSimulator
 from ..data.models import (
     DisruptionScenario,
@@ -13,6 +22,10 @@ from ..data.models import (
     SupplyChainMetrics,
     SupplyChainNode,
 )
+from . import encoding
+from .jobs import Job, JobQueueFull, jobs_from_environment
+from .sessions import SimulationSession, registry_from_environment
+from .streaming import SimulationStream, server_sent_events
 
 app = FastAPI(
     title="Global Semiconductor Crisis Resilience Platform",
@@ -20,26 +33,239 @@ app = FastAPI(
     version="1.0.0",
 )
 
-# Initialize simulation components
-simulator = SupplyChainSimulator()
+# Initialize simulation components. Requests never draw from the shared
+# generator directly; see _request_generator.
 data_generator = SupplyChainDataGenerator()
+_generator_lock = threading.Lock()
+registry = registry_from_environment()
+jobs = jobs_from_environment()
+
+# Session backing the single-user /simulation/* routes
+DEFAULT_SESSION = "default"
+
+# Folded stacks of the latest profiled requests, by profile id
+MAX_PROFILES = 32
+profiles: "OrderedDict[str, str]" = OrderedDict()
 
 
 class SimulationResponse(BaseModel):
+    sim_id: Optional[str] = None
     nodes: List[SupplyChainNode]
     edges: List[SupplyChainEdge]
     metrics: Dict[str, List[SupplyChainMetrics]]
     health: Dict[str, float]
+    version: int = 0
+    since_version: Optional[int] = None  # Set when nodes, edges and metrics are a delta
 
 
-@app.post("/simulation/initialize", response_model=SimulationResponse)
-async def initialize_simulation(
-    num_fabs: int = 5,
-    num_suppliers: int = 10,
-    num_customers: int = 8,
-) -> SimulationResponse:
-    """Initialize a new supply chain simulation with the specified number of nodes."""
-    nodes, edges = data_generator.generate_supply_chain(
+class JobRequest(BaseModel):
+    kind: str = "run"  # "run" or "ensemble"
+    sim_id: str = DEFAULT_SESSION
+    n_steps: int = 365
+    step_days: int = 1
+    include_series: bool = False
+    num_trajectories: int = 1000
+    horizon_days: int = 365
+    seed: int = 42
+    max_workers: Optional[int] = None
+
+
+class RiskMatrixRequest(BaseModel):
+    scenarios: Optional[List[DisruptionScenario]] = None  # Defaults to the predefined catalogue
+    top_k: int = 10
+    sort_by: str = "risk_score"
+    affected_only: bool = False  # Rank only the nodes each scenario hits
+
+
+class SimulationRunResponse(BaseModel):
+    steps: int
+    start_time: datetime
+    end_time: datetime
+    summary: Dict[str, Dict[str, float]]
+    health: Dict[str, float]
+    timestamps: Optional[List[datetime]] = None
+    series: Optional[Dict[str, Dict[str, List[float]]]] = None
+
+
+def _wants_profile(request: Request) -> bool:
+    flag = request.headers.get("x-profile") or request.query_params.get("profile")
+    return flag is not None and flag.lower() in ("1", "true", "yes")
+
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """Count and time requests, and profile those that ask for it.
+
+    A request sent with `X-Profile: true` (or `?profile=true`) samples the
+    worker threads running its simulation work; the folded stacks are kept
+    under the `X-Profile-Id` returned with the response.
+    """
+    profiler = SamplingProfiler().start() if _wants_profile(request) else None
+    token = current_profiler.set(profiler)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_profiler.reset(token)
+        if profiler is not None:
+            profiler.stop()
+    elapsed = time.perf_counter() - start
+    
+    # Label by route template so per-session paths share one series
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    instrumentation.increment(
+        "http_requests_total", route=path, method=request.method, status=response.status_code
+    )
+    instrumentation.observe("http_request_seconds", elapsed, route=path)
+    length = response.headers.get("content-length")
+    if length is not None:
+        media_type = response.headers.get("content-type", "").split(";")[0]
+        instrumentation.increment(
+            "http_response_bytes_total", int(length), route=path, media_type=media_type
+        )
+    
+    if profiler is not None:
+        profile_id = str(uuid4())
+        profiles[profile_id] = profiler.folded()
+        while len(profiles) > MAX_PROFILES:
+            profiles.popitem(last=False)
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
+
+def _not_initialized() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail="Simulation not initialized. Call /simulation/initialize first.",
+    )
+
+
+def _session_not_found(sim_id: str) -> HTTPException:
+    # The default session is created by /simulation/initialize, so its
+    # absence is reported as an uninitialized simulation instead
+    if sim_id == DEFAULT_SESSION:
+        return _not_initialized()
+    return HTTPException(status_code=404, detail=f"Simulation {sim_id} not found.")
+
+
+@contextmanager
+def _session(sim_id: str) -> Iterator[SimulationSession]:
+    """Lease a session for the duration of a block, raising 404 if it does not exist.
+
+    The lease keeps the registry from spilling the session while the block
+    works on it.
+    """
+    try:
+        session = registry.acquire(sim_id)
+    except KeyError:
+        raise _session_not_found(sim_id)
+    try:
+        yield session
+    finally:
+        registry.release(session)
+
+
+def _response(
+    session: SimulationSession,
+    since_version: Optional[int] = None,
+    media_type: str = encoding.JSON_MEDIA_TYPE,
+) -> Union[SimulationResponse, Response]:
+    """Build the full state, or only what changed after `since_version`.
+
+    Falls back to the full state if the delta cannot be built, in which
+    case `since_version` is unset in the response. Unless plain pydantic
+    JSON is the only option, the state is encoded directly from the
+    columnar metrics history in the negotiated `media_type`.
+    """
+    simulator = session.simulator
+    store = simulator.state.metrics
+    changes = simulator.changes_since(since_version) if since_version is not None else None
+    # None selects every node or edge
+    node_ids: Optional[List[str]] = None
+    edge_ids: Optional[List[str]] = None
+    if changes is None:
+        since_version = None
+        since_step = None
+    else:
+        node_ids, edge_ids, since_step = changes
+        node_ids = [node_id for node_id in node_ids if node_id in simulator.state.nodes]
+        # Slots of edges replaced since `since_version` are no longer members
+        edge_ids = [edge_id for edge_id in edge_ids if edge_id in simulator.state.edges]
+    
+    if media_type == encoding.JSON_MEDIA_TYPE and encoding.orjson is None:
+        with instrumentation.phase("materialization"):
+            nodes = [
+                simulator.state.nodes[node_id]
+                for node_id in (simulator.state.nodes if node_ids is None else node_ids)
+            ]
+            edges = [
+                simulator.state.edges[edge_id]
+                for edge_id in (simulator.state.edges if edge_ids is None else edge_ids)
+            ]
+            metrics = store.to_model_dict(since_step=since_step)
+        # FastAPI serializes the model after the handler returns
+        return SimulationResponse(
+            sim_id=session.sim_id,
+            nodes=nodes,
+            edges=edges,
+            metrics=metrics,
+            health=session.publish_health(),
+            version=simulator.version,
+            since_version=since_version,
+        )
+    
+    header = {
+        "sim_id": session.sim_id,
+        "health": session.publish_health(),
+        "version": simulator.version,
+        "since_version": since_version,
+    }
+    metrics = store.to_columns(since_step=since_step)
+    with instrumentation.phase("serialization"):
+        if media_type == encoding.ARROW_MEDIA_TYPE:
+            tables = encoding.state_tables(simulator, node_ids, edge_ids, metrics)
+            body = encoding.encode_arrow(header, tables, store.node_ids)
+        elif media_type == encoding.MSGPACK_MEDIA_TYPE:
+            tables = encoding.state_tables(simulator, node_ids, edge_ids, metrics)
+            body = encoding.encode_msgpack(header, tables, store.node_ids)
+        else:
+            body = encoding.encode_json(
+                header,
+                simulator,
+                node_ids,
+                edge_ids,
+                metrics,
+                store.node_ids,
+                all_nodes=since_step is None,
+            )
+    return Response(content=body, media_type=media_type)
+
+
+def _request_generator(seed: Optional[int]) -> SupplyChainDataGenerator:
+    """A generator owned by one request.
+
+    It is seeded with `seed` if given, so the same request always builds
+    the same network, and is otherwise a fresh child stream of the shared
+    generator.
+    """
+    if seed is not None:
+        return SupplyChainDataGenerator(seed)
+    with _generator_lock:
+        return data_generator.spawn(1)[0]
+
+
+def _create_session(
+    num_fabs: int,
+    num_suppliers: int,
+    num_customers: int,
+    generator: SupplyChainDataGenerator,
+    sim_id: Optional[str] = None,
+    media_type: str = encoding.JSON_MEDIA_TYPE,
+) -> Union[SimulationResponse, Response]:
+    """Generate a network into a fresh simulator and register it as a session."""
+    simulator = SupplyChainSimulator(engine="incremental")
+    nodes, edges = generator.generate_supply_chain(
         num_fabs=num_fabs,
         num_suppliers=num_suppliers,
         num_customers=num_customers,
@@ -52,72 +278,417 @@ async def initialize_simulation(
         simulator.add_edge(edge)
     
     # Run initial simulation step
-    metrics = simulator.simulate_step()
+    simulator.simulate_step()
+    
+    session = registry.create(simulator, generator, sim_id=sim_id)
+    with _session(session.sim_id) as session, session.lock:
+        return _response(session, media_type=media_type)
+
+
+# The helpers below block on simulation work and run on the job manager's
+# thread pools, never directly on the event loop. Multi-step runs and
+# ensembles go to the background pool so they cannot occupy the workers
+# serving short calls.
+def _state(sim_id: str, media_type: str = encoding.JSON_MEDIA_TYPE) -> Union[SimulationResponse, Response]:
+    with _session(sim_id) as session, session.lock:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+        return _response(session, media_type=media_type)
+
+
+def _step(
+    sim_id: str,
+    duration_days: int,
+    since_version: Optional[int] = None,
+    media_type: str = encoding.JSON_MEDIA_TYPE,
+) -> Union[SimulationResponse, Response]:
+    with _session(sim_id) as session, session.lock:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+        session.simulator.simulate_step(duration_days=duration_days)
+        return _response(session, since_version, media_type)
+
+
+def _run(
+    sim_id: str,
+    n_steps: int,
+    step_days: int,
+    include_series: bool,
+    job: Optional[Job] = None,
+) -> SimulationRunResponse:
+    if n_steps < 1:
+        raise HTTPException(status_code=400, detail="n_steps must be at least 1.")
+    with _session(sim_id) as session, session.lock:
+        simulator = session.simulator
+        if not simulator.state.nodes:
+            raise _not_initialized()
+        run = simulator.simulate_many(
+            n_steps=n_steps,
+            step_days=step_days,
+            progress=job.report if job is not None else None,
+        )
+        health = session.publish_health()
     
-    return SimulationResponse(
-        nodes=nodes,
-        edges=edges,
-        metrics={str(node.id): [m for m in metrics if m.node_id == node.id] for node in nodes},
-        health=simulator.get_supply_chain_health(),
+    return SimulationRunResponse(
+        steps=len(run),
+        start_time=run.timestamps[0],
+        end_time=run.timestamps[-1],
+        summary=run.summary(),
+        health=health,
+        timestamps=run.timestamps if include_series else None,
+        series=run.series() if include_series else None,
     )
 
 
-@app.post("/simulation/step", response_model=SimulationResponse)
-async def simulation_step(duration_days: int = 1) -> SimulationResponse:
-    """Advance the simulation by the specified number of days."""
-    if not simulator.state.nodes:
+def _disrupt(
+    sim_id: str,
+    scenario: DisruptionScenario,
+    since_version: Optional[int] = None,
+    media_type: str = encoding.JSON_MEDIA_TYPE,
+) -> Union[SimulationResponse, Response]:
+    with _session(sim_id) as session, session.lock:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+        session.simulator.apply_disruption(scenario)
+        session.simulator.simulate_step()
+        return _response(session, since_version, media_type)
+
+
+def _health(sim_id: str) -> Dict[str, float]:
+    # Served from the last published values, so a run holding the session
+    # lock does not delay it
+    with _session(sim_id) as session:
+        if session.health is None:
+            raise _not_initialized()
+        return session.health
+
+
+def _ensemble(
+    sim_id: str,
+    num_trajectories: int,
+    horizon_days: int,
+    seed: int,
+    max_workers: Optional[int],
+    job: Optional[Job] = None,
+) -> Dict:
+    if num_trajectories < 1 or horizon_days < 1:
         raise HTTPException(
             status_code=400,
-            detail="Simulation not initialized. Call /simulation/initialize first.",
+            detail="num_trajectories and horizon_days must be at least 1.",
         )
+    with _session(sim_id) as session:
+        # The session is only locked while its arrays are snapshotted
+        with session.lock:
+            if not session.simulator.state.nodes:
+                raise _not_initialized()
+            ensemble = MonteCarloEnsemble(
+                session.simulator,
+                session.generator.scenario_catalogue(),
+                horizon_days=horizon_days,
+            )
+            base = ensemble.snapshot(seed)
+    result = ensemble.run(
+        num_trajectories,
+        max_workers=max_workers,
+        progress=job.report if job is not None else None,
+        executor=jobs.processes(),
+        base=base,
+    )
+    return result.summary()
+
+
+def _node_metrics(
+    sim_id: str,
+    node_id: UUID,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+) -> List[SupplyChainMetrics]:
+    with _session(sim_id) as session, session.lock:
+        simulator = session.simulator
+        if not simulator.state.nodes:
+            raise _not_initialized()
+        if str(node_id) not in simulator.state.metrics:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Node {node_id} not found in simulation.",
+            )
+        return simulator.state.metrics.to_models(str(node_id), start_time, end_time)
+
+
+def _clusters(sim_id: str, group_by: List[str]) -> Dict:
+    with _session(sim_id) as session, session.lock:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+        try:
+            return cluster_network(session.simulator.state.nodes, group_by)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _metric_series(
+    sim_id: str,
+    metric: str,
+    aggregate: str,
+    points: int,
+    method: str,
+    node_ids: Optional[List[UUID]],
+) -> Dict:
+    if points < 3:
+        raise HTTPException(status_code=400, detail="points must be at least 3.")
+    with _session(sim_id) as session, session.lock:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+        try:
+            timestamps, values = metric_series(
+                session.simulator.state.metrics,
+                metric,
+                aggregate,
+                None if node_ids is None else [str(node_id) for node_id in node_ids],
+            )
+            total_points = len(values)
+            # Downsample on seconds since the first sample
+            seconds = (timestamps - timestamps[:1]).astype("timedelta64[us]").astype(np.float64) / 1e6
+            seconds, values = downsample(seconds, values, points, method)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    timestamps = timestamps[:1] + (seconds * 1e6).astype("timedelta64[us]")
+    return {
+        "metric": metric,
+        "aggregate": aggregate,
+        "method": method,
+        "total_points": total_points,
+        "timestamps": np.datetime_as_string(timestamps).tolist(),
+        "values": values.tolist(),
+    }
+
+
+def _risk_matrix(sim_id: str, request: RiskMatrixRequest) -> Dict:
+    if request.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1.")
+    with _session(sim_id) as session, session.lock:
+        simulator = session.simulator
+        if not simulator.state.nodes:
+            raise _not_initialized()
+        scenarios = request.scenarios or session.generator.scenario_catalogue()
+        matrix = simulator.calculate_risk_matrix(scenarios, affected_only=request.affected_only)
+        try:
+            top = matrix.top_k(request.top_k, by=request.sort_by)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        
+        # Only the top-ranked cells are turned into rows
+        results = []
+        for row, (scenario, columns, summary) in enumerate(zip(scenarios, top, matrix.summary())):
+            records = {column: simulator.state.nodes.record(matrix.node_ids[column]) for column in columns.tolist()}
+            results.append({
+                "scenario_id": scenario.id,
+                "name": scenario.name,
+                "summary": summary,
+                "top_nodes": [
+                    {
+                        "node_id": matrix.node_ids[column],
+                        "name": records[column].name,
+                        "type": records[column].type.value,
+                        "risk_score": float(matrix.risk_score[row, column]),
+                        "impact_score": float(matrix.impact_score[row, column]),
+                        "mitigation_cost": float(matrix.mitigation_cost[row, column]),
+                        "recovery_time_days": int(matrix.recovery_time_days[row, column]),
+                    }
+                    for column in columns.tolist()
+                ],
+            })
+    return {
+        "num_nodes": len(matrix.node_ids),
+        "num_scenarios": len(scenarios),
+        "sort_by": request.sort_by,
+        "scenarios": results,
+    }
+
+
+def _snapshot_not_found(snapshot_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Snapshot {snapshot_id} not found.")
+
+
+def _take_snapshot(sim_id: str) -> Dict:
+    with _session(sim_id) as session, session.lock:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+        try:
+            snapshot_id = session.snapshot()
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        snapshot = session.snapshots[snapshot_id]
+        return {
+            "sim_id": sim_id,
+            "snapshot_id": snapshot_id,
+            "timestamp": snapshot.state.timestamp.isoformat(),
+            "version": snapshot.version,
+        }
+
+
+def _list_snapshots(sim_id: str) -> List[Dict]:
+    with _session(sim_id) as session, session.lock:
+        return session.snapshot_info()
+
+
+def _delete_snapshot(sim_id: str, snapshot_id: str) -> Dict[str, str]:
+    with _session(sim_id) as session, session.lock:
+        if session.snapshots.pop(snapshot_id, None) is None:
+            raise _snapshot_not_found(snapshot_id)
+    return {"sim_id": sim_id, "snapshot_id": snapshot_id, "status": "deleted"}
+
+
+def _restore_snapshot(
+    sim_id: str,
+    snapshot_id: str,
+    media_type: str = encoding.JSON_MEDIA_TYPE,
+) -> Union[SimulationResponse, Response]:
+    with _session(sim_id) as session, session.lock:
+        try:
+            session.restore(snapshot_id)
+        except KeyError:
+            raise _snapshot_not_found(snapshot_id)
+        return _response(session, media_type=media_type)
+
+
+def _fork_session(sim_id: str, snapshot_id: Optional[str] = None) -> Dict:
+    """Register a fork of a session, or of one of its snapshots, as a new session."""
+    with _session(sim_id) as session, session.lock:
+        if snapshot_id is None:
+            if not session.simulator.state.nodes:
+                raise _not_initialized()
+            simulator = session.simulator.fork()
+        elif snapshot_id in session.snapshots:
+            simulator = session.snapshots[snapshot_id].fork()
+        else:
+            raise _snapshot_not_found(snapshot_id)
+        generator = session.generator.spawn(1)[0]
+    fork = registry.create(simulator, generator)
+    return dict(fork.info(), forked_from=sim_id, snapshot_id=snapshot_id)
+
+
+def _stream(sim_id: str, n_steps: int, step_days: int, sample_every: int) -> SimulationStream:
+    with _session(sim_id) as session:
+        if not session.simulator.state.nodes:
+            raise _not_initialized()
+    # The stream leases the session again while it produces steps
+    return SimulationStream(registry, sim_id, jobs, n_steps, step_days, sample_every)
+
+
+async def _stream_websocket(websocket: WebSocket, sim_id: str) -> None:
+    """Stream a horizon over a WebSocket.
+
+    The client sends one JSON message with `n_steps`, `step_days` and
+    `sample_every`, then receives `step` events followed by `end` or `error`.
+    """
+    await websocket.accept()
+    try:
+        request = await websocket.receive_json()
+        stream = await jobs.run(
+            _stream,
+            sim_id,
+            int(request.get("n_steps", 365)),
+            int(request.get("step_days", 1)),
+            int(request.get("sample_every", 1)),
+        )
+    except WebSocketDisconnect:
+        return
+    except (HTTPException, ValueError, TypeError, AttributeError) as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else "Invalid stream request."
+        await websocket.send_json({"event": "error", "detail": detail})
+        await websocket.close(code=1008)
+        return
     
-    metrics = simulator.simulate_step(duration_days=duration_days)
-    
-    return SimulationResponse(
-        nodes=list(simulator.state.nodes.values()),
-        edges=list(simulator.state.edges.values()),
-        metrics={str(node_id): node_metrics for node_id, node_metrics in simulator.state.metrics.items()},
-        health=simulator.get_supply_chain_health(),
+    # Sending awaits the client, which paces the steps
+    async with aclosing(stream.events()) as events:
+        try:
+            async for event in events:
+                await websocket.send_json(event)
+        except WebSocketDisconnect:
+            return
+    await websocket.close()
+
+
+@app.post("/simulation/initialize", response_model=SimulationResponse)
+async def initialize_simulation(
+    num_fabs: int = 5,
+    num_suppliers: int = 10,
+    num_customers: int = 8,
+    seed: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
+    """Initialize a new supply chain simulation with the specified number of nodes."""
+    # Replaces the default session rather than growing its network
+    return await jobs.run(
+        _create_session,
+        num_fabs,
+        num_suppliers,
+        num_customers,
+        _request_generator(seed),
+        DEFAULT_SESSION,
+        encoding.negotiate(accept),
     )
 
 
+@app.post("/simulation/step", response_model=SimulationResponse)
+async def simulation_step(
+    duration_days: int = 1,
+    since_version: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
+    """Advance the simulation by the specified number of days."""
+    return await jobs.run(
+        _step, DEFAULT_SESSION, duration_days, since_version, encoding.negotiate(accept)
+    )
+
+
+@app.post("/simulation/run", response_model=SimulationRunResponse)
+async def simulation_run(
+    n_steps: int = 30,
+    step_days: int = 1,
+    include_series: bool = False,
+) -> SimulationRunResponse:
+    """Advance the simulation by several steps and return aggregated metrics."""
+    return await jobs.run_long(_run, DEFAULT_SESSION, n_steps, step_days, include_series)
+
+
 @app.post("/simulation/disruption", response_model=SimulationResponse)
-async def apply_disruption(scenario: DisruptionScenario) -> SimulationResponse:
+async def apply_disruption(
+    scenario: DisruptionScenario,
+    since_version: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
     """Apply a disruption scenario to the supply chain."""
-    if not simulator.state.nodes:
-        raise HTTPException(
-            status_code=400,
-            detail="Simulation not initialized. Call /simulation/initialize first.",
-        )
-    
-    simulator.apply_disruption(scenario)
-    metrics = simulator.simulate_step()
-    
-    return SimulationResponse(
-        nodes=list(simulator.state.nodes.values()),
-        edges=list(simulator.state.edges.values()),
-        metrics={str(node_id): node_metrics for node_id, node_metrics in simulator.state.metrics.items()},
-        health=simulator.get_supply_chain_health(),
+    return await jobs.run(
+        _disrupt, DEFAULT_SESSION, scenario, since_version, encoding.negotiate(accept)
     )
 
 
 @app.get("/simulation/health")
 async def get_health() -> Dict[str, float]:
     """Get the current health metrics of the supply chain."""
-    if not simulator.state.nodes:
-        raise HTTPException(
-            status_code=400,
-            detail="Simulation not initialized. Call /simulation/initialize first.",
-        )
-    
-    return simulator.get_supply_chain_health()
+    return await jobs.run(_health, DEFAULT_SESSION)
+
+
+@app.post("/simulation/ensemble")
+async def run_ensemble(
+    num_trajectories: int = 1000,
+    horizon_days: int = 365,
+    seed: int = 42,
+    max_workers: Optional[int] = None,
+) -> Dict:
+    """Run a Monte Carlo ensemble of the predefined scenarios on the current network."""
+    return await jobs.run_long(
+        _ensemble, DEFAULT_SESSION, num_trajectories, horizon_days, seed, max_workers
+    )
 
 
 @app.get("/simulation/scenarios")
 async def get_scenarios() -> List[DisruptionScenario]:
     """Get a list of predefined disruption scenarios."""
+    generator = _request_generator(None)
     return [
-        data_generator.generate_disruption_scenario()
+        generator.generate_disruption_scenario()
         for _ in range(5)  # Generate 5 random scenarios
     ]
 
@@ -129,23 +700,297 @@ async def get_node_metrics(
     end_time: Optional[datetime] = None,
 ) -> List[SupplyChainMetrics]:
     """Get metrics for a specific node within a time range."""
-    if not simulator.state.nodes:
+    return await jobs.run(_node_metrics, DEFAULT_SESSION, node_id, start_time, end_time)
+
+
+@app.get("/simulation/network/clusters")
+async def get_network_clusters(group_by: List[str] = Query(["region", "type"])) -> Dict:
+    """Get the network collapsed into clusters by node attributes, with bundled edges."""
+    return await jobs.run(_clusters, DEFAULT_SESSION, group_by)
+
+
+@app.get("/simulation/metrics/series")
+async def get_metric_series(
+    metric: str = "throughput",
+    aggregate: str = "sum",
+    points: int = 1000,
+    method: str = "lttb",
+    node_id: Optional[List[UUID]] = Query(None),
+) -> Dict:
+    """Get a metric aggregated over nodes per timestamp, downsampled to `points`."""
+    return await jobs.run(_metric_series, DEFAULT_SESSION, metric, aggregate, points, method, node_id)
+
+
+@app.post("/simulation/risk/matrix")
+async def get_risk_matrix(request: RiskMatrixRequest = RiskMatrixRequest()) -> Dict:
+    """Assess every node against a set of scenarios and return the top-k riskiest per scenario."""
+    return await jobs.run(_risk_matrix, DEFAULT_SESSION, request)
+
+
+@app.get("/simulation/stream")
+async def stream_simulation(
+    n_steps: int = 365,
+    step_days: int = 1,
+    sample_every: int = 1,
+) -> StreamingResponse:
+    """Run a horizon and stream every `sample_every`-th step as Server-Sent Events."""
+    stream = await jobs.run(_stream, DEFAULT_SESSION, n_steps, step_days, sample_every)
+    return StreamingResponse(server_sent_events(stream), media_type="text/event-stream")
+
+
+@app.websocket("/simulation/ws")
+async def stream_simulation_websocket(websocket: WebSocket) -> None:
+    """Run a horizon and stream sampled steps over a WebSocket."""
+    await _stream_websocket(websocket, DEFAULT_SESSION)
+
+
+@app.post("/simulations", response_model=SimulationResponse)
+async def create_simulation(
+    num_fabs: int = 5,
+    num_suppliers: int = 10,
+    num_customers: int = 8,
+    seed: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
+    """Create an independent simulation session and return its id."""
+    media_type = encoding.negotiate(accept)
+    generator = _request_generator(seed)
+    return await jobs.run(
+        _create_session, num_fabs, num_suppliers, num_customers, generator, None, media_type
+    )
+
+
+@app.get("/simulations")
+async def list_simulations() -> List[Dict]:
+    """List resident and spilled simulation sessions."""
+    return await jobs.run(registry.list)
+
+
+@app.delete("/simulations/{sim_id}")
+async def delete_simulation(sim_id: str) -> Dict[str, str]:
+    """Delete a simulation session."""
+    try:
+        await jobs.run(registry.delete, sim_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Simulation {sim_id} not found.")
+    return {"sim_id": sim_id, "status": "deleted"}
+
+
+@app.get("/simulations/{sim_id}", response_model=SimulationResponse)
+async def session_state(sim_id: str, accept: Optional[str] = Header(None)) -> SimulationResponse:
+    """Get the full current state of a simulation session."""
+    return await jobs.run(_state, sim_id, encoding.negotiate(accept))
+
+
+@app.post("/simulations/{sim_id}/step", response_model=SimulationResponse)
+async def session_step(
+    sim_id: str,
+    duration_days: int = 1,
+    since_version: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
+    """Advance a simulation session by the specified number of days."""
+    return await jobs.run(_step, sim_id, duration_days, since_version, encoding.negotiate(accept))
+
+
+@app.post("/simulations/{sim_id}/run", response_model=SimulationRunResponse)
+async def session_run(
+    sim_id: str,
+    n_steps: int = 30,
+    step_days: int = 1,
+    include_series: bool = False,
+) -> SimulationRunResponse:
+    """Advance a simulation session by several steps."""
+    return await jobs.run_long(_run, sim_id, n_steps, step_days, include_series)
+
+
+@app.post("/simulations/{sim_id}/disruption", response_model=SimulationResponse)
+async def session_disruption(
+    sim_id: str,
+    scenario: DisruptionScenario,
+    since_version: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
+    """Apply a disruption scenario to a simulation session."""
+    return await jobs.run(_disrupt, sim_id, scenario, since_version, encoding.negotiate(accept))
+
+
+@app.get("/simulations/{sim_id}/health")
+async def session_health(sim_id: str) -> Dict[str, float]:
+    """Get the current health metrics of a simulation session."""
+    return await jobs.run(_health, sim_id)
+
+
+@app.post("/simulations/{sim_id}/ensemble")
+async def session_ensemble(
+    sim_id: str,
+    num_trajectories: int = 1000,
+    horizon_days: int = 365,
+    seed: int = 42,
+    max_workers: Optional[int] = None,
+) -> Dict:
+    """Run a Monte Carlo ensemble on a simulation session's network."""
+    return await jobs.run_long(_ensemble, sim_id, num_trajectories, horizon_days, seed, max_workers)
+
+
+@app.get("/simulations/{sim_id}/node/{node_id}/metrics")
+async def session_node_metrics(
+    sim_id: str,
+    node_id: UUID,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> List[SupplyChainMetrics]:
+    """Get metrics for a node of a simulation session within a time range."""
+    return await jobs.run(_node_metrics, sim_id, node_id, start_time, end_time)
+
+
+@app.get("/simulations/{sim_id}/network/clusters")
+async def session_network_clusters(
+    sim_id: str,
+    group_by: List[str] = Query(["region", "type"]),
+) -> Dict:
+    """Get the network of a simulation session collapsed into clusters."""
+    return await jobs.run(_clusters, sim_id, group_by)
+
+
+@app.get("/simulations/{sim_id}/metrics/series")
+async def session_metric_series(
+    sim_id: str,
+    metric: str = "throughput",
+    aggregate: str = "sum",
+    points: int = 1000,
+    method: str = "lttb",
+    node_id: Optional[List[UUID]] = Query(None),
+) -> Dict:
+    """Get a downsampled metric series of a simulation session."""
+    return await jobs.run(_metric_series, sim_id, metric, aggregate, points, method, node_id)
+
+
+@app.post("/simulations/{sim_id}/risk/matrix")
+async def session_risk_matrix(sim_id: str, request: RiskMatrixRequest = RiskMatrixRequest()) -> Dict:
+    """Assess every node of a simulation session against a set of scenarios."""
+    return await jobs.run(_risk_matrix, sim_id, request)
+
+
+@app.post("/simulations/{sim_id}/snapshots")
+async def create_snapshot(sim_id: str) -> Dict:
+    """Snapshot the current state of a simulation session."""
+    return await jobs.run(_take_snapshot, sim_id)
+
+
+@app.get("/simulations/{sim_id}/snapshots")
+async def list_snapshots(sim_id: str) -> List[Dict]:
+    """List the snapshots of a simulation session."""
+    return await jobs.run(_list_snapshots, sim_id)
+
+
+@app.delete("/simulations/{sim_id}/snapshots/{snapshot_id}")
+async def delete_snapshot(sim_id: str, snapshot_id: str) -> Dict[str, str]:
+    """Delete a snapshot of a simulation session."""
+    return await jobs.run(_delete_snapshot, sim_id, snapshot_id)
+
+
+@app.post("/simulations/{sim_id}/snapshots/{snapshot_id}/restore", response_model=SimulationResponse)
+async def restore_snapshot(
+    sim_id: str,
+    snapshot_id: str,
+    accept: Optional[str] = Header(None),
+) -> SimulationResponse:
+    """Reset a simulation session to a snapshot; the snapshot is kept."""
+    return await jobs.run(_restore_snapshot, sim_id, snapshot_id, encoding.negotiate(accept))
+
+
+@app.post("/simulations/{sim_id}/fork")
+async def fork_simulation(sim_id: str, snapshot_id: Optional[str] = None) -> Dict:
+    """Branch a simulation session, or one of its snapshots, into a new session."""
+    return await jobs.run(_fork_session, sim_id, snapshot_id)
+
+
+@app.get("/simulations/{sim_id}/stream")
+async def session_stream(
+    sim_id: str,
+    n_steps: int = 365,
+    step_days: int = 1,
+    sample_every: int = 1,
+) -> StreamingResponse:
+    """Run a horizon on a simulation session and stream it as Server-Sent Events."""
+    stream = await jobs.run(_stream, sim_id, n_steps, step_days, sample_every)
+    return StreamingResponse(server_sent_events(stream), media_type="text/event-stream")
+
+
+@app.websocket("/simulations/{sim_id}/ws")
+async def session_stream_websocket(websocket: WebSocket, sim_id: str) -> None:
+    """Run a horizon on a simulation session and stream it over a WebSocket."""
+    await _stream_websocket(websocket, sim_id)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Phase timings, work counters and request statistics for Prometheus."""
+    return PlainTextResponse(instrumentation.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str) -> PlainTextResponse:
+    """Folded stacks of a profiled request, for flamegraph.pl or speedscope."""
+    try:
+        return PlainTextResponse(profiles[profile_id])
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found.")
+
+
+@app.on_event("shutdown")
+async def shutdown_executors() -> None:
+    jobs.shutdown()
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest) -> Dict:
+    """Queue a long simulation run or ensemble as a background job."""
+    if request.kind == "run":
+        def work(job: Job) -> Dict:
+            return _run(
+                request.sim_id,
+                request.n_steps,
+                request.step_days,
+                request.include_series,
+                job=job,
+            ).dict()
+    elif request.kind == "ensemble":
+        def work(job: Job) -> Dict:
+            return _ensemble(
+                request.sim_id,
+                request.num_trajectories,
+                request.horizon_days,
+                request.seed,
+                request.max_workers,
+                job=job,
+            )
+    else:
         raise HTTPException(
             status_code=400,
-            detail="Simulation not initialized. Call /simulation/initialize first.",
-        )
-    
-    if str(node_id) not in simulator.state.metrics:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Node {node_id} not found in simulation.",
+            detail=f"Unknown job kind {request.kind!r}; expected 'run' or 'ensemble'.",
         )
+    if request.sim_id not in registry:
+        raise _session_not_found(request.sim_id)
     
-    metrics = simulator.state.metrics[str(node_id)]
-    
-    if start_time:
-        metrics = [m for m in metrics if m.timestamp >= start_time]
-    if end_time:
-        metrics = [m for m in metrics if m.timestamp <= end_time]
-    
-    return metrics 
\ No newline at end of file
+    try:
+        job = jobs.submit(request.kind, work, sim_id=request.sim_id)
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+    return job.info()
+
+
+@app.get("/jobs")
+async def list_jobs() -> List[Dict]:
+    """List queued, running and recently finished jobs."""
+    return jobs.list()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict:
+    """Get the status, progress and, once finished, the result of a job."""
+    try:
+        return jobs.get(job_id).info()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
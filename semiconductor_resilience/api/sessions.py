@@ -0,0 +1,309 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Union
+from uuid import uuid4
+
+import numpy as np
+
+from ..core.data_generator import SupplyChainDataGenerator
+from ..core.simulation import SupplyChainSimulator
+
+# Rough per-object footprint of node records, ids and index entries beyond
+# the arrays, as measured by benchmarks/memory.py
+NODE_OVERHEAD_BYTES = 1024
+EDGE_OVERHEAD_BYTES = 384
+
+MAX_SNAPSHOTS = 32
+
+
+def _array_nbytes(value: object, seen: Optional[Set[int]] = None) -> int:
+    """Sum the sizes of NumPy arrays held directly or in dicts by an object.
+
+    Memory-mapped arrays are backed by their files and not counted. Arrays
+    whose `id` is in `seen` are skipped and the others added to it, so
+    arrays shared between forks are counted once.
+    """
+    seen = set() if seen is None else seen
+    arrays = []
+    for attribute in vars(value).values():
+        if isinstance(attribute, np.ndarray):
+            arrays.append(attribute)
+        elif isinstance(attribute, dict):
+            arrays.extend(item for item in attribute.values() if isinstance(item, np.ndarray))
+    total = 0
+    for array in arrays:
+        if id(array) not in seen and not isinstance(array, np.memmap):
+            seen.add(id(array))
+            total += array.nbytes
+    return total
+
+
+def estimate_nbytes(simulator: SupplyChainSimulator, seen: Optional[Set[int]] = None) -> int:
+    """Estimate the resident memory of a simulator in bytes."""
+    seen = set() if seen is None else seen
+    return (
+        _array_nbytes(simulator.arrays, seen)
+        + _array_nbytes(simulator.state.edges, seen)
+        + _array_nbytes(simulator.state.metrics, seen)
+        + len(simulator.state.nodes) * NODE_OVERHEAD_BYTES
+        + len(simulator.state.edges) * EDGE_OVERHEAD_BYTES
+    )
+
+
+class SimulationSession:
+    """A simulator owned by one analyst, guarded by its own lock.
+
+    Snapshots are forks of the simulator taken at some point in time; they
+    share unchanged models and history with the live simulator.
+    """
+
+    def __init__(
+        self,
+        sim_id: str,
+        simulator: SupplyChainSimulator,
+        generator: SupplyChainDataGenerator,
+    ):
+        self.sim_id = sim_id
+        self.simulator = simulator
+        self.generator = generator
+        self.lock = threading.Lock()
+        self.leases = 0  # Guarded by the registry lock
+        self.evicting = False  # Set by the registry while the session is spilled
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.snapshots: "OrderedDict[str, SupplyChainSimulator]" = OrderedDict()
+        # Last published health; read without the lock
+        self.health: Optional[Dict[str, float]] = None
+        if simulator.state.nodes:
+            self.publish_health()
+
+    def touch(self) -> None:
+        self.last_used = time.time()
+
+    def publish_health(self) -> Dict[str, float]:
+        """Recompute the health served to readers that skip the lock.
+
+        Called with the lock held after work that changes the state.
+        """
+        self.health = self.simulator.get_supply_chain_health()
+        return self.health
+
+    def nbytes(self) -> int:
+        # Snapshots share models with the live simulator, and arrays until
+        # either side writes to them
+        seen: Set[int] = set()
+        return estimate_nbytes(self.simulator, seen) + sum(
+            _array_nbytes(snapshot.arrays, seen) + _array_nbytes(snapshot.state.metrics, seen)
+            for snapshot in self.snapshots.values()
+        )
+
+    def snapshot(self) -> str:
+        """Record a fork of the current state and return its id."""
+        if len(self.snapshots) >= MAX_SNAPSHOTS:
+            raise ValueError(f"Snapshot limit of {MAX_SNAPSHOTS} reached; delete one first.")
+        snapshot_id = str(uuid4())
+        self.snapshots[snapshot_id] = self.simulator.fork()
+        return snapshot_id
+
+    def restore(self, snapshot_id: str) -> None:
+        """Replace the live simulator with a fork of a snapshot. Raises KeyError if unknown."""
+        self.simulator = self.snapshots[snapshot_id].fork()
+
+    def snapshot_info(self) -> List[Dict[str, Union[str, int]]]:
+        return [
+            {
+                "snapshot_id": snapshot_id,
+                "timestamp": snapshot.state.timestamp.isoformat(),
+                "version": snapshot.version,
+            }
+            for snapshot_id, snapshot in self.snapshots.items()
+        ]
+
+    def info(self) -> Dict[str, Union[str, int, float]]:
+        return {
+            "sim_id": self.sim_id,
+            "nodes": len(self.simulator.state.nodes),
+            "edges": len(self.simulator.state.edges),
+            "timestamp": self.simulator.state.timestamp.isoformat(),
+            "snapshots": len(self.snapshots),
+            "memory_bytes": self.nbytes(),
+            "idle_seconds": time.time() - self.last_used,
+        }
+
+
+class SessionRegistry:
+    """In-memory registry of simulation sessions with LRU eviction.
+
+    When the number of resident sessions or their estimated memory exceeds
+    the configured limits, the least recently used idle sessions are evicted.
+    Evicted sessions are pickled to `spill_dir` and transparently reloaded
+    on next access, or dropped when no spill directory is configured.
+    Sessions are used through leases; a leased session is never evicted,
+    so work done on it cannot be lost to a concurrent spill. Spills are
+    written without the registry lock held; a session leased while it is
+    being written stays resident and the spill is discarded.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 256,
+        memory_budget_bytes: int = 2 * 1024**3,
+        spill_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.max_sessions = max_sessions
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._sessions: "OrderedDict[str, SimulationSession]" = OrderedDict()
+        self._spilled: Dict[str, Path] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, sim_id: str) -> bool:
+        with self._lock:
+            return sim_id in self._sessions or sim_id in self._spilled
+
+    def create(
+        self,
+        simulator: SupplyChainSimulator,
+        generator: SupplyChainDataGenerator,
+        sim_id: Optional[str] = None,
+    ) -> SimulationSession:
+        """Register a new session, replacing any existing one with the same id."""
+        session = SimulationSession(sim_id or str(uuid4()), simulator, generator)
+        with self._lock:
+            self._discard(session.sim_id)
+            self._sessions[session.sim_id] = session
+        self._evict(keep=session.sim_id)
+        return session
+
+    def acquire(self, sim_id: str) -> SimulationSession:
+        """Lease a session, reloading it from disk if it was spilled.
+
+        The session stays resident until the lease is returned with
+        `release`. Raises KeyError if the session does not exist.
+        """
+        with self._lock:
+            session = self._sessions.get(sim_id)
+            if session is None:
+                session = self._load(sim_id)
+                self._sessions[sim_id] = session
+            self._sessions.move_to_end(sim_id)
+            session.touch()
+            session.leases += 1
+        self._evict()
+        return session
+
+    def release(self, session: SimulationSession) -> None:
+        """Return a lease taken with `acquire`."""
+        with self._lock:
+            session.leases -= 1
+
+    @contextmanager
+    def lease(self, sim_id: str) -> Iterator[SimulationSession]:
+        """Lease a session for the duration of a block. Raises KeyError if unknown."""
+        session = self.acquire(sim_id)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def delete(self, sim_id: str) -> None:
+        """Remove a session from memory and disk. Raises KeyError if unknown."""
+        with self._lock:
+            if sim_id not in self:
+                raise KeyError(sim_id)
+            self._discard(sim_id)
+
+    def list(self) -> List[Dict[str, Union[str, int, float, bool]]]:
+        with self._lock:
+            resident = list(self._sessions.values())
+            spilled = [{"sim_id": sim_id, "spilled": True} for sim_id in self._spilled]
+        return [dict(session.info(), spilled=False) for session in resident] + spilled
+
+    def _discard(self, sim_id: str) -> None:
+        self._sessions.pop(sim_id, None)
+        path = self._spilled.pop(sim_id, None)
+        if path is not None and path.exists():
+            path.unlink()
+
+    def _load(self, sim_id: str) -> SimulationSession:
+        # The spill stays registered until it has been read, so a failed load
+        # can be retried
+        path = self._spilled[sim_id]
+        with open(path, "rb") as handle:
+            simulator, generator, created_at, snapshots = pickle.load(handle)
+        del self._spilled[sim_id]
+        path.unlink()
+        session = SimulationSession(sim_id, simulator, generator)
+        session.created_at = created_at
+        session.snapshots = snapshots
+        return session
+
+    def _spill(self, session: SimulationSession) -> Path:
+        """Write a session to a new file in the spill directory. Called without the registry lock."""
+        path = self.spill_dir / f"{session.sim_id}-{uuid4().hex[:8]}.pkl"
+        with open(path, "wb") as handle:
+            pickle.dump(
+                (session.simulator, session.generator, session.created_at, session.snapshots),
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        return path
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Evict least recently used idle, unleased sessions until within limits.
+
+        Sizes are estimated and spills written without the registry lock. A
+        session is marked as evicting while it is written and only swapped
+        out if nobody leased or replaced it in the meantime.
+        """
+        with self._lock:
+            resident = [
+                (sim_id, session) for sim_id, session in self._sessions.items() if not session.evicting
+            ]
+        usage = {sim_id: session.nbytes() for sim_id, session in resident}
+        for sim_id, session in resident:
+            within_limits = (
+                len(usage) <= self.max_sessions and sum(usage.values()) <= self.memory_budget_bytes
+            )
+            if within_limits:
+                break
+            with self._lock:
+                # Never evict the session being created or one that is in use
+                if (
+                    sim_id == keep
+                    or self._sessions.get(sim_id) is not session
+                    or session.evicting
+                    or session.leases
+                    or not session.lock.acquire(blocking=False)
+                ):
+                    continue
+                session.evicting = True
+            try:
+                path = self._spill(session) if self.spill_dir is not None else None
+                with self._lock:
+                    if self._sessions.get(sim_id) is session and not session.leases:
+                        del self._sessions[sim_id]
+                        if path is not None:
+                            self._spilled[sim_id] = path
+                        del usage[sim_id]
+                    elif path is not None:
+                        path.unlink()
+            finally:
+                session.evicting = False
+                session.lock.release()
+
+
+def registry_from_environment() -> SessionRegistry:
+    """Build a registry configured by SIMULATION_* environment variables."""
+    return SessionRegistry(
+        max_sessions=int(os.environ.get("SIMULATION_MAX_SESSIONS", 256)),
+        memory_budget_bytes=int(os.environ.get("SIMULATION_MEMORY_BUDGET_MB", 2048)) * 1024**2,
+        spill_dir=os.environ.get("SIMULATION_SPILL_DIR") or None,
+    )
@@ -0,0 +1,138 @@
+import json
+from typing import AsyncIterator, Dict, Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from ..core.engine import METRIC_NAMES, StepMetrics
+from .jobs import JobManager
+from .sessions import SessionRegistry, SimulationSession
+
+_SUMMED_METRICS = ("throughput", "inventory_level")
+
+
+class SimulationStream:
+    """Run a horizon on a session and yield sampled per-step events.
+
+    Every step is a separate call on the job manager's request pool that
+    holds the session lock only while that step runs, so other requests on
+    the session interleave with the stream and no worker is tied up between
+    steps. Steps are computed as the consumer asks for events, so a slow
+    client slows the simulation down rather than buffering, and closing the
+    event iterator stops the run after the step in progress. The session is
+    leased from `registry` for the whole horizon, so it cannot be spilled
+    mid-stream.
+
+    Every `sample_every`-th step (and the last one) produces a `step` event
+    with the health aggregates, metric totals and the metrics of nodes that
+    changed since the previous event; the stream ends with an `end` event.
+    """
+
+    def __init__(
+        self,
+        registry: SessionRegistry,
+        sim_id: str,
+        jobs: JobManager,
+        n_steps: int,
+        step_days: int = 1,
+        sample_every: int = 1,
+        tolerance: float = 1e-9,
+    ):
+        if n_steps < 1 or sample_every < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="n_steps and sample_every must be at least 1.",
+            )
+        self.registry = registry
+        self.sim_id = sim_id
+        self.session: Optional[SimulationSession] = None
+        self.jobs = jobs
+        self.n_steps = n_steps
+        self.step_days = step_days
+        self.sample_every = sample_every
+        self.tolerance = tolerance
+        self._last: Optional[StepMetrics] = None
+
+    def _changed(self, metrics: StepMetrics) -> Dict:
+        """Return the metrics of nodes that changed since the last event."""
+        values = metrics.to_array()
+        if self._last is not None and self._last.node_ids == metrics.node_ids:
+            rows = np.flatnonzero(
+                (np.abs(values - self._last.to_array()) > self.tolerance).any(axis=1)
+            )
+        else:
+            rows = np.arange(len(metrics))
+        self._last = metrics
+        changed = {"node_ids": [metrics.node_ids[row] for row in rows]}
+        changed.update({name: metrics[name][rows].tolist() for name in METRIC_NAMES})
+        return changed
+
+    def _event(self, step: int, metrics: StepMetrics) -> Dict:
+        simulator = self.session.simulator
+        # Flows are summed over the network, the other metrics averaged
+        totals = {
+            name: float(metrics[name].sum() if name in _SUMMED_METRICS else metrics[name].mean())
+            for name in METRIC_NAMES
+        } if len(metrics) else {}
+        return {
+            "event": "step",
+            "step": step,
+            "timestamp": metrics.timestamp.isoformat(),
+            "version": simulator.version,
+            "health": self.session.publish_health(),
+            "totals": totals,
+            "changed": self._changed(metrics),
+        }
+
+    def _step(self, step: int) -> Optional[Dict]:
+        """Advance one step under the session lock; return its event if it is sampled."""
+        with self.session.lock:
+            # Read under the lock, since a restore may replace the simulator
+            simulator = self.session.simulator
+            if not simulator.state.nodes:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Simulation not initialized. Call /simulation/initialize first.",
+                )
+            metrics = simulator.simulate_step_arrays(self.step_days)
+            if step % self.sample_every == 0 or step == self.n_steps:
+                return self._event(step, metrics)
+            return None
+
+    def _end(self, steps: int) -> Dict:
+        with self.session.lock:
+            simulator = self.session.simulator
+            self.session.publish_health()
+            return {
+                "event": "end",
+                "steps": steps,
+                "timestamp": simulator.state.timestamp.isoformat(),
+                "version": simulator.version,
+            }
+
+    async def events(self) -> AsyncIterator[Dict]:
+        """Yield events as the steps are computed."""
+        steps = 0
+        try:
+            self.session = await self.jobs.run(self.registry.acquire, self.sim_id)
+        except KeyError:
+            yield {"event": "error", "steps": steps, "detail": f"Simulation {self.sim_id} not found."}
+            return
+        try:
+            for step in range(1, self.n_steps + 1):
+                event = await self.jobs.run(self._step, step)
+                steps = step
+                if event is not None:
+                    yield event
+            yield await self.jobs.run(self._end, steps)
+        except Exception as exc:
+            detail = exc.detail if isinstance(exc, HTTPException) else f"{type(exc).__name__}: {exc}"
+            yield {"event": "error", "steps": steps, "detail": detail}
+        finally:
+            self.registry.release(self.session)
+
+
+async def server_sent_events(stream: SimulationStream) -> AsyncIterator[str]:
+    """Format stream events as Server-Sent Events."""
+    async for event in stream.events():
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,199 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..data.models import NodeTable
+from .engine import METRIC_NAMES
+from .metrics_store import MetricsStore
+
+# Node attributes networks can be clustered by
+CLUSTER_KEYS = ("region", "country", "type")
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Select `threshold` points with Largest-Triangle-Three-Buckets.
+
+    Returns the indices of the selected points. The first and last points
+    are always kept; every bucket in between contributes the point forming
+    the largest triangle with the previous pick and the next bucket's mean,
+    which preserves the visual shape of the series.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.zeros(threshold, dtype=np.int64)
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            following = slice(edges[bucket + 1], edges[bucket + 2])
+            next_x, next_y = x[following].mean(), y[following].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, buckets: int) -> np.ndarray:
+    """Keep the minimum and maximum of `buckets` equal-width x ranges.
+
+    Returns sorted indices of at most `2 * buckets` points. Unlike LTTB,
+    every spike survives, at the cost of twice the points.
+    """
+    n = len(x)
+    if 2 * buckets >= n or buckets < 1:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    span = max(x[-1] - x[0], 1e-12)
+    bucket = np.minimum(((x - x[0]) / span * buckets).astype(np.int64), buckets - 1)
+
+    # Within each bucket, order by value to find the extremes in one pass
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets), side="left")
+    ends = np.searchsorted(bucket[order], np.arange(buckets), side="right")
+    occupied = ends > starts
+    picks = np.concatenate([order[starts[occupied]], order[ends[occupied] - 1]])
+    return np.unique(picks)
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    points: int,
+    method: str = "lttb",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to about `points` points with `method`."""
+    if method == "lttb":
+        index = lttb(x, y, points)
+    elif method == "minmax":
+        index = minmax_downsample(x, y, max(1, points // 2))
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {DOWNSAMPLE_METHODS}.")
+    return x[index], y[index]
+
+
+def metric_series(
+    store: MetricsStore,
+    metric: str,
+    aggregate: str = "sum",
+    node_ids: Optional[Sequence[str]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Aggregate one metric over nodes at every retained timestamp.
+
+    Returns `(timestamps, values)` ordered by time. `aggregate` is "sum" or
+    "mean" over the nodes present at each timestamp; `node_ids` restricts
+    the aggregation to those nodes.
+    """
+    if metric not in METRIC_NAMES:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {METRIC_NAMES}.")
+    if aggregate not in ("sum", "mean"):
+        raise ValueError(f"Unknown aggregate {aggregate!r}; expected 'sum' or 'mean'.")
+
+    columns = store.to_columns()
+    values = columns[metric]
+    timestamps = columns["timestamp"]
+    if node_ids is not None:
+        wanted = np.zeros(len(store.node_ids), dtype=bool)
+        wanted[[store.node_index[node_id] for node_id in node_ids if node_id in store.node_index]] = True
+        rows = wanted[columns["node"]]
+        values, timestamps = values[rows], timestamps[rows]
+
+    times, inverse = np.unique(timestamps, return_inverse=True)
+    totals = np.bincount(inverse, weights=values, minlength=len(times))
+    if aggregate == "mean":
+        totals /= np.maximum(np.bincount(inverse, minlength=len(times)), 1)
+    return times, totals
+
+
+def cluster_network(nodes: NodeTable, group_by: Sequence[str] = ("region", "type")) -> Dict[str, List[Dict]]:
+    """Collapse a network into clusters of nodes sharing `group_by` attributes.
+
+    Each cluster reports its node count, total capacity, capacity-weighted
+    utilization, mean risk score and mean location. Edges between clusters
+    are bundled into one edge per ordered cluster pair with the count and
+    total capacity of the edges it replaces; edges within a cluster are
+    counted on the cluster itself.
+    """
+    unknown = [key for key in group_by if key not in CLUSTER_KEYS]
+    if unknown or not group_by:
+        raise ValueError(f"Cannot cluster by {unknown or group_by}; expected some of {CLUSTER_KEYS}.")
+
+    arrays = nodes.arrays
+    slots, keys, latitudes, longitudes = [], [], [], []
+    for _, record in nodes.records():
+        slots.append(record.slot)
+        keys.append(tuple(getattr(record, key).value if key == "type" else getattr(record, key) for key in group_by))
+        latitudes.append(record.latitude)
+        longitudes.append(record.longitude)
+    if not slots:
+        return {"clusters": [], "edges": []}
+
+    slots = np.array(slots, dtype=np.int64)
+    labels = sorted(set(keys))
+    position = {key: i for i, key in enumerate(labels)}
+    member = np.array([position[key] for key in keys], dtype=np.int64)
+    num_clusters = len(labels)
+
+    capacity = arrays.node_column("capacity")[slots]
+    utilization = arrays.node_column("utilization")[slots]
+    risk = arrays.node_column("risk_score")[slots]
+    counts = np.bincount(member, minlength=num_clusters)
+    total_capacity = np.bincount(member, weights=capacity, minlength=num_clusters)
+    used = np.bincount(member, weights=capacity * utilization, minlength=num_clusters)
+    risk_sum = np.bincount(member, weights=risk, minlength=num_clusters)
+    latitude = np.bincount(member, weights=latitudes, minlength=num_clusters) / counts
+    longitude = np.bincount(member, weights=longitudes, minlength=num_clusters) / counts
+
+    # Map every node slot to its cluster; placeholders belong to none
+    cluster_of = np.full(arrays.num_nodes, -1, dtype=np.int64)
+    cluster_of[slots] = member
+    active = np.flatnonzero(arrays.edge_active)
+    source = cluster_of[arrays.edge_source[active]]
+    target = cluster_of[arrays.edge_target[active]]
+    edge_capacity = arrays.edge_column("capacity")[active]
+    valid = (source >= 0) & (target >= 0)
+    pair = source[valid] * num_clusters + target[valid]
+    pair_count = np.bincount(pair, minlength=num_clusters * num_clusters)
+    pair_capacity = np.bincount(pair, weights=edge_capacity[valid], minlength=num_clusters * num_clusters)
+    internal = np.diagonal(pair_count.reshape(num_clusters, num_clusters))
+
+    clusters = [
+        {
+            "id": "/".join(labels[i]),
+            **dict(zip(group_by, labels[i])),
+            "node_count": int(counts[i]),
+            "internal_edges": int(internal[i]),
+            "capacity": float(total_capacity[i]),
+            "utilization": float(used[i] / total_capacity[i]) if total_capacity[i] > 0 else 0.0,
+            "risk_score": float(risk_sum[i] / counts[i]),
+            "latitude": float(latitude[i]),
+            "longitude": float(longitude[i]),
+        }
+        for i in range(num_clusters)
+    ]
+    bundled = []
+    for index in np.flatnonzero(pair_count):
+        source_cluster, target_cluster = divmod(int(index), num_clusters)
+        if source_cluster == target_cluster:
+            continue
+        bundled.append({
+            "source_id": clusters[source_cluster]["id"],
+            "target_id": clusters[target_cluster]["id"],
+            "edge_count": int(pair_count[index]),
+            "capacity": float(pair_capacity[index]),
+        })
+    return {"clusters": clusters, "edges": bundled}
@@ -0,0 +1,117 @@
+import numpy as np
+
+from .engine import NetworkArrays, gather_segments
+
+
+class CascadeResult:
+    """Per-node outcome of propagating a disruption downstream.
+
+    All arrays are indexed by node slot. `inherited` is the fraction of a
+    node's supply lost through its incoming edges, `shortfall` combines it
+    with the node's direct impact, `arrival_days` is when the inherited
+    shortfall reaches the node relative to the disruption onset (`inf` if
+    never) and `tier` counts the hops from the nearest directly hit node
+    (-1 if never reached).
+    """
+
+    def __init__(
+        self,
+        direct: np.ndarray,
+        inherited: np.ndarray,
+        arrival_days: np.ndarray,
+        tier: np.ndarray,
+        rounds: int,
+        nodes_recomputed: int,
+    ):
+        self.direct = direct
+        self.inherited = inherited
+        self.shortfall = 1 - (1 - direct) * (1 - inherited)
+        self.arrival_days = arrival_days
+        self.tier = tier
+        self.rounds = rounds
+        self.nodes_recomputed = nodes_recomputed
+
+    def affected(self) -> np.ndarray:
+        """Return the slots of all nodes reached by the cascade."""
+        return np.flatnonzero(self.tier >= 0)
+
+    def inherited_at(self, elapsed_days: float) -> np.ndarray:
+        """Return the inherited shortfall that has arrived after `elapsed_days`."""
+        return np.where(self.arrival_days <= elapsed_days, self.inherited, 0.0)
+
+
+def propagate_cascade(
+    arrays: NetworkArrays,
+    direct: np.ndarray,
+    max_rounds: int = 100,
+    tolerance: float = 1e-6,
+) -> CascadeResult:
+    """Push capacity shortfalls along edges, tier by tier.
+
+    A node's inherited shortfall is the capacity-weighted share of its
+    incoming supply that comes from short suppliers, and it arrives with the
+    earliest short supplier, delayed by the edge's `lead_time_days`. Each round
+    only recomputes the targets of nodes whose shortfall or arrival changed
+    in the previous round, so the work is proportional to the reached
+    subgraph. Cycles are cut off by `tolerance` and `max_rounds`.
+    """
+    num_nodes = arrays.num_nodes
+    direct = np.clip(np.asarray(direct, dtype=np.float64), 0.0, 1.0)
+    inherited = np.zeros(num_nodes)
+    shortfall = direct.copy()
+    hit = direct > tolerance
+    arrival = np.full(num_nodes, np.inf)
+    tier = np.where(hit, 0, -1)
+
+    in_indptr, in_order = arrays.in_csr()
+    out_indptr, out_order = arrays.out_csr()
+    source = arrays.edge_source
+    target = arrays.edge_target
+    capacity = arrays.edge_column("capacity")
+    lead_time = arrays.edge_column("lead_time_days")
+    incoming_capacity = arrays.aggregate("in_capacity")
+
+    frontier = np.flatnonzero(hit)
+    rounds = 0
+    nodes_recomputed = 0
+    while len(frontier) and rounds < max_rounds:
+        rounds += 1
+        targets = np.unique(target[gather_segments(out_indptr, out_order, frontier)])
+        if not len(targets):
+            break
+        nodes_recomputed += len(targets)
+
+        # Re-reduce every incoming edge of the touched targets
+        edges = gather_segments(in_indptr, in_order, targets)
+        local = np.searchsorted(targets, target[edges])
+        suppliers = source[edges]
+        lost = np.bincount(
+            local, weights=capacity[edges] * shortfall[suppliers], minlength=len(targets)
+        )
+        total = incoming_capacity[targets]
+        new_inherited = np.divide(lost, total, out=np.zeros(len(targets)), where=total > 0)
+
+        # Directly hit suppliers start shipping short at the onset
+        short_edges = shortfall[suppliers] > tolerance
+        short_suppliers = suppliers[short_edges]
+        supplier_arrival = np.where(hit[short_suppliers], 0.0, arrival[short_suppliers])
+        new_arrival = np.full(len(targets), np.inf)
+        np.minimum.at(
+            new_arrival,
+            local[short_edges],
+            supplier_arrival + lead_time[edges[short_edges]],
+        )
+
+        changed = (np.abs(new_inherited - inherited[targets]) > tolerance) | (
+            new_arrival < arrival[targets]
+        )
+        updated = targets[changed]
+        inherited[updated] = new_inherited[changed]
+        arrival[updated] = np.minimum(arrival[updated], new_arrival[changed])
+        shortfall[updated] = 1 - (1 - direct[updated]) * (1 - inherited[updated])
+
+        first_reached = updated[(tier[updated] < 0) & (shortfall[updated] > tolerance)]
+        tier[first_reached] = rounds
+        frontier = updated
+
+    return CascadeResult(direct, inherited, arrival, tier, rounds, nodes_recomputed)
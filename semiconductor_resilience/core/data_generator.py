@@ -1,6 +1,7 @@
 import random
 from datetime import datetime
-from typing import List, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
 import numpy as np
@@ -13,13 +14,187 @@ from ..data.models import (
     ProcessNode,
     SupplyChainEdge,
     SupplyChainNode,
+    write_edge_records,
+    write_node_records,
 )
+from .engine import NetworkArrays
+from .ids import uuid4_bytes, uuid_strings
+
+NODE_TYPES = list(NodeType)
+PROCESS_NODES = list(ProcessNode)
+CHIP_TYPES = list(ChipType)
+
+# (source type, target type, connection probability) for each supply tier
+TIER_LINKS = [
+    (NodeType.SUPPLIER, NodeType.FAB, 0.3),
+    (NodeType.FAB, NodeType.CUSTOMER, 0.4),
+    (NodeType.SUPPLIER, NodeType.LOGISTICS, 0.3),
+    (NodeType.LOGISTICS, NodeType.FAB, 0.3),
+    (NodeType.FAB, NodeType.DISTRIBUTOR, 0.4),
+    (NodeType.DISTRIBUTOR, NodeType.CUSTOMER, 0.4),
+]
+
+# (capacity, utilization) ranges of the generated non-fab node types
+NODE_RANGES = {
+    NodeType.SUPPLIER: ((1000, 5000), (0.6, 0.9)),
+    NodeType.CUSTOMER: ((500, 2000), (0.5, 0.8)),
+    NodeType.DISTRIBUTOR: ((2000, 8000), (0.6, 0.9)),
+    NodeType.LOGISTICS: ((5000, 20000), (0.5, 0.85)),
+}
+
+
+def _random_bitmask(rng: np.random.Generator, count: int, width: int, mean_bits: float) -> np.ndarray:
+    """Draw bitmasks with roughly `mean_bits` bits set and at least one bit each."""
+    bits = rng.random((count, width)) < mean_bits / width
+    bits[np.arange(count), rng.integers(0, width, size=count)] = True
+    return (bits * (1 << np.arange(width))).sum(axis=1).astype(np.int64)
+
+
+class SyntheticNetwork:
+    """Columnar synthetic supply chain network.
+
+    Nodes and edges are stored as NumPy columns indexed by position; enum
+    attributes are stored as codes into `NODE_TYPES`, `countries`,
+    `PROCESS_NODES` and `CHIP_TYPES` (the latter two as bitmasks). Pydantic
+    models are only built by `to_models`.
+    """
+
+    def __init__(self, nodes: Dict[str, np.ndarray], edges: Dict[str, np.ndarray], countries: List[str]):
+        self.nodes = nodes
+        self.edges = edges
+        self.countries = countries
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes["type"])
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edges["source"])
+
+    def node_ids(self) -> List[str]:
+        return uuid_strings(self.nodes["uuid"])
+
+    def edge_ids(self) -> List[str]:
+        return uuid_strings(self.edges["uuid"])
+
+    def to_arrays(self) -> NetworkArrays:
+        """Bulk-load the network into simulator arrays without building models."""
+        arrays = NetworkArrays(initial_size=1)
+        arrays.extend_nodes(
+            self.node_ids(),
+            **{name: self.nodes[name] for name in NetworkArrays.NODE_FIELDS},
+        )
+        arrays.extend_edges(
+            self.edge_ids(),
+            self.edges["source"],
+            self.edges["target"],
+            **{name: self.edges[name] for name in NetworkArrays.EDGE_FIELDS},
+        )
+        return arrays
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """Write the network as a store for `SupplyChainSimulator.from_network_store`.
+
+        Node records are written from the code columns, with the same names,
+        regions and cities `to_models` gives the nodes.
+        """
+        directory = self.to_arrays().save(directory)
+        num_nodes = self.num_nodes
+        node_type = self.nodes["type"]
+        country = self.nodes["country"]
+        now = np.full(num_nodes, np.datetime64(datetime.utcnow(), "us"))
+        write_node_records(
+            directory,
+            {
+                "slot": np.arange(num_nodes),
+                "name": (
+                    np.arange(num_nodes),
+                    [
+                        f"{NODE_TYPES[code].value.title()}_{i + 1}"
+                        for i, code in enumerate(node_type.tolist())
+                    ],
+                ),
+                "type": (node_type, [value.value for value in NODE_TYPES]),
+                "location_id": (
+                    np.arange(num_nodes),
+                    uuid_strings(uuid4_bytes(np.random.default_rng(), num_nodes)),
+                ),
+                "country": (country, self.countries),
+                "region": (country, self.countries),
+                "city": (np.arange(num_nodes) % 10, [f"City_{i + 1}" for i in range(10)]),
+                "latitude": self.nodes["latitude"],
+                "longitude": self.nodes["longitude"],
+                "location_risk": self.nodes["location_risk"],
+                "process_nodes": self.nodes["process_nodes"],
+                "chip_types": self.nodes["chip_types"],
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+        edge_now = np.full(self.num_edges, np.datetime64(datetime.utcnow(), "us"))
+        write_edge_records(directory, edge_now, edge_now)
+        return directory
+
+    def to_models(self) -> Tuple[List[SupplyChainNode], List[SupplyChainEdge]]:
+        """Materialize the network as pydantic nodes and edges."""
+        node_ids = [UUID(node_id) for node_id in self.node_ids()]
+        columns = {name: values.tolist() for name, values in self.nodes.items() if name != "uuid"}
+
+        def members(mask: int, options: list) -> list:
+            return [option for bit, option in enumerate(options) if mask >> bit & 1]
+
+        nodes = []
+        for i, node_id in enumerate(node_ids):
+            node_type = NODE_TYPES[columns["type"][i]]
+            country = self.countries[columns["country"][i]]
+            nodes.append(
+                SupplyChainNode(
+                    id=node_id,
+                    name=f"{node_type.value.title()}_{i + 1}",
+                    type=node_type,
+                    location=Location(
+                        country=country,
+                        region=country,
+                        city=f"City_{i % 10 + 1}",
+                        latitude=columns["latitude"][i],
+                        longitude=columns["longitude"][i],
+                        risk_score=columns["location_risk"][i],
+                    ),
+                    capacity=columns["capacity"][i],
+                    utilization=columns["utilization"][i],
+                    process_nodes=members(columns["process_nodes"][i], PROCESS_NODES),
+                    chip_types=members(columns["chip_types"][i], CHIP_TYPES),
+                    risk_score=columns["risk_score"][i],
+                )
+            )
+
+        edge_columns = {name: values.tolist() for name, values in self.edges.items() if name != "uuid"}
+        edges = [
+            SupplyChainEdge(
+                id=UUID(edge_id),
+                source_id=node_ids[edge_columns["source"][j]],
+                target_id=node_ids[edge_columns["target"][j]],
+                lead_time_days=edge_columns["lead_time_days"][j],
+                reliability_score=edge_columns["reliability_score"][j],
+                capacity=edge_columns["capacity"][j],
+                cost_per_unit=edge_columns["cost_per_unit"][j],
+            )
+            for j, edge_id in enumerate(self.edge_ids())
+        ]
+        return nodes, edges
 
 
 class SupplyChainDataGenerator:
-    def __init__(self, seed: int = 42):
-        random.seed(seed)
-        np.random.seed(seed)
+    def __init__(self, seed: Union[int, np.random.SeedSequence] = 42):
+        # The generator owns its random streams instead of seeding the global
+        # ones, so independent instances never interleave draws.
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        self.random = random.Random(int.from_bytes(self.seed_sequence.generate_state(4).tobytes(), "little"))
         
         # Define realistic semiconductor industry parameters
         self.fab_capacities = {
@@ -163,25 +338,39 @@ class SupplyChainDataGenerator:
             }
         ]
 
+    def spawn(self, count: int) -> List["SupplyChainDataGenerator"]:
+        """Create independent child generators, e.g. one per worker process.
+
+        Children draw from statistically independent streams derived from this
+        generator's seed, so parallel generation is reproducible and
+        uncorrelated.
+        """
+        return [SupplyChainDataGenerator(child) for child in self.seed_sequence.spawn(count)]
+
+    def _new_id(self) -> UUID:
+        """Draw a version 4 UUID from the generator's own stream."""
+        return UUID(int=self.random.getrandbits(128), version=4)
+
     def generate_location(self, company: str) -> Location:
         """Generate a realistic location for a semiconductor company."""
         if company in self.locations:
-            country, region, city, lat, lon = random.choice(self.locations[company])
+            country, region, city, lat, lon = self.random.choice(self.locations[company])
         else:
             # Generate a random location if company not in predefined list
-            country = random.choice(["USA", "Japan", "Germany", "France", "UK"])
-            region = f"Region_{random.randint(1, 5)}"
-            city = f"City_{random.randint(1, 10)}"
-            lat = random.uniform(-90, 90)
-            lon = random.uniform(-180, 180)
+            country = self.random.choice(["USA", "Japan", "Germany", "France", "UK"])
+            region = f"Region_{self.random.randint(1, 5)}"
+            city = f"City_{self.random.randint(1, 10)}"
+            lat = self.random.uniform(-90, 90)
+            lon = self.random.uniform(-180, 180)
         
         return Location(
+            id=self._new_id(),
             country=country,
             region=region,
             city=city,
             latitude=lat,
             longitude=lon,
-            risk_score=random.uniform(0.1, 0.9),
+            risk_score=self.random.uniform(0.1, 0.9),
         )
 
     def generate_fab_node(self, company: str) -> SupplyChainNode:
@@ -202,41 +391,43 @@ class SupplyChainDataGenerator:
                 ProcessNode.NODE_14NM,
             ]
         else:
-            process_nodes = random.sample(list(ProcessNode), k=random.randint(1, 4))
+            process_nodes = self.random.sample(list(ProcessNode), k=self.random.randint(1, 4))
         
         # Calculate capacity based on process nodes
         capacity = sum(
-            random.uniform(*self.fab_capacities[node])
+            self.random.uniform(*self.fab_capacities[node])
             for node in process_nodes
         )
         
         return SupplyChainNode(
-            name=f"{company}_Fab_{random.randint(1, 5)}",
+            id=self._new_id(),
+            name=f"{company}_Fab_{self.random.randint(1, 5)}",
             type=NodeType.FAB,
             location=self.generate_location(company),
             capacity=capacity,
-            utilization=random.uniform(0.7, 0.95),
+            utilization=self.random.uniform(0.7, 0.95),
             process_nodes=process_nodes,
-            chip_types=random.sample(list(ChipType), k=random.randint(1, 3)),
-            risk_score=random.uniform(0.1, 0.9),
+            chip_types=self.random.sample(list(ChipType), k=self.random.randint(1, 3)),
+            risk_score=self.random.uniform(0.1, 0.9),
         )
 
     def generate_supplier_node(self) -> SupplyChainNode:
         """Generate a realistic supplier node."""
-        company = random.choice([
+        company = self.random.choice([
             "ASML", "Applied Materials", "Lam Research", "Tokyo Electron",
             "KLA Corporation", "Teradyne", "Advantest",
         ])
         
         return SupplyChainNode(
-            name=f"{company}_Supplier_{random.randint(1, 3)}",
+            id=self._new_id(),
+            name=f"{company}_Supplier_{self.random.randint(1, 3)}",
             type=NodeType.SUPPLIER,
             location=self.generate_location(company),
-            capacity=random.uniform(1000, 5000),
-            utilization=random.uniform(0.6, 0.9),
-            process_nodes=random.sample(list(ProcessNode), k=random.randint(1, 3)),
-            chip_types=random.sample(list(ChipType), k=random.randint(1, 2)),
-            risk_score=random.uniform(0.1, 0.9),
+            capacity=self.random.uniform(1000, 5000),
+            utilization=self.random.uniform(0.6, 0.9),
+            process_nodes=self.random.sample(list(ProcessNode), k=self.random.randint(1, 3)),
+            chip_types=self.random.sample(list(ChipType), k=self.random.randint(1, 2)),
+            risk_score=self.random.uniform(0.1, 0.9),
         )
 
     def generate_edge(
@@ -245,28 +436,29 @@ class SupplyChainDataGenerator:
         """Generate a realistic supply chain edge."""
         # Adjust lead time and reliability based on node types
         if source_type == NodeType.FAB and target_type == NodeType.CUSTOMER:
-            lead_time = random.randint(30, 90)  # Longer lead time for fab to customer
-            reliability = random.uniform(0.8, 0.95)
+            lead_time = self.random.randint(30, 90)  # Longer lead time for fab to customer
+            reliability = self.random.uniform(0.8, 0.95)
         elif source_type == NodeType.SUPPLIER and target_type == NodeType.FAB:
-            lead_time = random.randint(15, 45)  # Medium lead time for supplier to fab
-            reliability = random.uniform(0.85, 0.98)
+            lead_time = self.random.randint(15, 45)  # Medium lead time for supplier to fab
+            reliability = self.random.uniform(0.85, 0.98)
         else:
-            lead_time = random.randint(5, 20)  # Shorter lead time for other connections
-            reliability = random.uniform(0.9, 0.99)
+            lead_time = self.random.randint(5, 20)  # Shorter lead time for other connections
+            reliability = self.random.uniform(0.9, 0.99)
         
         return SupplyChainEdge(
+            id=self._new_id(),
             source_id=source_id,
             target_id=target_id,
             lead_time_days=lead_time,
             reliability_score=reliability,
-            capacity=random.uniform(1000, 10000),
-            cost_per_unit=random.uniform(100, 1000),
+            capacity=self.random.uniform(1000, 10000),
+            cost_per_unit=self.random.uniform(100, 1000),
         )
 
-    def generate_disruption_scenario(self) -> DisruptionScenario:
-        """Generate a realistic disruption scenario."""
-        scenario = random.choice(self.disruption_scenarios)
+    def scenario_from_template(self, scenario: Dict) -> DisruptionScenario:
+        """Build a disruption scenario from one of the predefined templates."""
         return DisruptionScenario(
+            id=self._new_id(),
             name=scenario["name"],
             description=scenario["description"],
             probability=scenario["probability"],
@@ -279,6 +471,14 @@ class SupplyChainDataGenerator:
             mitigation_strategies=scenario["mitigation_strategies"],
         )
 
+    def generate_disruption_scenario(self) -> DisruptionScenario:
+        """Generate a realistic disruption scenario."""
+        return self.scenario_from_template(self.random.choice(self.disruption_scenarios))
+
+    def scenario_catalogue(self) -> List[DisruptionScenario]:
+        """Return one scenario for every predefined disruption template."""
+        return [self.scenario_from_template(scenario) for scenario in self.disruption_scenarios]
+
     def generate_supply_chain(
         self, num_fabs: int = 5, num_suppliers: int = 10, num_customers: int = 8
     ) -> Tuple[List[SupplyChainNode], List[SupplyChainEdge]]:
@@ -289,7 +489,7 @@ class SupplyChainDataGenerator:
         # Generate fab nodes
         companies = ["TSMC", "Samsung", "Intel", "GlobalFoundries", "UMC"]
         for _ in range(num_fabs):
-            company = random.choice(companies)
+            company = self.random.choice(companies)
             fab_node = self.generate_fab_node(company)
             nodes.append(fab_node)
         
@@ -301,14 +501,15 @@ class SupplyChainDataGenerator:
         # Generate customer nodes
         for i in range(num_customers):
             customer_node = SupplyChainNode(
+                id=self._new_id(),
                 name=f"Customer_{i+1}",
                 type=NodeType.CUSTOMER,
                 location=self.generate_location("Customer"),
-                capacity=random.uniform(500, 2000),
-                utilization=random.uniform(0.5, 0.8),
-                process_nodes=random.sample(list(ProcessNode), k=random.randint(1, 2)),
-                chip_types=random.sample(list(ChipType), k=random.randint(1, 2)),
-                risk_score=random.uniform(0.1, 0.9),
+                capacity=self.random.uniform(500, 2000),
+                utilization=self.random.uniform(0.5, 0.8),
+                process_nodes=self.random.sample(list(ProcessNode), k=self.random.randint(1, 2)),
+                chip_types=self.random.sample(list(ChipType), k=self.random.randint(1, 2)),
+                risk_score=self.random.uniform(0.1, 0.9),
             )
             nodes.append(customer_node)
         
@@ -318,7 +519,7 @@ class SupplyChainDataGenerator:
             if source.type == NodeType.SUPPLIER:
                 for target in nodes:
                     if target.type == NodeType.FAB:
-                        if random.random() < 0.3:  # 30% chance of connection
+                        if self.random.random() < 0.3:  # 30% chance of connection
                             edge = self.generate_edge(
                                 source.id, target.id, source.type, target.type
                             )
@@ -328,10 +529,129 @@ class SupplyChainDataGenerator:
             elif source.type == NodeType.FAB:
                 for target in nodes:
                     if target.type == NodeType.CUSTOMER:
-                        if random.random() < 0.4:  # 40% chance of connection
+                        if self.random.random() < 0.4:  # 40% chance of connection
                             edge = self.generate_edge(
                                 source.id, target.id, source.type, target.type
                             )
                             edges.append(edge)
         
-        return nodes, edges 
\ No newline at end of file
+        return nodes, edges 
+
+    def generate_network(
+        self,
+        num_fabs: int = 5,
+        num_suppliers: int = 10,
+        num_customers: int = 8,
+        num_distributors: int = 0,
+        num_logistics: int = 0,
+        max_out_degree: int = 10,
+        seed: Optional[int] = None,
+    ) -> SyntheticNetwork:
+        """Generate a large supply chain network in columnar form.
+
+        Every tier in `TIER_LINKS` connects each source to a binomially
+        distributed number of distinct targets, with the connection
+        probability capped so that the expected out-degree per tier stays
+        below `max_out_degree`. Fab capacities follow `fab_capacities` of the
+        sampled process nodes.
+        """
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        counts = {
+            NodeType.FAB: num_fabs,
+            NodeType.SUPPLIER: num_suppliers,
+            NodeType.CUSTOMER: num_customers,
+            NodeType.DISTRIBUTOR: num_distributors,
+            NodeType.LOGISTICS: num_logistics,
+        }
+        node_type = np.repeat(
+            np.array([NODE_TYPES.index(t) for t in counts], dtype=np.int8),
+            list(counts.values()),
+        )
+        num_nodes = len(node_type)
+        is_fab = node_type == NODE_TYPES.index(NodeType.FAB)
+
+        # Locations: fabs at known company sites, everything else in other countries
+        sites = [site for company_sites in self.locations.values() for site in company_sites]
+        other_countries = ["USA", "Japan", "Germany", "France", "UK"]
+        countries = sorted({site[0] for site in sites} | set(other_countries))
+        site_country = np.array([countries.index(site[0]) for site in sites])
+        site_coordinates = np.array([(site[3], site[4]) for site in sites])
+
+        site = rng.integers(0, len(sites), size=num_nodes)
+        country = np.where(
+            is_fab,
+            site_country[site],
+            np.array([countries.index(c) for c in other_countries])[
+                rng.integers(0, len(other_countries), size=num_nodes)
+            ],
+        ).astype(np.int16)
+        latitude = np.where(is_fab, site_coordinates[site, 0], rng.uniform(-90, 90, num_nodes))
+        longitude = np.where(is_fab, site_coordinates[site, 1], rng.uniform(-180, 180, num_nodes))
+
+        process_nodes = _random_bitmask(rng, num_nodes, len(PROCESS_NODES), 2.0)
+        chip_types = _random_bitmask(rng, num_nodes, len(CHIP_TYPES), 1.5)
+
+        capacity = np.zeros(num_nodes)
+        utilization = np.zeros(num_nodes)
+        for node_kind, ((cap_low, cap_high), (util_low, util_high)) in NODE_RANGES.items():
+            rows = node_type == NODE_TYPES.index(node_kind)
+            capacity[rows] = rng.uniform(cap_low, cap_high, rows.sum())
+            utilization[rows] = rng.uniform(util_low, util_high, rows.sum())
+        utilization[is_fab] = rng.uniform(0.7, 0.95, is_fab.sum())
+        for bit, process_node in enumerate(PROCESS_NODES):
+            low, high = self.fab_capacities[process_node]
+            has_node = is_fab & (process_nodes >> bit & 1).astype(bool)
+            capacity[has_node] += rng.uniform(low, high, has_node.sum())
+
+        nodes = {
+            "uuid": uuid4_bytes(rng, num_nodes),
+            "type": node_type,
+            "country": country,
+            "latitude": latitude,
+            "longitude": longitude,
+            "location_risk": rng.uniform(0.1, 0.9, num_nodes),
+            "capacity": capacity,
+            "utilization": utilization,
+            "process_nodes": process_nodes,
+            "chip_types": chip_types,
+            "risk_score": rng.uniform(0.1, 0.9, num_nodes),
+        }
+
+        sources, targets, lead_times, reliabilities = [], [], [], []
+        for source_type, target_type, probability in TIER_LINKS:
+            source_rows = np.flatnonzero(node_type == NODE_TYPES.index(source_type))
+            target_rows = np.flatnonzero(node_type == NODE_TYPES.index(target_type))
+            if not len(source_rows) or not len(target_rows):
+                continue
+
+            # Binomial out-degree per source, then distinct targets per source
+            probability = min(probability, max_out_degree / len(target_rows))
+            degree = rng.binomial(len(target_rows), probability, size=len(source_rows))
+            source = np.repeat(source_rows, degree)
+            target = target_rows[rng.integers(0, len(target_rows), size=len(source))]
+            pairs = np.sort(source.astype(np.int64) * num_nodes + target)
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+            source, target = pairs // num_nodes, pairs % num_nodes
+
+            if source_type == NodeType.FAB and target_type == NodeType.CUSTOMER:
+                lead_range, reliability_range = (30, 90), (0.8, 0.95)
+            elif source_type == NodeType.SUPPLIER and target_type == NodeType.FAB:
+                lead_range, reliability_range = (15, 45), (0.85, 0.98)
+            else:
+                lead_range, reliability_range = (5, 20), (0.9, 0.99)
+            sources.append(source)
+            targets.append(target)
+            lead_times.append(rng.integers(lead_range[0], lead_range[1] + 1, size=len(source)))
+            reliabilities.append(rng.uniform(*reliability_range, size=len(source)))
+
+        num_edges = int(sum(len(source) for source in sources))
+        edges = {
+            "uuid": uuid4_bytes(rng, num_edges),
+            "source": np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64),
+            "target": np.concatenate(targets) if targets else np.zeros(0, dtype=np.int64),
+            "lead_time_days": np.concatenate(lead_times) if lead_times else np.zeros(0, dtype=np.int64),
+            "reliability_score": np.concatenate(reliabilities) if reliabilities else np.zeros(0),
+            "capacity": rng.uniform(1000, 10000, num_edges),
+            "cost_per_unit": rng.uniform(100, 1000, num_edges),
+        }
+        return SyntheticNetwork(nodes, edges, countries)
@@ -0,0 +1,757 @@
+import copy
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+import numpy as np
+
+from ..data.models import SupplyChainMetrics
+
+# Version of the on-disk layout written by `NetworkArrays.save`
+STORE_FORMAT_VERSION = 1
+
+METRIC_NAMES = (
+    "throughput",
+    "inventory_level",
+    "lead_time",
+    "cost_per_unit",
+    "quality_score",
+)
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Return `array` reallocated so that it can hold at least `size` rows."""
+    if size <= len(array):
+        return array
+    new_array = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    new_array[: len(array)] = array
+    return new_array
+
+
+class NetworkArrays:
+    """Columnar storage of node and edge attributes with CSR incidence.
+
+    Nodes and edges are addressed by dense integer slots assigned in insertion
+    order. Edges reference their endpoints by slot, and the in/out incidence
+    structure is rebuilt lazily whenever the topology changes.
+    """
+
+    NODE_FIELDS = ("capacity", "utilization", "risk_score")
+    EDGE_FIELDS = ("capacity", "lead_time_days", "reliability_score", "cost_per_unit")
+    AGGREGATE_FIELDS = (
+        "in_count",
+        "in_capacity",
+        "out_capacity",
+        "in_lead_time",
+        "in_reliability",
+        "in_cost",
+    )
+
+    def __init__(self, initial_size: int = 64):
+        self._node_ids: Optional[List[str]] = []
+        self._node_index: Optional[Dict[str, int]] = {}
+        self._edge_ids: Optional[List[str]] = []
+        self._edge_index: Optional[Dict[str, int]] = {}
+
+        # Stores loaded from disk keep their ids as fixed-width bytes until
+        # they are first needed, see `load`.
+        self._encoded_node_ids: Optional[np.ndarray] = None
+        self._encoded_edge_ids: Optional[np.ndarray] = None
+        self.num_nodes = 0
+        self.num_edges = 0
+
+        # Nodes referenced by an edge before being added are kept as
+        # placeholders so that the graph semantics of networkx are preserved.
+        self._node_present = np.zeros(initial_size, dtype=bool)
+        self._node_columns = {
+            name: np.zeros(initial_size, dtype=np.float64) for name in self.NODE_FIELDS
+        }
+
+        # A directed graph holds at most one edge per (source, target) pair;
+        # re-adding a pair deactivates the edge it replaces. The index is
+        # dropped by bulk loads and rebuilt on the next single insert.
+        self._pair_index: Optional[Dict[Tuple[int, int], int]] = {}
+        self._edge_active = np.zeros(initial_size, dtype=bool)
+        self._edge_source = np.zeros(initial_size, dtype=np.int64)
+        self._edge_target = np.zeros(initial_size, dtype=np.int64)
+        self._edge_columns = {
+            name: np.zeros(initial_size, dtype=np.float64) for name in self.EDGE_FIELDS
+        }
+
+        # Per-node sums over active incident edges, maintained by deltas so
+        # that edge mutations are O(1). Touched node slots are marked dirty.
+        self._aggregates = {
+            name: np.zeros(initial_size, dtype=np.float64) for name in self.AGGREGATE_FIELDS
+        }
+        self._dirty: Set[int] = set()
+        self._all_dirty = False
+
+        self.topology_version = 0
+        self._csr_version = -1
+        self._in_indptr = np.zeros(1, dtype=np.int64)
+        self._in_order = np.zeros(0, dtype=np.int64)
+        self._out_indptr = np.zeros(1, dtype=np.int64)
+        self._out_order = np.zeros(0, dtype=np.int64)
+
+        # Names, as in `_stored_columns`, of the arrays still shared with
+        # other copies of the store. They are copied on first write.
+        self._shared: Set[str] = set()
+
+    def copy(self) -> "NetworkArrays":
+        """Return an independent copy of the store.
+
+        The arrays are shared copy-on-write: either store copies an array
+        the first time it writes to it, so a copy costs O(nodes + edges)
+        for the ids and leaves memory-mapped columns on disk. The CSR
+        incidence is never written in place and is shared outright.
+        """
+        clone = copy.copy(self)
+        for name, attribute in vars(self).items():
+            if isinstance(attribute, (list, set, dict)):
+                setattr(clone, name, type(attribute)(attribute))
+        shared = {"node_present", "edge_active", "edge_source", "edge_target"}
+        shared.update(f"node_{name}" for name in self.NODE_FIELDS)
+        shared.update(f"edge_{name}" for name in self.EDGE_FIELDS)
+        shared.update(f"aggregate_{name}" for name in self.AGGREGATE_FIELDS)
+        self._shared = shared
+        clone._shared = set(shared)
+        return clone
+
+    def _owned(self, array: np.ndarray, name: str, size: int = 0) -> np.ndarray:
+        """Return `array` grown to at least `size` rows and safe to write to.
+
+        `name` is the array's key in `_stored_columns`; if the array is
+        shared with another copy of the store, it is copied first.
+        """
+        if name in self._shared:
+            self._shared.discard(name)
+            if size <= len(array):
+                return np.array(array)
+        return _grow(array, size)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _stored_columns(self) -> Dict[str, np.ndarray]:
+        """Return the arrays written by `save`, keyed by file name."""
+        self.in_csr()
+        columns = {
+            "node_present": self.node_present,
+            "edge_active": self.edge_active,
+            "edge_source": self.edge_source,
+            "edge_target": self.edge_target,
+            "in_indptr": self._in_indptr,
+            "in_order": self._in_order,
+            "out_indptr": self._out_indptr,
+            "out_order": self._out_order,
+        }
+        columns.update({f"node_{name}": self.node_column(name) for name in self.NODE_FIELDS})
+        columns.update({f"edge_{name}": self.edge_column(name) for name in self.EDGE_FIELDS})
+        columns.update({f"aggregate_{name}": self.aggregate(name) for name in self.AGGREGATE_FIELDS})
+        return columns
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """Write the store as a directory of `.npy` files.
+
+        Ids are stored as fixed-width bytes, and the aggregates and CSR
+        incidence are stored precomputed, so `load` needs no parsing.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, ids, encoded in (
+            ("node_ids", self._node_ids, self._encoded_node_ids),
+            ("edge_ids", self._edge_ids, self._encoded_edge_ids),
+        ):
+            np.save(directory / f"{name}.npy", encoded if ids is None else np.array(ids, dtype="S"))
+        for name, values in self._stored_columns().items():
+            np.save(directory / f"{name}.npy", values)
+        meta = {
+            "format": STORE_FORMAT_VERSION,
+            "num_nodes": self.num_nodes,
+            "num_edges": self.num_edges,
+        }
+        (directory / "meta.json").write_text(json.dumps(meta))
+        return directory
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap_mode: Optional[str] = "c") -> "NetworkArrays":
+        """Open a store written by `save`.
+
+        With the default `mmap_mode="c"` every array is memory-mapped
+        copy-on-write: pages are read on first touch and changes stay in
+        memory. Use `"r+"` to write changes through to disk, or `None` to
+        read everything into memory. Ids are decoded on first use.
+        """
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        if meta["format"] != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported network store format {meta['format']!r}.")
+
+        def read(name: str) -> np.ndarray:
+            path = directory / f"{name}.npy"
+            values = np.load(path, mmap_mode=mmap_mode)
+            # Zero-length arrays cannot be mapped
+            return values if values.size or mmap_mode is None else np.load(path)
+
+        arrays = cls(initial_size=0)
+        arrays.num_nodes = meta["num_nodes"]
+        arrays.num_edges = meta["num_edges"]
+        arrays._node_ids = arrays._node_index = None
+        arrays._edge_ids = arrays._edge_index = None
+        arrays._encoded_node_ids = read("node_ids")
+        arrays._encoded_edge_ids = read("edge_ids")
+        arrays._pair_index = None
+
+        arrays._node_present = read("node_present")
+        arrays._node_columns = {name: read(f"node_{name}") for name in cls.NODE_FIELDS}
+        arrays._aggregates = {name: read(f"aggregate_{name}") for name in cls.AGGREGATE_FIELDS}
+        arrays._edge_active = read("edge_active")
+        arrays._edge_source = read("edge_source")
+        arrays._edge_target = read("edge_target")
+        arrays._edge_columns = {name: read(f"edge_{name}") for name in cls.EDGE_FIELDS}
+        for attr in ("_in_indptr", "_in_order", "_out_indptr", "_out_order"):
+            setattr(arrays, attr, read(attr[1:]))
+        arrays._csr_version = arrays.topology_version
+        arrays._all_dirty = True
+        return arrays
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def _node_slot(self, node_id: str) -> int:
+        """Return the slot for `node_id`, allocating a placeholder if needed."""
+        index = self.node_index.get(node_id)
+        if index is not None:
+            return index
+
+        index = self.num_nodes
+        self.num_nodes += 1
+        self.node_ids.append(node_id)
+        self.node_index[node_id] = index
+        self._grow_nodes()
+        self._dirty.add(index)
+        self.topology_version += 1
+        return index
+
+    def _grow_nodes(self) -> None:
+        """Make the node arrays writable and large enough for `num_nodes`."""
+        self._node_present = self._owned(self._node_present, "node_present", self.num_nodes)
+        for name in self.NODE_FIELDS:
+            self._node_columns[name] = self._owned(
+                self._node_columns[name], f"node_{name}", self.num_nodes
+            )
+        for name in self.AGGREGATE_FIELDS:
+            self._aggregates[name] = self._owned(
+                self._aggregates[name], f"aggregate_{name}", self.num_nodes
+            )
+
+    def _grow_edges(self) -> None:
+        """Make the edge arrays writable and large enough for `num_edges`."""
+        self._edge_active = self._owned(self._edge_active, "edge_active", self.num_edges)
+        self._edge_source = self._owned(self._edge_source, "edge_source", self.num_edges)
+        self._edge_target = self._owned(self._edge_target, "edge_target", self.num_edges)
+        for name in self.EDGE_FIELDS:
+            self._edge_columns[name] = self._owned(
+                self._edge_columns[name], f"edge_{name}", self.num_edges
+            )
+
+    def add_node(self, node_id: str, **values: float) -> int:
+        """Insert or overwrite a node and return its slot."""
+        index = self._node_slot(node_id)
+        self._node_present = self._owned(self._node_present, "node_present")
+        self._node_present[index] = True
+        self.set_node(index, **values)
+        return index
+
+    def add_edge(self, edge_id: str, source_id: str, target_id: str, **values: float) -> int:
+        """Insert an edge between two nodes and return its slot."""
+        source = self._node_slot(source_id)
+        target = self._node_slot(target_id)
+
+        index = self.edge_index.get(edge_id)
+        if index is None:
+            index = self.num_edges
+            self.num_edges += 1
+            self.edge_ids.append(edge_id)
+            self._edge_index[edge_id] = index
+        else:
+            self._apply_edge(index, -1.0)
+            self._pairs().pop(
+                (int(self._edge_source[index]), int(self._edge_target[index])), None
+            )
+        self._grow_edges()
+
+        replaced = self._pairs().get((source, target))
+        if replaced is not None and replaced != index:
+            self._apply_edge(replaced, -1.0)
+            self._edge_active[replaced] = False
+        self._pairs()[(source, target)] = index
+
+        self._edge_active[index] = True
+        self._edge_source[index] = source
+        self._edge_target[index] = target
+        for name, value in values.items():
+            self._edge_columns[name][index] = value
+        self._apply_edge(index, 1.0)
+        self.topology_version += 1
+        return index
+
+    @property
+    def node_ids(self) -> List[str]:
+        """Node ids by slot."""
+        if self._node_ids is None:
+            self._node_ids = self._encoded_node_ids.astype(str).tolist()
+            self._encoded_node_ids = None
+        return self._node_ids
+
+    @property
+    def edge_ids(self) -> List[str]:
+        """Edge ids by slot."""
+        if self._edge_ids is None:
+            self._edge_ids = self._encoded_edge_ids.astype(str).tolist()
+            self._encoded_edge_ids = None
+        return self._edge_ids
+
+    @property
+    def node_index(self) -> Dict[str, int]:
+        """Map of node id to slot, built lazily for stores loaded from disk."""
+        if self._node_index is None:
+            self._node_index = dict(zip(self.node_ids, range(self.num_nodes)))
+        return self._node_index
+
+    @property
+    def edge_index(self) -> Dict[str, int]:
+        """Map of edge id to slot, rebuilt lazily after bulk loads."""
+        if self._edge_index is None:
+            self._edge_index = dict(zip(self.edge_ids, range(self.num_edges)))
+        return self._edge_index
+
+    def _pairs(self) -> Dict[Tuple[int, int], int]:
+        if self._pair_index is None:
+            active = np.flatnonzero(self.edge_active)
+            self._pair_index = dict(
+                zip(
+                    zip(self.edge_source[active].tolist(), self.edge_target[active].tolist()),
+                    active.tolist(),
+                )
+            )
+        return self._pair_index
+
+    def extend_nodes(self, node_ids: List[str], **columns: np.ndarray) -> np.ndarray:
+        """Append many new nodes at once and return their slots.
+
+        `node_ids` must not already be present in the store.
+        """
+        start = self.num_nodes
+        count = len(node_ids)
+        self.num_nodes += count
+        self.node_ids.extend(node_ids)
+        if self._node_index is not None:
+            self._node_index.update(zip(node_ids, range(start, self.num_nodes)))
+
+        self._grow_nodes()
+        self._node_present[start : self.num_nodes] = True
+        for name in self.NODE_FIELDS:
+            self._node_columns[name][start : self.num_nodes] = columns.get(name, 0.0)
+        self._all_dirty = True
+        self.topology_version += 1
+        return np.arange(start, self.num_nodes)
+
+    def extend_edges(
+        self,
+        edge_ids: List[str],
+        source: np.ndarray,
+        target: np.ndarray,
+        **columns: np.ndarray,
+    ) -> np.ndarray:
+        """Append many new edges between existing node slots and return their slots.
+
+        `edge_ids` must be new and the `(source, target)` pairs unique among
+        active edges; aggregates are recomputed in one vectorized pass.
+        """
+        start = self.num_edges
+        count = len(edge_ids)
+        self.num_edges += count
+        self.edge_ids.extend(edge_ids)
+        self._edge_index = None
+
+        self._grow_edges()
+        self._edge_active[start : self.num_edges] = True
+        self._edge_source[start : self.num_edges] = source
+        self._edge_target[start : self.num_edges] = target
+        for name in self.EDGE_FIELDS:
+            self._edge_columns[name][start : self.num_edges] = columns.get(name, 0.0)
+
+        self._pair_index = None
+        self.topology_version += 1
+        self.rebuild_aggregates()
+        return np.arange(start, self.num_edges)
+
+    def set_node(self, index: int, **values: float) -> None:
+        """Overwrite numeric attributes of the node in `index`."""
+        for name, value in values.items():
+            column = self._node_columns[name] = self._owned(self._node_columns[name], f"node_{name}")
+            column[index] = value
+        self._dirty.add(index)
+
+    def set_edge(self, index: int, **values: float) -> None:
+        """Overwrite numeric attributes of the edge in `index`."""
+        self._apply_edge(index, -1.0)
+        for name, value in values.items():
+            column = self._edge_columns[name] = self._owned(self._edge_columns[name], f"edge_{name}")
+            column[index] = value
+        self._apply_edge(index, 1.0)
+
+    def _apply_edge(self, index: int, sign: float) -> None:
+        """Add (`sign=1`) or remove (`sign=-1`) an edge's share of the aggregates."""
+        if not self._edge_active[index]:
+            return
+        source = int(self._edge_source[index])
+        target = int(self._edge_target[index])
+        aggregates = self._aggregates
+        for name in self.AGGREGATE_FIELDS:
+            aggregates[name] = self._owned(aggregates[name], f"aggregate_{name}")
+        capacity = sign * self._edge_columns["capacity"][index]
+        aggregates["in_count"][target] += sign
+        aggregates["in_capacity"][target] += capacity
+        aggregates["out_capacity"][source] += capacity
+        aggregates["in_lead_time"][target] += sign * self._edge_columns["lead_time_days"][index]
+        aggregates["in_reliability"][target] += sign * self._edge_columns["reliability_score"][index]
+        aggregates["in_cost"][target] += sign * self._edge_columns["cost_per_unit"][index]
+        self._dirty.add(source)
+        self._dirty.add(target)
+
+    def rebuild_aggregates(self) -> None:
+        """Recompute the per-node aggregates from scratch, discarding drift."""
+        for name, values in compute_aggregates(self).items():
+            self._aggregates[name] = self._owned(self._aggregates[name], f"aggregate_{name}")
+            self._aggregates[name][: self.num_nodes] = values
+        self._all_dirty = True
+
+    def take_dirty(self) -> np.ndarray:
+        """Return and clear the slots of nodes touched since the last call."""
+        if self._all_dirty:
+            dirty = np.arange(self.num_nodes)
+        else:
+            dirty = np.fromiter(self._dirty, dtype=np.int64, count=len(self._dirty))
+        self._dirty.clear()
+        self._all_dirty = False
+        return dirty
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+    def node_column(self, name: str) -> np.ndarray:
+        """Return a view of a node attribute over all node slots."""
+        return self._node_columns[name][: self.num_nodes]
+
+    def edge_column(self, name: str) -> np.ndarray:
+        """Return a view of an edge attribute over all edge slots."""
+        return self._edge_columns[name][: self.num_edges]
+
+    def aggregate(self, name: str) -> np.ndarray:
+        """Return a view of a cached per-node edge aggregate."""
+        return self._aggregates[name][: self.num_nodes]
+
+    @property
+    def node_present(self) -> np.ndarray:
+        return self._node_present[: self.num_nodes]
+
+    @property
+    def edge_active(self) -> np.ndarray:
+        return self._edge_active[: self.num_edges]
+
+    @property
+    def edge_source(self) -> np.ndarray:
+        return self._edge_source[: self.num_edges]
+
+    @property
+    def edge_target(self) -> np.ndarray:
+        return self._edge_target[: self.num_edges]
+
+    def _build_csr(self) -> None:
+        """Rebuild the in/out incidence structure over active edges."""
+        active = np.flatnonzero(self.edge_active)
+        for endpoints, attr in ((self.edge_target, "_in"), (self.edge_source, "_out")):
+            keys = endpoints[active]
+            order = active[np.argsort(keys, kind="stable")]
+            counts = np.bincount(keys, minlength=self.num_nodes)
+            indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            setattr(self, f"{attr}_indptr", indptr)
+            setattr(self, f"{attr}_order", order)
+        self._csr_version = self.topology_version
+
+    def in_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return `(indptr, edge_slots)` of incoming edges grouped by target."""
+        if self._csr_version != self.topology_version:
+            self._build_csr()
+        return self._in_indptr, self._in_order
+
+    def out_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return `(indptr, edge_slots)` of outgoing edges grouped by source."""
+        if self._csr_version != self.topology_version:
+            self._build_csr()
+        return self._out_indptr, self._out_order
+
+    def in_edges(self, index: int) -> np.ndarray:
+        """Return the slots of active edges ending at node `index`."""
+        indptr, order = self.in_csr()
+        return order[indptr[index] : indptr[index + 1]]
+
+    def out_edges(self, index: int) -> np.ndarray:
+        """Return the slots of active edges starting at node `index`."""
+        indptr, order = self.out_csr()
+        return order[indptr[index] : indptr[index + 1]]
+
+
+def gather_segments(indptr: np.ndarray, order: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatenate the CSR segments of `rows` without a Python loop."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=order.dtype)
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return order[np.repeat(starts, lengths) + offsets]
+
+
+class StepMetrics:
+    """Columnar metrics produced by one simulation step."""
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        node_ids: List[str],
+        columns: Dict[str, np.ndarray],
+    ):
+        self.timestamp = timestamp
+        self.node_ids = node_ids
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def to_array(self) -> np.ndarray:
+        """Return the metrics as a `(nodes, metrics)` array ordered by METRIC_NAMES."""
+        return np.column_stack([self.columns[name] for name in METRIC_NAMES])
+
+    def to_models(self, node_ids: Optional[List[str]] = None) -> List[SupplyChainMetrics]:
+        """Materialize pydantic metrics, optionally only for `node_ids`."""
+        if node_ids is None:
+            rows = range(len(self.node_ids))
+        else:
+            position = {node_id: i for i, node_id in enumerate(self.node_ids)}
+            rows = [position[node_id] for node_id in node_ids]
+
+        columns = {name: self.columns[name].tolist() for name in METRIC_NAMES}
+        return [
+            SupplyChainMetrics(
+                timestamp=self.timestamp,
+                node_id=UUID(self.node_ids[row]),
+                **{name: columns[name][row] for name in METRIC_NAMES},
+            )
+            for row in rows
+        ]
+
+
+def compute_aggregates(arrays: NetworkArrays) -> Dict[str, np.ndarray]:
+    """Reduce edge attributes to per-node sums with weighted scatter-adds."""
+    num_nodes = arrays.num_nodes
+    active = arrays.edge_active.astype(np.float64)
+    source = arrays.edge_source
+    target = arrays.edge_target
+    edge_capacity = arrays.edge_column("capacity") * active
+
+    def scatter(index: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        return np.bincount(index, weights=weights, minlength=num_nodes)
+
+    return {
+        "in_count": scatter(target, active),
+        "in_capacity": scatter(target, edge_capacity),
+        "out_capacity": scatter(source, edge_capacity),
+        "in_lead_time": scatter(target, arrays.edge_column("lead_time_days") * active),
+        "in_reliability": scatter(target, arrays.edge_column("reliability_score") * active),
+        "in_cost": scatter(target, arrays.edge_column("cost_per_unit") * active),
+    }
+
+
+def _metrics_from_aggregates(
+    capacity: np.ndarray,
+    utilization: np.ndarray,
+    risk_score: np.ndarray,
+    aggregates: Dict[str, np.ndarray],
+    throughput_factor: Optional[np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """Derive node metrics from node attributes and incident-edge sums."""
+    throughput = capacity * utilization
+    if throughput_factor is not None:
+        throughput = throughput * throughput_factor
+
+    incoming = aggregates["in_count"]
+    has_incoming = incoming > 0
+    safe_incoming = np.where(has_incoming, incoming, 1.0)
+
+    def incoming_mean(name: str, default: float) -> np.ndarray:
+        return np.where(has_incoming, aggregates[name] / safe_incoming, default)
+
+    return {
+        "throughput": throughput,
+        "inventory_level": aggregates["in_capacity"] - aggregates["out_capacity"],
+        "lead_time": incoming_mean("in_lead_time", 0.0),
+        "cost_per_unit": incoming_mean("in_cost", 0.0),
+        "quality_score": risk_score * incoming_mean("in_reliability", 1.0),
+    }
+
+
+def compute_node_metrics(
+    arrays: NetworkArrays, throughput_factor: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """Compute per-node step metrics for every node slot.
+
+    Incoming and outgoing edge attributes are reduced per node with weighted
+    scatter-adds, so the cost is a handful of passes over the edge arrays.
+    `throughput_factor` optionally scales each node's throughput, e.g. for
+    shortfalls inherited through a cascade.
+    """
+    return _metrics_from_aggregates(
+        arrays.node_column("capacity"),
+        arrays.node_column("utilization"),
+        arrays.node_column("risk_score"),
+        compute_aggregates(arrays),
+        throughput_factor,
+    )
+
+
+class IncrementalMetrics:
+    """Per-node metrics cache that only recomputes dirty nodes.
+
+    Rows are derived from the aggregates `NetworkArrays` maintains under
+    mutation, so a refresh costs O(dirty nodes) plus a vectorized comparison
+    of the throughput factor.
+    """
+
+    def __init__(self):
+        self.columns = {name: np.zeros(0) for name in METRIC_NAMES}
+        self._throughput_factor: Optional[np.ndarray] = None
+        self.last_refreshed = 0
+        self._shared = False
+
+    def copy(self) -> "IncrementalMetrics":
+        """Return a cache that shares these columns until either refreshes rows."""
+        clone = copy.copy(self)
+        clone.columns = dict(self.columns)
+        self._shared = clone._shared = True
+        return clone
+
+    def refresh(
+        self, arrays: NetworkArrays, throughput_factor: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """Bring the cache up to date and return views over all node slots."""
+        num_nodes = arrays.num_nodes
+        dirty = [arrays.take_dirty()]
+
+        cached = len(self.columns[METRIC_NAMES[0]])
+        if cached < num_nodes:
+            for name in METRIC_NAMES:
+                self.columns[name] = _grow(self.columns[name], num_nodes)
+            dirty.append(np.arange(cached, len(self.columns[METRIC_NAMES[0]])))
+
+        previous = self._throughput_factor
+        if throughput_factor is not None or previous is not None:
+            current = np.ones(num_nodes) if throughput_factor is None else throughput_factor
+            if previous is None or len(previous) != num_nodes:
+                dirty.append(np.arange(num_nodes))
+            else:
+                dirty.append(np.flatnonzero(current != previous))
+            self._throughput_factor = None if throughput_factor is None else current.copy()
+
+        rows = np.unique(np.concatenate(dirty))
+        rows = rows[rows < num_nodes]
+        self.last_refreshed = len(rows)
+        if len(rows):
+            if self._shared:
+                self.columns = {name: column.copy() for name, column in self.columns.items()}
+                self._shared = False
+            values = _metrics_from_aggregates(
+                arrays.node_column("capacity")[rows],
+                arrays.node_column("utilization")[rows],
+                arrays.node_column("risk_score")[rows],
+                {name: arrays.aggregate(name)[rows] for name in NetworkArrays.AGGREGATE_FIELDS},
+                None if throughput_factor is None else throughput_factor[rows],
+            )
+            for name in METRIC_NAMES:
+                self.columns[name][rows] = values[name]
+
+        return {name: self.columns[name][:num_nodes] for name in METRIC_NAMES}
+
+
+def compute_step_metrics(
+    arrays: NetworkArrays,
+    timestamp: datetime,
+    throughput_factor: Optional[np.ndarray] = None,
+) -> StepMetrics:
+    """Compute columnar metrics for all present nodes at `timestamp`."""
+    return step_from_columns(arrays, timestamp, compute_node_metrics(arrays, throughput_factor))
+
+
+def step_from_columns(
+    arrays: NetworkArrays, timestamp: datetime, columns: Dict[str, np.ndarray]
+) -> StepMetrics:
+    """Wrap per-slot metric columns as a step over the present nodes."""
+    present = arrays.node_present
+    if present.all():
+        node_ids = list(arrays.node_ids)
+    else:
+        rows = np.flatnonzero(present)
+        node_ids = [arrays.node_ids[row] for row in rows]
+        columns = {name: values[rows] for name, values in columns.items()}
+    return StepMetrics(timestamp, node_ids, columns)
+
+
+class SimulationRun:
+    """Columnar history of a batched multi-step simulation run."""
+
+    def __init__(self, timestamps: List[datetime], node_ids: List[str], values: np.ndarray):
+        self.timestamps = timestamps
+        self.node_ids = node_ids
+        # Shape (steps, nodes, metrics), metrics ordered by METRIC_NAMES
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def metric(self, name: str) -> np.ndarray:
+        """Return the `(steps, nodes)` series of a single metric."""
+        return self.values[:, :, METRIC_NAMES.index(name)]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate each metric over all steps and nodes."""
+        summary = {}
+        for position, name in enumerate(METRIC_NAMES):
+            values = self.values[:, :, position]
+            if values.size == 0:
+                summary[name] = {"mean": 0.0, "min": 0.0, "max": 0.0, "final_mean": 0.0}
+                continue
+            summary[name] = {
+                "mean": float(values.mean()),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "final_mean": float(values[-1].mean()),
+            }
+        return summary
+
+    def series(self) -> Dict[str, Dict[str, List[float]]]:
+        """Return the full per-node series keyed by node id and metric."""
+        return {
+            node_id: {
+                name: self.values[:, column, position].tolist()
+                for position, name in enumerate(METRIC_NAMES)
+            }
+            for column, node_id in enumerate(self.node_ids)
+        }
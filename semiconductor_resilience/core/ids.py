@@ -0,0 +1,22 @@
+from typing import List
+
+import numpy as np
+
+
+def uuid4_bytes(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Draw `count` random version 4 UUIDs as a `(count, 16)` byte array."""
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw
+
+
+def uuid_strings(raw: np.ndarray) -> List[str]:
+    """Format a `(count, 16)` byte array as canonical UUID strings."""
+    digits = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+    hexed = np.empty((len(raw), 32), dtype=np.uint8)
+    hexed[:, 0::2] = digits[raw >> 4]
+    hexed[:, 1::2] = digits[raw & 0x0F]
+    text = np.full((len(raw), 36), ord("-"), dtype=np.uint8)
+    text[:, [i for i in range(36) if i not in (8, 13, 18, 23)]] = hexed
+    return text.view("S36").ravel().astype("U36").tolist()
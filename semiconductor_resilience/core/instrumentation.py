@@ -0,0 +1,185 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Type and help text of every exported metric
+METRICS = {
+    "phase_seconds": ("histogram", "Time spent in each simulation phase."),
+    "nodes_touched_total": ("counter", "Nodes changed or recomputed, by operation."),
+    "edges_touched_total": ("counter", "Edges changed, by operation."),
+    "http_requests_total": ("counter", "HTTP requests served, by route, method and status."),
+    "http_request_seconds": ("histogram", "HTTP request latency, by route."),
+    "http_response_bytes_total": ("counter", "HTTP response body bytes, by route and media type."),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Instrumentation:
+    """Thread-safe phase timers and counters in the Prometheus text format.
+
+    Timing a phase costs two `perf_counter` calls and a short critical
+    section, so instrumentation stays enabled in production.
+    """
+
+    def __init__(self, namespace: str = "simulation"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = defaultdict(float)
+        # Per series: cumulative-ready bucket counts, then the sum and count
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Add `value` to a counter."""
+        with self._lock:
+            self._counters[(name, _labels(labels))] += value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a value in a histogram with `DURATION_BUCKETS`."""
+        key = (name, _labels(labels))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0.0] * (len(DURATION_BUCKETS) + 2)
+            for position, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    series[position] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a simulation phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("phase_seconds", time.perf_counter() - start, phase=name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Return all series in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            if kind == "counter":
+                for (series_name, labels), value in sorted(counters.items()):
+                    if series_name == name:
+                        lines.append(f"{full_name}{_format_labels(labels)} {value:g}")
+                continue
+            for (series_name, labels), series in sorted(histograms.items()):
+                if series_name != name:
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(DURATION_BUCKETS, series):
+                    cumulative += count
+                    lines.append(
+                        f"{full_name}_bucket{_format_labels(labels, (('le', f'{bound:g}'),))} {cumulative:g}"
+                    )
+                lines.append(f"{full_name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {series[-1]:g}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {series[-2]:.9g}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {series[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared by the simulator and the API
+instrumentation = Instrumentation()
+
+
+class SamplingProfiler:
+    """Periodically sample the stacks of attached threads.
+
+    Work is attached with `run`, which registers the calling thread for the
+    duration of the call. `folded` returns the samples in the collapsed
+    stack format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._threads: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._sampler = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def run(self, func: Callable, *args: Any) -> Any:
+        """Call `func(*args)` with the current thread attached."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads.add(ident)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._threads.discard(ident)
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                threads = list(self._threads)
+            if not threads:
+                continue
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._stacks[self._fold(frame)] += 1
+                    self.samples += 1
+
+    @staticmethod
+    def _fold(frame: Any) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+# Profiler of the request being served, if it asked for one
+current_profiler: ContextVar[Optional[SamplingProfiler]] = ContextVar("current_profiler", default=None)
@@ -0,0 +1,432 @@
+import copy
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from ..data.models import SupplyChainMetrics
+from .engine import METRIC_NAMES
+from .ids import uuid_strings
+
+_EPOCH = np.datetime64("1970-01-01T00:00:00", "us")
+
+
+def _to_datetime64(value: datetime) -> np.datetime64:
+    """Convert a (possibly timezone-aware) datetime to naive UTC microseconds."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """The splitmix64 finalizer over a uint64 array."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def metric_ids(node_ids: Sequence[str], nodes: np.ndarray, timestamps: np.ndarray) -> List[str]:
+    """Return stable UUID strings for metric rows.
+
+    Row `i` is the metrics of `node_ids[nodes[i]]` at `timestamps[i]`. Its
+    id is a hash of the two, so a stored row has the same id in every
+    response and clients can deduplicate rows across deltas.
+    """
+    words = np.frombuffer(b"".join(UUID(node_id).bytes for node_id in node_ids), dtype=">u8")
+    words = words.reshape(-1, 2).astype(np.uint64)[nodes]
+    time = _mix(timestamps.astype("datetime64[us]").astype(np.int64).astype(np.uint64))
+    high = _mix(words[:, 0] ^ time)
+    low = _mix(words[:, 1] ^ _mix(time ^ high))
+    raw = np.stack([high, low], axis=1).astype(">u8").view(np.uint8).reshape(-1, 16)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x80  # Version 8, custom
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return uuid_strings(raw)
+
+
+class MetricsStore:
+    """Bounded columnar history of per-node simulation metrics.
+
+    The most recent `retention_steps` steps are kept at full resolution in a
+    ring buffer with one `(steps, nodes)` column per metric. The ring grows
+    geometrically as steps are appended and only wraps once it holds
+    `retention_steps` rows, so short histories stay small. Steps that fall
+    out of the ring are folded into mean aggregates over `downsample_days`
+    buckets, of which at most `max_aggregates` are retained. Both tiers are
+    ordered by timestamp, so time-range queries are binary searches.
+    """
+
+    def __init__(
+        self,
+        retention_steps: int = 365,
+        downsample_days: Optional[int] = 7,
+        max_aggregates: int = 260,
+        dtype: type = np.float64,
+    ):
+        if retention_steps < 1:
+            raise ValueError("retention_steps must be at least 1.")
+        self.retention_steps = retention_steps
+        self.downsample_days = downsample_days
+        self.max_aggregates = max_aggregates
+        self.dtype = np.dtype(dtype)
+
+        self.node_ids: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self._node_capacity = 0
+        self._last_ids: Optional[Sequence[str]] = None
+        self._last_columns = np.zeros(0, dtype=np.int64)
+
+        # Full-resolution ring buffer, grown on demand
+        self._times = np.zeros(0, dtype="datetime64[us]")
+        self._columns = {name: np.zeros((0, 0), dtype=self.dtype) for name in METRIC_NAMES}
+        self._start = 0
+        self._size = 0
+        self.steps_appended = 0
+
+        # Downsampled tier, kept as a ring of buckets grown on demand
+        self._agg_times = np.zeros(0, dtype="datetime64[us]")
+        self._agg_sums = {name: np.zeros((0, 0)) for name in METRIC_NAMES}
+        self._agg_counts = np.zeros((0, 0), dtype=np.int64)
+        self._agg_start = 0
+        self._agg_size = 0
+        self._shared = False
+
+    def __len__(self) -> int:
+        return self._size + self._agg_size
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.node_index
+
+    def __iter__(self):
+        return iter(self.node_ids)
+
+    @property
+    def oldest_step(self) -> int:
+        """Sequence number of the oldest step still held at full resolution."""
+        return self.steps_appended - self._size
+
+    def fork(self) -> "MetricsStore":
+        """Return a store that shares this history until either is written to.
+
+        The first write to a shared store copies its buffers, so forking is
+        O(nodes) and only branches that keep recording pay for a full copy.
+        """
+        clone = copy.copy(self)
+        clone.node_ids = list(self.node_ids)
+        clone.node_index = dict(self.node_index)
+        clone._columns = dict(self._columns)
+        clone._agg_sums = dict(self._agg_sums)
+        self._shared = clone._shared = True
+        return clone
+
+    def _unshare(self) -> None:
+        self._times = self._times.copy()
+        self._columns = {name: column.copy() for name, column in self._columns.items()}
+        self._agg_times = self._agg_times.copy()
+        self._agg_sums = {name: sums.copy() for name, sums in self._agg_sums.items()}
+        self._agg_counts = self._agg_counts.copy()
+        self._shared = False
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _grow_steps(self) -> None:
+        """Double the step dimension of the ring, up to `retention_steps` rows.
+
+        Only called while the ring is not yet full, so it has never wrapped
+        and its rows are in order.
+        """
+        capacity = min(self.retention_steps, max(8, 2 * len(self._times)))
+        times = np.zeros(capacity, dtype="datetime64[us]")
+        times[: self._size] = self._times[: self._size]
+        self._times = times
+        for name in METRIC_NAMES:
+            column = np.full((capacity, self._node_capacity), np.nan, dtype=self.dtype)
+            column[: self._size] = self._columns[name][: self._size]
+            self._columns[name] = column
+
+    def _resize_nodes(self, num_nodes: int) -> None:
+        """Grow the node dimension of both tiers, padding with NaN."""
+        capacity = max(num_nodes, 2 * self._node_capacity, 16)
+        for name in METRIC_NAMES:
+            column = np.full((len(self._times), capacity), np.nan, dtype=self.dtype)
+            column[:, : self._node_capacity] = self._columns[name]
+            self._columns[name] = column
+
+            sums = np.zeros((len(self._agg_times), capacity))
+            sums[:, : self._node_capacity] = self._agg_sums[name]
+            self._agg_sums[name] = sums
+        counts = np.zeros((len(self._agg_times), capacity), dtype=np.int64)
+        counts[:, : self._node_capacity] = self._agg_counts
+        self._agg_counts = counts
+        self._node_capacity = capacity
+
+    def _columns_for(self, node_ids: Sequence[str]) -> np.ndarray:
+        """Map node ids to store columns, registering unseen nodes."""
+        if node_ids is self._last_ids or (
+            self._last_ids is not None
+            and len(node_ids) == len(self._last_ids)
+            and node_ids == self._last_ids
+        ):
+            return self._last_columns
+
+        for node_id in node_ids:
+            if node_id not in self.node_index:
+                self.node_index[node_id] = len(self.node_ids)
+                self.node_ids.append(node_id)
+        if len(self.node_ids) > self._node_capacity:
+            self._resize_nodes(len(self.node_ids))
+
+        self._last_ids = list(node_ids)
+        self._last_columns = np.fromiter(
+            (self.node_index[node_id] for node_id in node_ids),
+            dtype=np.int64,
+            count=len(node_ids),
+        )
+        return self._last_columns
+
+    def append(self, timestamp: datetime, node_ids: Sequence[str], values: np.ndarray) -> None:
+        """Record one step of metrics.
+
+        `values` has shape `(len(node_ids), len(METRIC_NAMES))`. Timestamps
+        must be non-decreasing across calls.
+        """
+        if self._shared:
+            self._unshare()
+        columns = self._columns_for(node_ids)
+        time = _to_datetime64(timestamp)
+        if len(self) and time < self._latest_time():
+            raise ValueError("Metrics must be appended in timestamp order.")
+
+        if self._size == self.retention_steps:
+            self._evict_oldest()
+        elif self._size == len(self._times):
+            self._grow_steps()
+        slot = (self._start + self._size) % len(self._times)
+        self._size += 1
+        self.steps_appended += 1
+
+        self._times[slot] = time
+        for position, name in enumerate(METRIC_NAMES):
+            row = self._columns[name][slot]
+            row[:] = np.nan
+            row[columns] = values[:, position]
+
+    def _latest_time(self) -> np.datetime64:
+        if self._size:
+            return self._times[(self._start + self._size - 1) % len(self._times)]
+        return self._agg_times[(self._agg_start + self._agg_size - 1) % len(self._agg_times)]
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest ring slot, folding it into the downsampled tier."""
+        slot = self._start
+        self._start = (self._start + 1) % len(self._times)
+        self._size -= 1
+        if not self.downsample_days or self.max_aggregates < 1:
+            return
+
+        bucket_days = np.timedelta64(self.downsample_days, "D")
+        bucket = _EPOCH + ((self._times[slot] - _EPOCH) // bucket_days) * bucket_days
+        if self._agg_size and self._agg_times[self._agg_last()] == bucket:
+            position = self._agg_last()
+        else:
+            position = self._agg_allocate(bucket)
+
+        valid = ~np.isnan(self._columns[METRIC_NAMES[0]][slot])
+        self._agg_counts[position] += valid
+        for name in METRIC_NAMES:
+            self._agg_sums[name][position] += np.where(valid, self._columns[name][slot], 0.0)
+
+    def _agg_last(self) -> int:
+        return (self._agg_start + self._agg_size - 1) % len(self._agg_times)
+
+    def _agg_allocate(self, bucket: np.datetime64) -> int:
+        """Open a new aggregate bucket, recycling the oldest when full."""
+        capacity = len(self._agg_times)
+        if self._agg_size == capacity and capacity < self.max_aggregates:
+            # Unroll the ring into a larger buffer
+            new_capacity = min(self.max_aggregates, max(4, 2 * capacity))
+            order = (self._agg_start + np.arange(self._agg_size)) % max(capacity, 1)
+            times = np.zeros(new_capacity, dtype="datetime64[us]")
+            times[: self._agg_size] = self._agg_times[order]
+            counts = np.zeros((new_capacity, self._node_capacity), dtype=np.int64)
+            counts[: self._agg_size] = self._agg_counts[order]
+            for name in METRIC_NAMES:
+                sums = np.zeros((new_capacity, self._node_capacity))
+                sums[: self._agg_size] = self._agg_sums[name][order]
+                self._agg_sums[name] = sums
+            self._agg_times, self._agg_counts = times, counts
+            self._agg_start = 0
+            capacity = new_capacity
+
+        if self._agg_size == capacity:
+            position = self._agg_start
+            self._agg_start = (self._agg_start + 1) % capacity
+        else:
+            position = (self._agg_start + self._agg_size) % capacity
+            self._agg_size += 1
+
+        self._agg_times[position] = bucket
+        self._agg_counts[position] = 0
+        for name in METRIC_NAMES:
+            self._agg_sums[name][position] = 0.0
+        return position
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _ring_range(
+        times: np.ndarray,
+        start: int,
+        size: int,
+        lower: Optional[np.datetime64],
+        upper: Optional[np.datetime64],
+    ) -> np.ndarray:
+        """Return physical ring positions with `lower <= time <= upper`, in order."""
+        capacity = len(times)
+        if size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        segments = [(start, min(start + size, capacity))]
+        if start + size > capacity:
+            segments.append((0, start + size - capacity))
+
+        positions = []
+        for begin, end in segments:
+            segment = times[begin:end]
+            low = 0 if lower is None else np.searchsorted(segment, lower, side="left")
+            high = len(segment) if upper is None else np.searchsorted(segment, upper, side="right")
+            positions.append(np.arange(begin + low, begin + high))
+        return np.concatenate(positions)
+
+    def query(
+        self,
+        node_id: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        since_step: Optional[int] = None,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Return `(timestamps, {metric: values})` for a node within a time range.
+
+        Downsampled buckets precede full-resolution steps; steps in which the
+        node did not exist are omitted. With `since_step`, only full-resolution
+        steps whose sequence number is at least `since_step` are returned.
+        """
+        column = self.node_index[node_id]
+        lower = None if start_time is None else _to_datetime64(start_time)
+        upper = None if end_time is None else _to_datetime64(end_time)
+
+        if since_step is None:
+            agg_positions = self._ring_range(
+                self._agg_times, self._agg_start, self._agg_size, lower, upper
+            )
+        else:
+            agg_positions = np.zeros(0, dtype=np.int64)
+        counts = self._agg_counts[agg_positions, column]
+        agg_positions = agg_positions[counts > 0]
+        counts = counts[counts > 0]
+
+        positions = self._ring_range(self._times, self._start, self._size, lower, upper)
+        if since_step is not None:
+            sequence = self.oldest_step + (positions - self._start) % len(self._times)
+            positions = positions[sequence >= since_step]
+        positions = positions[~np.isnan(self._columns[METRIC_NAMES[0]][positions, column])]
+
+        timestamps = np.concatenate([self._agg_times[agg_positions], self._times[positions]])
+        values = {
+            name: np.concatenate([
+                self._agg_sums[name][agg_positions, column] / counts,
+                self._columns[name][positions, column].astype(np.float64),
+            ])
+            for name in METRIC_NAMES
+        }
+        return timestamps, values
+
+    def to_models(
+        self,
+        node_id: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        since_step: Optional[int] = None,
+    ) -> List[SupplyChainMetrics]:
+        """Materialize the stored history of one node as pydantic metrics.
+
+        Ids come from `metric_ids`, and rows are stamped with their own
+        timestamp rather than the time of the call.
+        """
+        timestamps, values = self.query(node_id, start_time, end_time, since_step)
+        columns = {name: values[name].tolist() for name in METRIC_NAMES}
+        ids = metric_ids([node_id], np.zeros(len(timestamps), dtype=np.int64), timestamps)
+        uuid = UUID(node_id)
+        return [
+            SupplyChainMetrics(
+                id=ids[row],
+                timestamp=timestamp,
+                node_id=uuid,
+                **{name: columns[name][row] for name in METRIC_NAMES},
+                created_at=timestamp,
+                updated_at=timestamp,
+            )
+            for row, timestamp in enumerate(timestamps.astype(datetime).tolist())
+        ]
+
+    def to_columns(self, since_step: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Return the retained history of every node as long-format columns.
+
+        Rows are ordered by time, with downsampled buckets first. `node` holds
+        positions into `node_ids`; the other columns are `timestamp` and one
+        per metric. `since_step` has the same meaning as in `query`.
+        """
+        num_nodes = len(self.node_ids)
+        times, nodes = [], []
+        values: Dict[str, List[np.ndarray]] = {name: [] for name in METRIC_NAMES}
+
+        if since_step is None:
+            agg_positions = self._ring_range(
+                self._agg_times, self._agg_start, self._agg_size, None, None
+            )
+            counts = self._agg_counts[agg_positions, :num_nodes]
+            rows, columns = np.nonzero(counts)
+            times.append(self._agg_times[agg_positions[rows]])
+            nodes.append(columns)
+            for name in METRIC_NAMES:
+                sums = self._agg_sums[name][agg_positions[rows], columns]
+                values[name].append(sums / counts[rows, columns])
+
+        positions = self._ring_range(self._times, self._start, self._size, None, None)
+        if since_step is not None:
+            sequence = self.oldest_step + (positions - self._start) % len(self._times)
+            positions = positions[sequence >= since_step]
+        present = ~np.isnan(self._columns[METRIC_NAMES[0]][positions, :num_nodes])
+        rows, columns = np.nonzero(present)
+        times.append(self._times[positions[rows]])
+        nodes.append(columns)
+        for name in METRIC_NAMES:
+            values[name].append(
+                self._columns[name][positions[rows], columns].astype(np.float64)
+            )
+
+        result = {
+            "node": np.concatenate(nodes).astype(np.int64),
+            "timestamp": np.concatenate(times),
+        }
+        result.update({name: np.concatenate(values[name]) for name in METRIC_NAMES})
+        return result
+
+    def to_model_dict(self, since_step: Optional[int] = None) -> Dict[str, List[SupplyChainMetrics]]:
+        """Materialize the retained history of every node, keyed by node id.
+
+        With `since_step`, only steps appended from that sequence number on
+        are included, and nodes without such steps are left out.
+        """
+        if since_step is not None and since_step >= self.steps_appended:
+            return {}
+        result = {}
+        for node_id in self.node_ids:
+            models = self.to_models(node_id, since_step=since_step)
+            if models or since_step is None:
+                result[node_id] = models
+        return result
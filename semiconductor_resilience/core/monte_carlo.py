@@ -0,0 +1,378 @@
+import multiprocessing
+import os
+import pickle
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from uuid import uuid4
+
+import numpy as np
+
+from ..data.models import DisruptionScenario
+from .simulation import SupplyChainSimulator
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram with mergeable counts and approximate percentiles.
+
+    Memory is bounded by the number of bins regardless of how many values
+    are added, and histograms built in different processes merge exactly.
+    """
+
+    def __init__(self, low: float, high: float, bins: int = 1000):
+        self.low = low
+        self.high = high
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def add(self, values: np.ndarray) -> None:
+        """Add a batch of values, clipping them to the histogram range."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        bins = len(self.counts)
+        position = (np.clip(values, self.low, self.high) - self.low) / (self.high - self.low)
+        index = np.minimum((position * bins).astype(np.int64), bins - 1)
+        self.counts += np.bincount(index, minlength=bins)
+        self.count += values.size
+        self.total += float(values.sum())
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        """Fold the counts of another histogram with the same bins into this one."""
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile by interpolating within its bin."""
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, target, side="left"))
+        index = min(index, len(self.counts) - 1)
+        before = cumulative[index - 1] if index else 0
+        fraction = (target - before) / max(self.counts[index], 1)
+        width = (self.high - self.low) / len(self.counts)
+        value = self.low + (index + fraction) * width
+        return float(np.clip(value, self.minimum, self.maximum))
+
+
+class EnsembleResult:
+    """Aggregated outcome of a Monte Carlo ensemble."""
+
+    def __init__(self, horizon_days: int, scenario_names: List[str]):
+        self.horizon_days = horizon_days
+        self.scenario_names = scenario_names
+        self.num_trajectories = 0
+        self.throughput_loss = StreamingHistogram(0.0, 1.0, bins=1000)
+        self.recovery_days = StreamingHistogram(0.0, horizon_days + 1, bins=horizon_days + 1)
+        self.scenario_counts = np.zeros(len(scenario_names), dtype=np.int64)
+
+    def merge(self, other: "EnsembleResult") -> None:
+        """Fold a partial result into this one."""
+        self.num_trajectories += other.num_trajectories
+        self.throughput_loss.merge(other.throughput_loss)
+        self.recovery_days.merge(other.recovery_days)
+        self.scenario_counts += other.scenario_counts
+
+    def summary(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95, 99)) -> Dict:
+        """Summarize the loss and recovery distributions."""
+
+        def describe(histogram: StreamingHistogram) -> Dict[str, float]:
+            result = {"mean": histogram.mean}
+            result.update({f"p{q:g}": histogram.percentile(q) for q in percentiles})
+            return result
+
+        return {
+            "trajectories": self.num_trajectories,
+            "horizon_days": self.horizon_days,
+            "throughput_loss": describe(self.throughput_loss),
+            "recovery_days": describe(self.recovery_days),
+            "scenario_frequency": {
+                name: float(count) / max(self.num_trajectories, 1)
+                for name, count in zip(self.scenario_names, self.scenario_counts)
+            },
+        }
+
+
+# Read-only base network shared by all trajectories of a worker process,
+# and the directory it was mapped from when it came from `_save_base`
+_WORKER_BASE: Optional[Dict] = None
+_WORKER_BASE_DIRECTORY: Optional[str] = None
+
+
+def _init_worker(base: Dict) -> None:
+    global _WORKER_BASE
+    _WORKER_BASE = base
+
+
+def _run_chunk_in_worker(start: int, count: int) -> EnsembleResult:
+    return _run_chunk(_WORKER_BASE, start, count)
+
+
+def _save_base(base: Dict, directory: Path) -> None:
+    """Write a base as `.npy` files plus a pickle of its scalar fields."""
+    meta = {}
+    for key, value in base.items():
+        if isinstance(value, np.ndarray):
+            np.save(directory / f"{key}.npy", value)
+        elif key == "affected":
+            flat = np.concatenate(value) if value else np.zeros(0, dtype=np.int64)
+            np.save(directory / "affected.npy", flat)
+            meta["affected_lengths"] = [len(slots) for slots in value]
+        else:
+            meta[key] = value
+    with open(directory / "meta.pkl", "wb") as handle:
+        pickle.dump(meta, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_base(directory: str) -> Dict:
+    """Map a base written by `_save_base` read-only, caching it per worker."""
+    global _WORKER_BASE, _WORKER_BASE_DIRECTORY
+    if _WORKER_BASE_DIRECTORY == directory:
+        return _WORKER_BASE
+
+    path = Path(directory)
+    with open(path / "meta.pkl", "rb") as handle:
+        base = pickle.load(handle)
+    for file in path.glob("*.npy"):
+        values = np.load(file, mmap_mode="r")
+        # Zero-length arrays cannot be mapped
+        base[file.stem] = values if values.size else np.load(file)
+    lengths = base.pop("affected_lengths")
+    base["affected"] = np.split(base["affected"], np.cumsum(lengths)[:-1]) if lengths else []
+    _WORKER_BASE, _WORKER_BASE_DIRECTORY = base, directory
+    return base
+
+
+def _run_saved_chunk(directory: str, start: int, count: int) -> EnsembleResult:
+    return _run_chunk(_load_base(directory), start, count)
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """Start workers from a forkserver, or spawn them where it is unavailable.
+
+    Forking the caller is avoided: it may be a multithreaded server, and a
+    forked child inherits whatever locks its other threads held.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def ensemble_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Create a process pool that `MonteCarloEnsemble.run` can share across runs."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        mp_context=_worker_context(),
+    )
+
+
+def _simulate_trajectory(base: Dict, rng: np.random.Generator) -> Tuple[float, float, np.ndarray]:
+    """Sample one trajectory and return `(throughput_loss, recovery_days, fired)`."""
+    horizon = base["horizon_days"]
+    fired = rng.random(len(base["probability"])) < base["probability"]
+    onset = rng.integers(0, horizon, size=len(fired))
+    severity = np.clip(
+        rng.normal(base["impact_severity"], base["severity_spread"]), 0.0, 1.0
+    )
+    if not fired.any():
+        return 0.0, 0.0, fired
+
+    end = np.minimum(onset + base["duration_days"], horizon)
+    boundaries = np.unique(np.concatenate(([0, horizon], onset[fired], end[fired])))
+
+    baseline = base["baseline_total"]
+    produced = 0.0
+    recovered_at = None
+    for begin, finish in zip(boundaries[:-1], boundaries[1:]):
+        active = np.flatnonzero(fired & (onset <= begin) & (begin < end))
+        if len(active):
+            factor = np.ones_like(base["throughput"])
+            for scenario in active:
+                affected = base["affected"][scenario]
+                factor[affected] *= 1 - severity[scenario] * base["half_risk"][affected]
+            total = float(base["throughput"] @ factor)
+        else:
+            total = baseline
+        produced += total * (finish - begin)
+        if total < (1 - base["recovery_tolerance"]) * baseline:
+            recovered_at = finish
+
+    first_onset = int(onset[fired].min())
+    recovery = float(recovered_at - first_onset) if recovered_at is not None else 0.0
+    loss = 1.0 - produced / (baseline * horizon) if baseline > 0 else 0.0
+    return loss, recovery, fired
+
+
+def _run_chunk(base: Dict, start: int, count: int) -> EnsembleResult:
+    """Run trajectories `start .. start + count` and aggregate them."""
+    result = EnsembleResult(base["horizon_days"], base["scenario_names"])
+    losses = np.empty(count)
+    recoveries = np.empty(count)
+    for offset in range(count):
+        # Seeding by trajectory index keeps results independent of chunking
+        sequence = np.random.SeedSequence(
+            base["entropy"], spawn_key=base["spawn_key"] + (start + offset,)
+        )
+        loss, recovery, fired = _simulate_trajectory(base, np.random.default_rng(sequence))
+        losses[offset] = loss
+        recoveries[offset] = recovery
+        result.scenario_counts += fired
+    result.num_trajectories = count
+    result.throughput_loss.add(losses)
+    result.recovery_days.add(recoveries)
+    return result
+
+
+class MonteCarloEnsemble:
+    """Stochastic ensemble of disruption trajectories over a simulator's network.
+
+    Each trajectory samples which scenarios fire according to their
+    probability, when they start within the horizon and how severe they are.
+    Scenario impacts follow `SupplyChainSimulator.apply_disruption` and are
+    combined multiplicatively while scenarios overlap; affected nodes recover
+    once a scenario's duration has elapsed.
+    """
+
+    def __init__(
+        self,
+        simulator: SupplyChainSimulator,
+        scenarios: List[DisruptionScenario],
+        horizon_days: int = 365,
+        severity_spread: float = 0.1,
+        recovery_tolerance: float = 0.01,
+    ):
+        if horizon_days < 1:
+            raise ValueError("horizon_days must be at least 1.")
+        self.simulator = simulator
+        self.scenarios = scenarios
+        self.horizon_days = horizon_days
+        self.severity_spread = severity_spread
+        self.recovery_tolerance = recovery_tolerance
+
+    def snapshot(self, seed: Union[int, np.random.SeedSequence] = 42) -> Dict:
+        """Collect the read-only arrays that every trajectory needs.
+
+        The result holds copies rather than views of the simulator's
+        arrays, so the simulator may change while it is passed to `run`.
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        arrays = self.simulator.arrays
+        throughput = (
+            arrays.node_column("capacity") * arrays.node_column("utilization")
+        ) * arrays.node_present
+        affected = [
+            np.array(
+                [arrays.node_index[node_id] for node_id in self.simulator.match_scenario_nodes(scenario)],
+                dtype=np.int64,
+            )
+            for scenario in self.scenarios
+        ]
+        return {
+            "entropy": seed.entropy,
+            "spawn_key": tuple(seed.spawn_key),
+            "horizon_days": self.horizon_days,
+            "severity_spread": self.severity_spread,
+            "recovery_tolerance": self.recovery_tolerance,
+            "scenario_names": [scenario.name for scenario in self.scenarios],
+            "probability": np.array([scenario.probability for scenario in self.scenarios]),
+            "impact_severity": np.array([scenario.impact_severity for scenario in self.scenarios]),
+            "duration_days": np.array([scenario.duration_days for scenario in self.scenarios]),
+            "throughput": throughput,
+            "baseline_total": float(throughput.sum()),
+            "half_risk": (1 + arrays.node_column("risk_score")) / 2,
+            "affected": affected,
+        }
+
+    @staticmethod
+    def _chunks(num_trajectories: int, chunk_size: int) -> Iterable[Tuple[int, int]]:
+        for start in range(0, num_trajectories, chunk_size):
+            yield start, min(chunk_size, num_trajectories - start)
+
+    def run(
+        self,
+        num_trajectories: int,
+        seed: Union[int, np.random.SeedSequence] = 42,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        progress: Optional[Callable[[int, int], None]] = None,
+        executor: Optional[Executor] = None,
+        base: Optional[Dict] = None,
+    ) -> EnsembleResult:
+        """Run the ensemble and return its aggregated distributions.
+
+        `seed` may also be a `SeedSequence`, e.g. a child spawned from a
+        `SupplyChainDataGenerator`. With `max_workers=1` trajectories run in
+        the calling process; otherwise chunks are fanned out over a process
+        pool with at most `2 * max_workers` in flight, and partial results
+        are merged as they complete. `executor`, e.g. from
+        `ensemble_executor`, is a pool shared with other runs; without one,
+        a pool is created for this run. A private pool receives the base
+        arrays once per worker through its initializer; for a shared pool
+        they are written once to a temporary directory that workers map
+        read-only, and chunks are sent as index ranges. `progress`, if
+        given, is called with `(completed, num_trajectories)` after every
+        merged chunk. `base`, from `snapshot`, is used instead of taking a
+        snapshot now, in which case `seed` is ignored.
+        """
+        if base is None:
+            base = self.snapshot(seed)
+        result = EnsembleResult(self.horizon_days, base["scenario_names"])
+        chunks = self._chunks(num_trajectories, chunk_size)
+        workers = max_workers or os.cpu_count() or 1
+
+        def merge(partial: EnsembleResult) -> None:
+            result.merge(partial)
+            if progress is not None:
+                progress(result.num_trajectories, num_trajectories)
+
+        if workers == 1:
+            for start, count in chunks:
+                merge(_run_chunk(base, start, count))
+            return result
+
+        def fan_out(submit: Callable[[int, int], object]) -> None:
+            pending = set()
+            for start, count in chunks:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+                pending.add(submit(start, count))
+            for future in pending:
+                merge(future.result())
+
+        if executor is not None:
+            # Workers of a shared pool serve other runs, so the base is
+            # mapped from disk by each worker on its first chunk. Workers
+            # cache it by directory, which must therefore never be reused.
+            with tempfile.TemporaryDirectory(prefix=f"ensemble-{uuid4().hex}-") as directory:
+                _save_base(base, Path(directory))
+                fan_out(
+                    lambda start, count: executor.submit(_run_saved_chunk, directory, start, count)
+                )
+            return result
+
+        # The base arrays are pickled once per worker of a private pool
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_worker_context(),
+            initializer=_init_worker,
+            initargs=(base,),
+        ) as private:
+            fan_out(lambda start, count: private.submit(_run_chunk_in_worker, start, count))
+        return result
@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..data.models import DisruptionScenario, RiskAssessment
+from .engine import NetworkArrays
+
+# Columns of a risk matrix, in `RiskAssessment` order
+RISK_FIELDS = ("risk_score", "impact_score", "mitigation_cost", "recovery_time_days")
+
+
+class RiskMatrix:
+    """Risk assessments of every node under every scenario, as columns.
+
+    Each field is a `(scenarios, nodes)` array; row `i` belongs to
+    `scenarios[i]` and column `j` to `node_ids[j]`. `affected`, if set,
+    masks the nodes each scenario actually hits.
+    """
+
+    def __init__(
+        self,
+        node_ids: List[str],
+        scenarios: Sequence[DisruptionScenario],
+        risk_score: np.ndarray,
+        impact_score: np.ndarray,
+        mitigation_cost: np.ndarray,
+        recovery_time_days: np.ndarray,
+        affected: Optional[np.ndarray] = None,
+    ):
+        self.node_ids = node_ids
+        self.scenarios = list(scenarios)
+        self.risk_score = risk_score
+        self.impact_score = impact_score
+        self.mitigation_cost = mitigation_cost
+        self.recovery_time_days = recovery_time_days
+        self.affected = affected
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.risk_score.shape
+
+    def top_k(self, k: int, by: str = "risk_score") -> List[np.ndarray]:
+        """Return, per scenario, the column indices of the `k` highest values of `by`.
+
+        Indices are ordered from the highest value down. With `affected`
+        set, only nodes hit by the scenario are ranked.
+        """
+        if by not in RISK_FIELDS:
+            raise ValueError(f"Cannot rank by {by!r}; expected one of {RISK_FIELDS}.")
+        values = getattr(self, by).astype(np.float64)
+        if self.affected is not None:
+            values = np.where(self.affected, values, -np.inf)
+
+        result = []
+        for row in values:
+            candidates = np.flatnonzero(row > -np.inf)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-row[candidates], k - 1)[:k]]
+            # Highest first; ties by column for a stable order
+            result.append(candidates[np.lexsort((candidates, -row[candidates]))])
+        return result
+
+    def summary(self) -> List[Dict[str, float]]:
+        """Per scenario: nodes at risk and the mean, total and worst figures."""
+        summaries = []
+        for i in range(len(self.scenarios)):
+            columns = slice(None) if self.affected is None else self.affected[i]
+            risk = self.risk_score[i, columns]
+            summaries.append({
+                "nodes_at_risk": int(len(risk)),
+                "mean_risk_score": float(risk.mean()) if len(risk) else 0.0,
+                "mean_impact_score": float(self.impact_score[i, columns].mean()) if len(risk) else 0.0,
+                "total_mitigation_cost": float(self.mitigation_cost[i, columns].sum()),
+                "max_recovery_time_days": int(self.recovery_time_days[i, columns].max()) if len(risk) else 0,
+            })
+        return summaries
+
+    def to_models(self, scenario_index: int, columns: Optional[Sequence[int]] = None) -> List[RiskAssessment]:
+        """Materialize the assessments of one scenario, for `columns` or all nodes."""
+        scenario = self.scenarios[scenario_index]
+        if columns is None:
+            columns = range(len(self.node_ids))
+        return [
+            RiskAssessment(
+                node_id=self.node_ids[column],
+                scenario_id=scenario.id,
+                risk_score=float(self.risk_score[scenario_index, column]),
+                impact_score=float(self.impact_score[scenario_index, column]),
+                mitigation_cost=float(self.mitigation_cost[scenario_index, column]),
+                recovery_time_days=int(self.recovery_time_days[scenario_index, column]),
+            )
+            for column in columns
+        ]
+
+
+def compute_risk_matrix(
+    arrays: NetworkArrays,
+    node_ids: List[str],
+    slots: np.ndarray,
+    scenarios: Sequence[DisruptionScenario],
+    affected: Optional[np.ndarray] = None,
+) -> RiskMatrix:
+    """Assess the nodes at `slots` against all `scenarios` at once.
+
+    Uses the formulas of `SupplyChainSimulator.calculate_risk_assessment`,
+    broadcast over a scenario column and a node row: risk is node risk times
+    severity, impact is the severity-weighted used capacity per node (capped
+    at 1), recovery time grows with out-degree, and mitigation cost scales
+    with capacity and severity.
+    """
+    severity = np.array([scenario.impact_severity for scenario in scenarios], dtype=np.float64)[:, None]
+    duration = np.array([scenario.duration_days for scenario in scenarios], dtype=np.float64)[:, None]
+
+    capacity = arrays.node_column("capacity")[slots]
+    utilization = arrays.node_column("utilization")[slots]
+    node_risk = arrays.node_column("risk_score")[slots]
+    out_indptr, _ = arrays.out_csr()
+    out_degree = np.diff(out_indptr)[slots]
+
+    risk_score = node_risk * severity
+    impact_score = np.minimum(1.0, utilization * capacity * severity / max(1, len(node_ids)))
+    recovery_time_days = (duration * (1 + out_degree / 10)).astype(np.int64)
+    mitigation_cost = capacity * severity * 1000000  # Example cost factor
+    return RiskMatrix(
+        node_ids,
+        scenarios,
+        risk_score,
+        impact_score,
+        mitigation_cost,
+        recovery_time_days,
+        affected,
+    )
@@ -1,161 +1,563 @@
+import copy
+import itertools
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from uuid import UUID
 
 import networkx as nx
 import numpy as np
 from pydantic import BaseModel
 
 from ..data.models import (
+    RECORDS_DIRECTORY,
     DisruptionScenario,
-    ProcessNode,
+    EdgeTable,
+    NodeTable,
     RiskAssessment,
     SupplyChainEdge,
     SupplyChainMetrics,
     SupplyChainNode,
 )
+from .cascade import CascadeResult, propagate_cascade
+from .engine import (
+    METRIC_NAMES,
+    IncrementalMetrics,
+    NetworkArrays,
+    SimulationRun,
+    StepMetrics,
+    _grow,
+    compute_step_metrics,
+    gather_segments,
+    step_from_columns,
+)
+from .instrumentation import instrumentation
+from .metrics_store import MetricsStore
+from .risk import RiskMatrix, compute_risk_matrix
+
+ENGINES = ("python", "vectorized", "incremental")
+
+# Process-wide version clock. Versions never repeat across simulators, so a
+# `since_version` obtained from a replaced simulator yields its full state.
+_VERSION_CLOCK = itertools.count(1)
 
 
 class SimulationState(BaseModel):
     timestamp: datetime
-    nodes: Dict[str, SupplyChainNode]
-    edges: Dict[str, SupplyChainEdge]
-    metrics: Dict[str, List[SupplyChainMetrics]]
+    nodes: NodeTable
+    edges: EdgeTable
+    metrics: MetricsStore
     active_scenarios: List[DisruptionScenario]
 
+    class Config:
+        arbitrary_types_allowed = True
+
 
 class SupplyChainSimulator:
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(
+        self,
+        engine: str = "python",
+        metrics_store: Optional[MetricsStore] = None,
+        cascade: bool = False,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}.")
+        self.engine = engine
+        
+        # In cascade mode every disruption also propagates downstream, and
+        # the inherited shortfalls reach nodes after the edges' lead times.
+        self.cascade = cascade
+        self.cascades: List[Tuple[datetime, CascadeResult]] = []
+        
+        # Numeric node and edge attributes live only in the columnar arrays,
+        # addressed by integer slots; `state.nodes` and `state.edges` hold
+        # the remaining fields and build pydantic models on access. The
+        # topology is the arrays' CSR incidence; `graph` builds a networkx
+        # view on demand.
+        self.arrays = NetworkArrays()
+        self._graph: Optional[nx.DiGraph] = None
+        self._graph_version = -1
+        self._incremental = IncrementalMetrics()
+        
+        # Inverted indexes used to match disruption scenarios
+        self._nodes_by_country: Dict[str, Set[str]] = defaultdict(set)
+        self._nodes_by_process_node: Dict[str, Set[str]] = defaultdict(set)
         self.state = SimulationState(
             timestamp=datetime.utcnow(),
-            nodes={},
-            edges={},
-            metrics={},
+            nodes=NodeTable(self.arrays),
+            edges=EdgeTable(self.arrays),
+            metrics=metrics_store if metrics_store is not None else MetricsStore(),
             active_scenarios=[],
         )
+        
+        # Version at which each node and edge slot and each retained metrics
+        # step last changed, for delta responses
+        self.version = next(_VERSION_CLOCK)
+        self._node_versions = np.zeros(0, dtype=np.int64)
+        self._edge_versions = np.zeros(0, dtype=np.int64)
+        self._step_versions: List[int] = []
+        self._first_step = self.state.metrics.steps_appended
+        self._trimmed_version = 0
+        
+        # After a fork, the scenario indexes and the slot versions are
+        # shared with the other branch until written to
+        self._structure_shared = False
+        self._versions_shared = False
+
+    @classmethod
+    def from_network_store(
+        cls,
+        directory: str,
+        engine: str = "vectorized",
+        mmap_mode: Optional[str] = "c",
+        **kwargs,
+    ) -> "SupplyChainSimulator":
+        """Open a network written by `save_network_store` or `SyntheticNetwork.save`.
+
+        The simulator runs directly on the memory-mapped arrays, so only the
+        pages a computation touches are read. The node records and the
+        scenario indexes are rebuilt from the store in O(nodes). Use the
+        array engines (`simulate_step_arrays`, `simulate_many`, cascades and
+        ensembles) rather than `simulate_step` with the python engine.
+        Raises ValueError if the store holds only arrays.
+        """
+        if engine == "python":
+            raise ValueError("Network stores require an array engine.")
+        if not (Path(directory) / RECORDS_DIRECTORY).is_dir():
+            raise ValueError(
+                f"Network store {directory} has no node records; write it with "
+                "SupplyChainSimulator.save_network_store or SyntheticNetwork.save."
+            )
+        simulator = cls(engine=engine, **kwargs)
+        simulator.arrays = NetworkArrays.load(directory, mmap_mode=mmap_mode)
+        simulator.state.nodes = NodeTable.load(directory, simulator.arrays)
+        simulator.state.edges = EdgeTable.load(directory, simulator.arrays)
+        for node_id, record in simulator.state.nodes.records():
+            simulator._nodes_by_country[record.country].add(node_id)
+            for process_node in record.process_nodes:
+                simulator._nodes_by_process_node[str(process_node.value)].add(node_id)
+        return simulator
+
+    def save_network_store(self, directory: Union[str, Path]) -> Path:
+        """Write the network, without its history, for `from_network_store`."""
+        directory = self.arrays.save(directory)
+        self.state.nodes.save(directory)
+        self.state.edges.save(directory)
+        return directory
+
+    def fork(self) -> "SupplyChainSimulator":
+        """Return an independent simulator branching from the current state.
+
+        The columnar arrays, node records, scenario indexes, change
+        versions and metrics history are all shared copy-on-write, so a
+        fork costs O(nodes + edges) for the ids and each branch then copies
+        only the arrays it writes to.
+        """
+        clone = copy.copy(self)
+        clone.arrays = self.arrays.copy()
+        clone._incremental = self._incremental.copy()
+        clone.cascades = list(self.cascades)
+        clone.state = self.state.copy(update={
+            "nodes": self.state.nodes.copy(clone.arrays),
+            "edges": self.state.edges.copy(clone.arrays),
+            "metrics": self.state.metrics.fork(),
+            "active_scenarios": list(self.state.active_scenarios),
+        })
+        clone._step_versions = list(self._step_versions)
+        clone._graph, clone._graph_version = None, -1
+        
+        self._structure_shared = clone._structure_shared = True
+        self._versions_shared = clone._versions_shared = True
+        return clone
+
+    def _own_structure(self) -> None:
+        """Copy the scenario indexes shared with another branch before changing them."""
+        if not self._structure_shared:
+            return
+
+        def copy_index(index: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+            return defaultdict(set, {key: set(value) for key, value in index.items()})
+
+        self._nodes_by_country = copy_index(self._nodes_by_country)
+        self._nodes_by_process_node = copy_index(self._nodes_by_process_node)
+        self._structure_shared = False
 
     def add_node(self, node: SupplyChainNode) -> None:
         """Add a node to the supply chain network."""
-        self.state.nodes[str(node.id)] = node
-        self.graph.add_node(
-            str(node.id),
-            **node.dict(exclude={"id"}),
+        node_id = str(node.id)
+        self._own_structure()
+        index = self.arrays.add_node(
+            node_id,
+            capacity=node.capacity,
+            utilization=node.utilization,
+            risk_score=node.risk_score,
         )
+        previous = self.state.nodes.add(node_id, node, index)
+        if previous is not None:
+            self._nodes_by_country[previous.country].discard(node_id)
+            for process_node in previous.process_nodes:
+                self._nodes_by_process_node[str(process_node.value)].discard(node_id)
+        self._nodes_by_country[node.location.country].add(node_id)
+        for process_node in node.process_nodes:
+            self._nodes_by_process_node[str(process_node.value)].add(node_id)
+        self._mark_changed(node_slots=[index])
 
     def add_edge(self, edge: SupplyChainEdge) -> None:
         """Add an edge to the supply chain network."""
-        self.state.edges[str(edge.id)] = edge
-        self.graph.add_edge(
+        index = self.arrays.add_edge(
+            str(edge.id),
             str(edge.source_id),
             str(edge.target_id),
-            id=str(edge.id),
-            **edge.dict(exclude={"id", "source_id", "target_id"}),
+            capacity=edge.capacity,
+            lead_time_days=edge.lead_time_days,
+            reliability_score=edge.reliability_score,
+            cost_per_unit=edge.cost_per_unit,
         )
+        self.state.edges.add(edge, index)
+        self._mark_changed(edge_slots=[index])
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        """Structure-only networkx view of the network, rebuilt after topology changes.
+
+        Edges carry only their `id`; read attributes from `state` or `arrays`.
+        """
+        if self._graph_version != self.arrays.topology_version:
+            active = np.flatnonzero(self.arrays.edge_active)
+            node_ids = self.arrays.node_ids
+            edge_ids = self.arrays.edge_ids
+            graph = nx.DiGraph()
+            graph.add_nodes_from(node_ids)
+            graph.add_edges_from(
+                (node_ids[source], node_ids[target], {"id": edge_ids[edge]})
+                for edge, source, target in zip(
+                    active.tolist(),
+                    self.arrays.edge_source[active].tolist(),
+                    self.arrays.edge_target[active].tolist(),
+                )
+            )
+            self._graph = graph
+            self._graph_version = self.arrays.topology_version
+        return self._graph
+
+    def update_node(self, node_id: str, **values: float) -> SupplyChainNode:
+        """Change numeric attributes of a node and mark it for recomputation."""
+        if node_id not in self.state.nodes:
+            raise KeyError(node_id)
+        index = self.arrays.node_index[node_id]
+        self.arrays.set_node(index, **values)
+        self._mark_changed(node_slots=[index])
+        return self.state.nodes[node_id]
+
+    def update_edge(self, edge_id: str, **values: float) -> SupplyChainEdge:
+        """Change numeric attributes of an edge and mark its endpoints for recomputation."""
+        index = self.state.edges.slot(edge_id)
+        if index is None:
+            raise KeyError(edge_id)
+        self.arrays.set_edge(index, **values)
+        self._mark_changed(edge_slots=[index])
+        return self.state.edges[edge_id]
+
+    def _mark_changed(self, node_slots: Iterable[int] = (), edge_slots: Iterable[int] = ()) -> None:
+        """Advance the state version and stamp the given slots with it."""
+        self.version = next(_VERSION_CLOCK)
+        if self._versions_shared:
+            self._node_versions = self._node_versions.copy()
+            self._edge_versions = self._edge_versions.copy()
+            self._versions_shared = False
+        self._node_versions = _grow(self._node_versions, self.arrays.num_nodes)
+        self._edge_versions = _grow(self._edge_versions, self.arrays.num_edges)
+        self._node_versions[np.fromiter(node_slots, dtype=np.int64)] = self.version
+        self._edge_versions[np.fromiter(edge_slots, dtype=np.int64)] = self.version
+
+    def _record_step(self, timestamp: datetime, node_ids: List[str], values: np.ndarray) -> None:
+        """Append one step to the metrics history under a new version."""
+        with instrumentation.phase("history"):
+            self.state.metrics.append(timestamp, node_ids, values)
+        self.version = next(_VERSION_CLOCK)
+        self._step_versions.append(self.version)
+        
+        # Only steps still held at full resolution can be served as deltas
+        excess = len(self._step_versions) - self.state.metrics.retention_steps
+        if excess > 0:
+            self._trimmed_version = self._step_versions[excess - 1]
+            del self._step_versions[:excess]
+            self._first_step += excess
+
+    def changes_since(self, version: int) -> Optional[Tuple[List[str], List[str], int]]:
+        """Return `(node_ids, edge_ids, since_step)` for changes after `version`.
+
+        `since_step` is the first metrics step recorded after `version`, for
+        use with `MetricsStore.to_model_dict`. Returns None if no delta can
+        be built because `version` is unknown or the steps recorded since
+        then are no longer held at full resolution.
+        """
+        if version > self.version or version < self._trimmed_version:
+            return None
+        since_step = self._first_step + bisect_right(self._step_versions, version)
+        if since_step < self.state.metrics.oldest_step:
+            return None
+        
+        node_slots = np.flatnonzero(self._node_versions[: self.arrays.num_nodes] > version)
+        edge_slots = np.flatnonzero(self._edge_versions[: self.arrays.num_edges] > version)
+        node_ids = [self.arrays.node_ids[index] for index in node_slots]
+        edge_ids = [self.arrays.edge_ids[index] for index in edge_slots]
+        return node_ids, edge_ids, since_step
+
+    @staticmethod
+    def _in_insertion_order(ids: Iterable[str], index: Dict[str, int]) -> List[str]:
+        return sorted(ids, key=index.__getitem__)
+
+    def match_scenario_nodes(self, scenario: DisruptionScenario) -> List[str]:
+        """Return the ids of nodes directly hit by a scenario, in insertion order."""
+        if "Global" in scenario.affected_regions or "All" in scenario.affected_process_nodes:
+            return list(self.state.nodes)
+        
+        # Union of nodes in affected regions and nodes on affected process nodes
+        matched: Set[str] = set()
+        for country in scenario.affected_regions:
+            matched.update(self._nodes_by_country.get(country, ()))
+        for process_node in scenario.affected_process_nodes:
+            matched.update(self._nodes_by_process_node.get(process_node, ()))
+        return self._in_insertion_order(matched, self.arrays.node_index)
 
     def apply_disruption(self, scenario: DisruptionScenario) -> None:
         """Apply a disruption scenario to the supply chain."""
         self.state.active_scenarios.append(scenario)
+        arrays = self.arrays
+        node_index = arrays.node_index
+        utilization = arrays.node_column("utilization")
+        node_risk = arrays.node_column("risk_score")
+        affected_nodes = {str(node_id) for node_id in scenario.affected_nodes}
+        direct_impact = np.zeros(arrays.num_nodes)
+        node_slots: List[int] = []
+        edge_slots: List[int] = []
         
-        # Apply impact to nodes based on region and process node
-        for node_id, node in self.state.nodes.items():
-            should_affect = False
-            
-            # Check if node is in affected region
-            if node.location.country in scenario.affected_regions or "Global" in scenario.affected_regions:
-                should_affect = True
-            
-            # Check if node's process nodes are affected
-            if any(process_node in scenario.affected_process_nodes for process_node in node.process_nodes) or "All" in scenario.affected_process_nodes:
-                should_affect = True
-            
-            if should_affect:
+        with instrumentation.phase("disruption_matching"):
+            matched_nodes = self.match_scenario_nodes(scenario)
+        
+        with instrumentation.phase("disruption_impact"):
+            # Apply impact to nodes based on region and process node
+            for node_id in matched_nodes:
+                index = node_index[node_id]
+                risk_score = float(node_risk[index])
+                
                 # Calculate impact based on node's vulnerability and scenario severity
-                impact_factor = scenario.impact_severity * (1 + node.risk_score) / 2
+                impact_factor = scenario.impact_severity * (1 + risk_score) / 2
                 
                 # Apply impact to node metrics
-                node.utilization *= (1 - impact_factor)
-                node.risk_score = min(1.0, node.risk_score + impact_factor)
-                self.state.nodes[node_id] = node
+                arrays.set_node(
+                    index,
+                    utilization=float(utilization[index]) * (1 - impact_factor),
+                    risk_score=min(1.0, risk_score + impact_factor),
+                )
+                direct_impact[index] = impact_factor
+                node_slots.append(index)
                 
                 # Add node to affected nodes list if not already present
-                if node.id not in scenario.affected_nodes:
-                    scenario.affected_nodes.append(node.id)
+                if node_id not in affected_nodes:
+                    affected_nodes.add(node_id)
+                    scenario.affected_nodes.append(UUID(node_id))
 
-        # Apply impact to edges connected to affected nodes
-        for edge_id, edge in self.state.edges.items():
-            if (edge.source_id in scenario.affected_nodes or 
-                edge.target_id in scenario.affected_nodes):
+            # Apply impact to active edges connected to affected nodes
+            rows = np.array(
+                [node_index[node_id] for node_id in affected_nodes if node_id in node_index],
+                dtype=np.int64,
+            )
+            incident_edges = np.unique(np.concatenate([
+                gather_segments(*arrays.in_csr(), rows),
+                gather_segments(*arrays.out_csr(), rows),
+            ]))
+            
+            edge_ids = arrays.edge_ids
+            capacity = arrays.edge_column("capacity")
+            reliability = arrays.edge_column("reliability_score")
+            affected_edges = {str(edge_id) for edge_id in scenario.affected_edges}
+            for index in incident_edges.tolist():
+                reliability_score = float(reliability[index])
+                
                 # Calculate impact based on edge's vulnerability and scenario severity
-                impact_factor = scenario.impact_severity * (1 + edge.reliability_score) / 2
+                impact_factor = scenario.impact_severity * (1 + reliability_score) / 2
                 
                 # Apply impact to edge metrics
-                edge.reliability_score *= (1 - impact_factor)
-                edge.capacity *= (1 - impact_factor)
-                self.state.edges[edge_id] = edge
+                arrays.set_edge(
+                    index,
+                    reliability_score=reliability_score * (1 - impact_factor),
+                    capacity=float(capacity[index]) * (1 - impact_factor),
+                )
+                edge_slots.append(index)
                 
                 # Add edge to affected edges list if not already present
-                if edge.id not in scenario.affected_edges:
-                    scenario.affected_edges.append(edge.id)
+                edge_id = edge_ids[index]
+                if edge_id not in affected_edges:
+                    affected_edges.add(edge_id)
+                    scenario.affected_edges.append(UUID(edge_id))
+        
+        instrumentation.increment("nodes_touched_total", len(node_slots), operation="disruption")
+        instrumentation.increment("edges_touched_total", len(edge_slots), operation="disruption")
+        
+        self._mark_changed(node_slots, edge_slots)
+        if self.cascade:
+            with instrumentation.phase("cascade"):
+                self.cascades.append(
+                    (self.state.timestamp, propagate_cascade(self.arrays, direct_impact))
+                )
+
+    def _throughput_factor(self) -> Optional[np.ndarray]:
+        """Return per-node throughput multipliers from cascades that have arrived."""
+        if not self.cascades:
+            return None
+        
+        factor = np.ones(self.arrays.num_nodes)
+        for onset, result in self.cascades:
+            elapsed_days = (self.state.timestamp - onset).total_seconds() / 86400
+            factor[: len(result.inherited)] *= 1 - result.inherited_at(elapsed_days)
+        return factor
 
     def simulate_step(self, duration_days: int = 1) -> List[SupplyChainMetrics]:
         """Simulate one step of the supply chain."""
+        if self.engine != "python":
+            step = self.simulate_step_arrays(duration_days)
+            with instrumentation.phase("materialization"):
+                return step.to_models()
+
         new_metrics = []
+        throughput_factor = self._throughput_factor()
         
-        for node_id, node in self.state.nodes.items():
-            # Calculate throughput based on capacity and utilization
-            throughput = node.capacity * node.utilization
-            
-            # Calculate inventory changes
-            incoming_edges = self.graph.in_edges(node_id, data=True)
-            outgoing_edges = self.graph.out_edges(node_id, data=True)
-            
-            incoming_flow = sum(
-                self.state.edges[edge_data['id']].capacity
-                for _, _, edge_data in incoming_edges
-            )
-            outgoing_flow = sum(
-                self.state.edges[edge_data['id']].capacity
-                for _, _, edge_data in outgoing_edges
-            )
-            
-            # Calculate lead time as average of incoming edge lead times
-            lead_time = np.mean([
-                self.state.edges[edge_data['id']].lead_time_days
-                for _, _, edge_data in incoming_edges
-            ]) if incoming_edges else 0
-            
-            # Calculate quality score based on node reliability and incoming material quality
-            quality_score = node.risk_score * np.mean([
-                self.state.edges[edge_data['id']].reliability_score
-                for _, _, edge_data in incoming_edges
-            ]) if incoming_edges else node.risk_score
-            
-            # Create metrics for this node
-            metrics = SupplyChainMetrics(
-                timestamp=self.state.timestamp,
-                node_id=node.id,
-                throughput=throughput,
-                inventory_level=incoming_flow - outgoing_flow,
-                lead_time=lead_time,
-                cost_per_unit=sum(
-                    self.state.edges[edge_data['id']].cost_per_unit
-                    for _, _, edge_data in incoming_edges
-                ) / len(incoming_edges) if incoming_edges else 0,
-                quality_score=quality_score,
-            )
-            
-            new_metrics.append(metrics)
-            
-            # Update node metrics history
-            if node_id not in self.state.metrics:
-                self.state.metrics[node_id] = []
-            self.state.metrics[node_id].append(metrics)
+        # Incident edges come from the CSR incidence as slots into the edge
+        # attribute columns, so the loop never goes through the edge models
+        in_indptr, in_order = (array.tolist() for array in self.arrays.in_csr())
+        out_indptr, out_order = (array.tolist() for array in self.arrays.out_csr())
+        capacity, lead_time_days, reliability_score, cost_per_unit = (
+            self.arrays.edge_column(name).tolist() for name in NetworkArrays.EDGE_FIELDS
+        )
+        node_capacity, node_utilization, node_risk = (
+            self.arrays.node_column(name).tolist() for name in NetworkArrays.NODE_FIELDS
+        )
+        
+        # The python engine builds the metric models as it aggregates
+        with instrumentation.phase("aggregation"):
+            for node_id, record in self.state.nodes.records():
+                index = record.slot
+                
+                # Calculate throughput based on capacity and utilization
+                throughput = node_capacity[index] * node_utilization[index]
+                if throughput_factor is not None:
+                    throughput *= throughput_factor[index]
+                
+                # Calculate inventory changes
+                incoming_edges = in_order[in_indptr[index] : in_indptr[index + 1]]
+                outgoing_edges = out_order[out_indptr[index] : out_indptr[index + 1]]
+                
+                incoming_flow = sum(capacity[edge] for edge in incoming_edges)
+                outgoing_flow = sum(capacity[edge] for edge in outgoing_edges)
+                
+                # Calculate lead time as average of incoming edge lead times
+                lead_time = np.mean([
+                    lead_time_days[edge] for edge in incoming_edges
+                ]) if incoming_edges else 0
+                
+                # Calculate quality score based on node reliability and incoming material quality
+                quality_score = node_risk[index] * np.mean([
+                    reliability_score[edge] for edge in incoming_edges
+                ]) if incoming_edges else node_risk[index]
+                
+                # Create metrics for this node
+                metrics = SupplyChainMetrics(
+                    timestamp=self.state.timestamp,
+                    node_id=UUID(node_id),
+                    throughput=throughput,
+                    inventory_level=incoming_flow - outgoing_flow,
+                    lead_time=lead_time,
+                    cost_per_unit=sum(
+                        cost_per_unit[edge] for edge in incoming_edges
+                    ) / len(incoming_edges) if incoming_edges else 0,
+                    quality_score=quality_score,
+                )
+                
+                new_metrics.append(metrics)
+        instrumentation.increment("nodes_touched_total", len(new_metrics), operation="step")
+        
+        # Update node metrics history
+        self._record_step(
+            self.state.timestamp,
+            list(self.state.nodes),
+            np.array(
+                [[getattr(m, name) for name in METRIC_NAMES] for m in new_metrics]
+            ).reshape(len(new_metrics), len(METRIC_NAMES)),
+        )
         
         # Update simulation timestamp
         self.state.timestamp += timedelta(days=duration_days)
         
         return new_metrics
 
+    def _compute_step(self) -> StepMetrics:
+        """Compute the current step's metrics with the array engines."""
+        throughput_factor = self._throughput_factor()
+        if self.engine != "incremental":
+            with instrumentation.phase("aggregation"):
+                step = compute_step_metrics(self.arrays, self.state.timestamp, throughput_factor)
+            instrumentation.increment("nodes_touched_total", len(step), operation="step")
+            return step
+        
+        # Only nodes touched since the previous step are recomputed
+        with instrumentation.phase("aggregation"):
+            columns = self._incremental.refresh(self.arrays, throughput_factor)
+        instrumentation.increment(
+            "nodes_touched_total", self._incremental.last_refreshed, operation="step"
+        )
+        return step_from_columns(
+            self.arrays,
+            self.state.timestamp,
+            {name: values.copy() for name, values in columns.items()},
+        )
+
+    def simulate_step_arrays(self, duration_days: int = 1) -> StepMetrics:
+        """Simulate one step with the array engine and return columnar metrics.
+
+        Unlike `simulate_step`, no pydantic models are built; the metrics are
+        recorded into the columnar history in `state.metrics` directly.
+        """
+        step = self._compute_step()
+        self._record_step(step.timestamp, step.node_ids, step.to_array())
+        self.state.timestamp += timedelta(days=duration_days)
+        return step
+
+    def simulate_many(
+        self,
+        n_steps: int,
+        step_days: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> SimulationRun:
+        """Advance the simulation `n_steps` times in one call.
+
+        Per-step metrics are written into a preallocated
+        `(steps, nodes, metrics)` array and recorded into `state.metrics`.
+        `progress`, if given, is called with `(completed, n_steps)` after
+        every step.
+        """
+        if n_steps < 1:
+            raise ValueError("n_steps must be at least 1.")
+
+        present = np.flatnonzero(self.arrays.node_present)
+        node_ids = [self.arrays.node_ids[row] for row in present]
+        values = np.empty((n_steps, len(node_ids), len(METRIC_NAMES)))
+        timestamps = []
+
+        for step in range(n_steps):
+            metrics = self._compute_step()
+            values[step] = metrics.to_array()
+            timestamps.append(self.state.timestamp)
+            self._record_step(metrics.timestamp, node_ids, values[step])
+            self.state.timestamp += timedelta(days=step_days)
+            if progress is not None:
+                progress(step + 1, n_steps)
+
+        return SimulationRun(timestamps, node_ids, values)
+
     def calculate_risk_assessment(
         self, node_id: str, scenario: DisruptionScenario
     ) -> RiskAssessment:
@@ -172,7 +574,8 @@ class SupplyChainSimulator:
         
         # Estimate recovery time based on scenario duration and node complexity
         recovery_time_days = int(
-            scenario.duration_days * (1 + len(self.graph.edges(node_id)) / 10)
+            scenario.duration_days
+            * (1 + len(self.arrays.out_edges(self.arrays.node_index[node_id])) / 10)
         )
         
         # Estimate mitigation cost based on node capacity and scenario impact
@@ -187,11 +590,36 @@ class SupplyChainSimulator:
             recovery_time_days=recovery_time_days,
         )
 
+    def calculate_risk_matrix(
+        self, scenarios: List[DisruptionScenario], affected_only: bool = False
+    ) -> RiskMatrix:
+        """Assess every node against every scenario in one vectorized pass.
+        
+        Equivalent to `calculate_risk_assessment` for each node and scenario,
+        without building the models. With `affected_only`, the matrix also
+        masks the nodes each scenario hits directly.
+        """
+        node_ids, slots = [], []
+        for node_id, record in self.state.nodes.records():
+            node_ids.append(node_id)
+            slots.append(record.slot)
+        slots = np.array(slots, dtype=np.int64)
+        
+        affected = None
+        if affected_only:
+            column = {node_id: i for i, node_id in enumerate(node_ids)}
+            affected = np.zeros((len(scenarios), len(node_ids)), dtype=bool)
+            for row, scenario in enumerate(scenarios):
+                affected[row, [column[node_id] for node_id in self.match_scenario_nodes(scenario)]] = True
+        return compute_risk_matrix(self.arrays, node_ids, slots, scenarios, affected)
+
     def get_supply_chain_health(self) -> Dict[str, float]:
         """Calculate overall supply chain health metrics."""
+        present = self.arrays.node_present
+        active = self.arrays.edge_active
         return {
-            "average_utilization": np.mean([node.utilization for node in self.state.nodes.values()]),
-            "average_risk_score": np.mean([node.risk_score for node in self.state.nodes.values()]),
-            "average_reliability": np.mean([edge.reliability_score for edge in self.state.edges.values()]),
+            "average_utilization": np.mean(self.arrays.node_column("utilization")[present]),
+            "average_risk_score": np.mean(self.arrays.node_column("risk_score")[present]),
+            "average_reliability": np.mean(self.arrays.edge_column("reliability_score")[active]),
             "active_disruptions": len(self.state.active_scenarios),
         } 
\ No newline at end of file
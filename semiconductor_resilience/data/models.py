@@ -1,8 +1,11 @@
+import json
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -112,4 +115,326 @@ class SupplyChainMetrics(BaseModel):
     cost_per_unit: float
     quality_score: float = Field(ge=0.0, le=1.0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow) 
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=datetime.utcnow) 
+
+
+# ----------------------------------------------------------------------
+# Compact internal representation
+#
+# The simulator keeps numeric attributes in columnar arrays addressed by
+# dense integer slots and only the remaining fields of each node and edge
+# here. Pydantic models are built from both when a node or edge is read
+# through `NodeTable` or `EdgeTable`, i.e. at the API edge.
+# ----------------------------------------------------------------------
+
+# Subdirectory of a network store holding the node records and edge
+# timestamps, written by `write_node_records` and `write_edge_records`
+RECORDS_DIRECTORY = "records"
+
+# Record fields stored dictionary-encoded, as codes into lists of values
+_ENCODED_NODE_FIELDS = ("name", "type", "location_id", "country", "region", "city")
+
+
+class NodeRecord:
+    """Non-numeric fields of a node, plus the slot of its numeric columns."""
+
+    __slots__ = (
+        "slot",
+        "name",
+        "type",
+        "location_id",
+        "country",
+        "region",
+        "city",
+        "latitude",
+        "longitude",
+        "location_risk",
+        "process_nodes",
+        "chip_types",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(self, node: SupplyChainNode, slot: int):
+        location = node.location
+        self.slot = slot
+        self.name = node.name
+        self.type = node.type
+        self.location_id = location.id
+        self.country = location.country
+        self.region = location.region
+        self.city = location.city
+        self.latitude = location.latitude
+        self.longitude = location.longitude
+        self.location_risk = location.risk_score
+        self.process_nodes = tuple(node.process_nodes)
+        self.chip_types = tuple(node.chip_types)
+        self.created_at = node.created_at
+        self.updated_at = node.updated_at
+
+    def to_model(self, node_id: str, capacity: float, utilization: float, risk_score: float) -> SupplyChainNode:
+        location = Location.construct(
+            id=self.location_id,
+            country=self.country,
+            region=self.region,
+            city=self.city,
+            latitude=self.latitude,
+            longitude=self.longitude,
+            risk_score=self.location_risk,
+        )
+        return SupplyChainNode.construct(
+            id=UUID(node_id),
+            name=self.name,
+            type=self.type,
+            location=location,
+            capacity=capacity,
+            utilization=utilization,
+            process_nodes=list(self.process_nodes),
+            chip_types=list(self.chip_types),
+            risk_score=risk_score,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+
+class NodeTable(Mapping[str, SupplyChainNode]):
+    """Nodes keyed by id string, stored as `NodeRecord`s plus array columns.
+
+    `arrays` is the simulator's `NetworkArrays`. Reading a node builds a
+    fresh `SupplyChainNode`, so changing the returned model does not change
+    the simulation; use `SupplyChainSimulator.update_node` instead.
+    """
+
+    def __init__(self, arrays: Any):
+        self.arrays = arrays
+        self._records: Dict[str, NodeRecord] = {}
+
+    def add(self, node_id: str, node: SupplyChainNode, slot: int) -> Optional[NodeRecord]:
+        """Insert or replace a node and return the record it replaces."""
+        previous = self._records.get(node_id)
+        self._records[node_id] = NodeRecord(node, slot)
+        return previous
+
+    def record(self, node_id: str) -> NodeRecord:
+        """Return the stored record of a node without building its model."""
+        return self._records[node_id]
+
+    def records(self) -> Iterator[Tuple[str, NodeRecord]]:
+        """Iterate over `(node_id, record)` pairs in insertion order."""
+        return iter(self._records.items())
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Write the records to a network store directory."""
+        records = list(self._records.values())
+        codes: Dict[Any, int] = {}
+
+        def encode(values: List[Any]) -> Tuple[np.ndarray, List[Any]]:
+            codes.clear()
+            encoded = np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.int64)
+            return encoded, list(codes)
+
+        def mask(members: Tuple[Enum, ...], options: List[Enum]) -> int:
+            return sum(1 << options.index(member) for member in members)
+
+        columns: Dict[str, Any] = {
+            name: encode([getattr(record, name) for record in records])
+            for name in _ENCODED_NODE_FIELDS
+        }
+        columns["type"] = (columns["type"][0], [value.value for value in columns["type"][1]])
+        columns["location_id"] = (columns["location_id"][0], [str(value) for value in columns["location_id"][1]])
+        for name in ("slot", "latitude", "longitude", "location_risk", "created_at", "updated_at"):
+            columns[name] = np.array([getattr(record, name) for record in records])
+        columns["process_nodes"] = np.array(
+            [mask(record.process_nodes, list(ProcessNode)) for record in records], dtype=np.int64
+        )
+        columns["chip_types"] = np.array(
+            [mask(record.chip_types, list(ChipType)) for record in records], dtype=np.int64
+        )
+        write_node_records(directory, columns)
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], arrays: Any) -> "NodeTable":
+        """Read the records written to a network store by `write_node_records`."""
+        directory = Path(directory) / RECORDS_DIRECTORY
+        values = json.loads((directory / "nodes.json").read_text())
+
+        def column(name: str) -> list:
+            return np.load(directory / f"node_{name}.npy").tolist()
+
+        values["type"] = [NodeType(value) for value in values["type"]]
+        values["location_id"] = [UUID(value) for value in values["location_id"]]
+        fields: Dict[str, list] = {
+            name: [values[name][code] for code in column(name)] for name in _ENCODED_NODE_FIELDS
+        }
+        for name in ("slot", "latitude", "longitude", "location_risk", "created_at", "updated_at"):
+            fields[name] = column(name)
+
+        # Few distinct bitmasks occur, so each is decoded once
+        for name, options in (("process_nodes", list(ProcessNode)), ("chip_types", list(ChipType))):
+            masks = column(name)
+            members = {
+                bits: tuple(option for bit, option in enumerate(options) if bits >> bit & 1)
+                for bits in set(masks)
+            }
+            fields[name] = [members[bits] for bits in masks]
+
+        table = cls(arrays)
+        node_ids = arrays.node_ids
+        names = NodeRecord.__slots__
+        for row in zip(*(fields[name] for name in names)):
+            record = NodeRecord.__new__(NodeRecord)
+            for name, value in zip(names, row):
+                setattr(record, name, value)
+            table._records[node_ids[record.slot]] = record
+        return table
+
+    def copy(self, arrays: Any) -> "NodeTable":
+        """Return a table over `arrays` sharing this table's immutable records."""
+        table = NodeTable(arrays)
+        table._records = dict(self._records)
+        return table
+
+    def __getitem__(self, node_id: str) -> SupplyChainNode:
+        record = self._records[node_id]
+        return record.to_model(
+            node_id,
+            *(float(self.arrays.node_column(name)[record.slot]) for name in self.arrays.NODE_FIELDS),
+        )
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class EdgeTable(Mapping[str, SupplyChainEdge]):
+    """Edges keyed by id string, stored entirely as columns.
+
+    Ids and endpoints come from the slots in `arrays`, numeric fields from
+    its edge columns, and timestamps from two datetime columns here. An
+    edge slot belongs to the table once its creation time is set and while
+    it is active in `arrays`, i.e. until another edge between the same two
+    nodes replaces it. Reading an edge builds a fresh `SupplyChainEdge`.
+    """
+
+    def __init__(self, arrays: Any, initial_size: int = 64):
+        self.arrays = arrays
+        self.created_at = np.full(initial_size, np.datetime64("NaT"), dtype="datetime64[us]")
+        self.updated_at = self.created_at.copy()
+
+    def add(self, edge: SupplyChainEdge, slot: int) -> None:
+        """Insert or replace the edge held in `slot`."""
+        if slot >= len(self.created_at):
+            size = max(slot + 1, 2 * len(self.created_at))
+            for name in ("created_at", "updated_at"):
+                column = np.full(size, np.datetime64("NaT"), dtype="datetime64[us]")
+                previous = getattr(self, name)
+                column[: len(previous)] = previous
+                setattr(self, name, column)
+        self.created_at[slot] = edge.created_at
+        self.updated_at[slot] = edge.updated_at
+
+    def slot(self, edge_id: str) -> Optional[int]:
+        """Return the slot of a member edge, or None."""
+        slot = self.arrays.edge_index.get(edge_id)
+        if (
+            slot is None
+            or slot >= len(self.created_at)
+            or np.isnat(self.created_at[slot])
+            or not self.arrays.edge_active[slot]
+        ):
+            return None
+        return slot
+
+    def _members(self) -> np.ndarray:
+        """Boolean mask of the member slots among the first slots of `arrays`."""
+        num_edges = min(self.arrays.num_edges, len(self.created_at))
+        return self.arrays.edge_active[:num_edges] & ~np.isnat(self.created_at[:num_edges])
+
+    def slots(self) -> np.ndarray:
+        """Return the slots of all member edges in slot order."""
+        return np.flatnonzero(self._members())
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Write the edge timestamps to a network store directory."""
+        num_edges = self.arrays.num_edges
+        write_edge_records(directory, self.created_at[:num_edges], self.updated_at[:num_edges])
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], arrays: Any) -> "EdgeTable":
+        """Read the edge timestamps written to a network store by `write_edge_records`."""
+        directory = Path(directory) / RECORDS_DIRECTORY
+        table = cls(arrays, 0)
+        table.created_at = np.load(directory / "edge_created_at.npy")
+        table.updated_at = np.load(directory / "edge_updated_at.npy")
+        return table
+
+    def copy(self, arrays: Any) -> "EdgeTable":
+        table = EdgeTable(arrays, 0)
+        table.created_at = self.created_at.copy()
+        table.updated_at = self.updated_at.copy()
+        return table
+
+    def __getitem__(self, edge_id: str) -> SupplyChainEdge:
+        slot = self.slot(edge_id)
+        if slot is None:
+            raise KeyError(edge_id)
+        arrays = self.arrays
+        node_ids = arrays.node_ids
+        return SupplyChainEdge.construct(
+            id=UUID(edge_id),
+            source_id=UUID(node_ids[arrays.edge_source[slot]]),
+            target_id=UUID(node_ids[arrays.edge_target[slot]]),
+            lead_time_days=int(arrays.edge_column("lead_time_days")[slot]),
+            reliability_score=float(arrays.edge_column("reliability_score")[slot]),
+            capacity=float(arrays.edge_column("capacity")[slot]),
+            cost_per_unit=float(arrays.edge_column("cost_per_unit")[slot]),
+            created_at=self.created_at[slot].item(),
+            updated_at=self.updated_at[slot].item(),
+        )
+
+    def __contains__(self, edge_id: object) -> bool:
+        return isinstance(edge_id, str) and self.slot(edge_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        edge_ids = self.arrays.edge_ids
+        return (edge_ids[slot] for slot in self.slots().tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._members()))
+
+
+def write_node_records(directory: Union[str, Path], columns: Dict[str, Any]) -> None:
+    """Write node records to a network store directory for `NodeTable.load`.
+
+    `columns` maps each `NodeRecord` field to one value per node: `slot`,
+    `latitude`, `longitude`, `location_risk`, `created_at` and
+    `updated_at` as arrays; `process_nodes` and `chip_types` as bitmasks
+    over `list(ProcessNode)` and `list(ChipType)`; and the other fields as
+    `(codes, values)` pairs of an integer array and the strings it indexes.
+    """
+    directory = Path(directory) / RECORDS_DIRECTORY
+    directory.mkdir(parents=True, exist_ok=True)
+    values = {}
+    for name in _ENCODED_NODE_FIELDS:
+        codes, values[name] = columns[name]
+        np.save(directory / f"node_{name}.npy", np.asarray(codes, dtype=np.int64))
+    for name in ("slot", "process_nodes", "chip_types"):
+        np.save(directory / f"node_{name}.npy", np.asarray(columns[name], dtype=np.int64))
+    for name in ("latitude", "longitude", "location_risk"):
+        np.save(directory / f"node_{name}.npy", np.asarray(columns[name], dtype=np.float64))
+    for name in ("created_at", "updated_at"):
+        np.save(directory / f"node_{name}.npy", np.asarray(columns[name], dtype="datetime64[us]"))
+    (directory / "nodes.json").write_text(json.dumps(values))
+
+
+def write_edge_records(directory: Union[str, Path], created_at: np.ndarray, updated_at: np.ndarray) -> None:
+    """Write edge timestamps by slot to a network store directory for `EdgeTable.load`."""
+    directory = Path(directory) / RECORDS_DIRECTORY
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "edge_created_at.npy", np.asarray(created_at, dtype="datetime64[us]"))
+    np.save(directory / "edge_updated_at.npy", np.asarray(updated_at, dtype="datetime64[us]"))
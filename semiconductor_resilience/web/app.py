@@ -1,16 +1,20 @@
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List
+from contextlib import suppress
+from typing import Dict, List, Optional
 
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
-import networkx as nx
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import requests
 
+from .client import ApiClient, StateCache
+from .layout import layout_cache
+from .metrics import METRIC_LABELS, aggregate_metrics, create_metrics_figure, metrics_frame, node_type_map
+
 # Initialize the Dash app
 app = dash.Dash(
     __name__,
@@ -21,72 +25,65 @@ app = dash.Dash(
 # API endpoint
 API_URL = "http://localhost:8000"
 
+# Shared connection pool, and simulation states referenced from dcc.Store
+api = ApiClient(API_URL)
+states = StateCache()
+
+# Above these sizes, traces are drawn with WebGL
+WEBGL_NODES = 1000
+WEBGL_POINTS = 5000
+
+# Networks above this size are drawn as region/type clusters until zoomed in
+MAX_DRAWN_NODES = 2000
+
+# Histories above this many points are fetched downsampled from the API
+MAX_PLOT_POINTS = 20000
+SERIES_POINTS = 1000
+
 # Layout components
-def create_network_graph(nodes: List[Dict], edges: List[Dict]) -> go.Figure:
-    """Create a network graph visualization of the supply chain."""
-    G = nx.DiGraph()
-    
-    # Add nodes
-    for node in nodes:
-        G.add_node(
-            str(node["id"]),
-            name=node["name"],
-            type=node["type"],
-            capacity=node["capacity"],
-            utilization=node["utilization"],
-        )
+def create_network_graph(nodes: List[Dict], edges: List[Dict], layout: str = "force") -> go.Figure:
+    """Create a network graph visualization of the supply chain.
     
-    # Add edges
-    for edge in edges:
-        G.add_edge(
-            str(edge["source_id"]),
-            str(edge["target_id"]),
-            capacity=edge["capacity"],
-            reliability=edge["reliability_score"],
-        )
-    
-    # Create layout
-    pos = nx.spring_layout(G)
+    Positions come from the layout cache, so steps that leave the topology
+    unchanged reuse them and the picture stays put.
+    """
+    pos = layout_cache.positions(nodes, edges, layout)
     
-    # Create edge trace
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+    # Create edge trace; NaN separates the segments
+    segments = [
+        (pos[str(edge["source_id"])], pos[str(edge["target_id"])])
+        for edge in edges
+        if str(edge["source_id"]) in pos and str(edge["target_id"]) in pos
+    ]
+    edge_xy = np.full((len(segments) * 3, 2), np.nan)
+    if segments:
+        coordinates = np.array(segments)
+        edge_xy[0::3] = coordinates[:, 0]
+        edge_xy[1::3] = coordinates[:, 1]
     
-    edge_trace = go.Scatter(
-        x=edge_x,
-        y=edge_y,
+    scatter = go.Scattergl if len(nodes) > WEBGL_NODES else go.Scatter
+    edge_trace = scatter(
+        x=edge_xy[:, 0],
+        y=edge_xy[:, 1],
         line=dict(width=0.5, color="#888"),
         hoverinfo="none",
         mode="lines",
     )
     
     # Create node trace
-    node_x = []
-    node_y = []
-    node_text = []
-    node_color = []
-    
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        node_data = G.nodes[node]
-        node_text.append(
-            f"{node_data['name']}<br>"
-            f"Type: {node_data['type']}<br>"
-            f"Capacity: {node_data['capacity']:,.0f}<br>"
-            f"Utilization: {node_data['utilization']:.1%}"
-        )
-        node_color.append(node_data["utilization"])
+    node_xy = np.array([pos[str(node["id"])] for node in nodes]).reshape(-1, 2)
+    node_text = [
+        f"{node['name']}<br>"
+        f"Type: {node['type']}<br>"
+        f"Capacity: {node['capacity']:,.0f}<br>"
+        f"Utilization: {node['utilization']:.1%}"
+        for node in nodes
+    ]
+    node_color = [node["utilization"] for node in nodes]
     
-    node_trace = go.Scatter(
-        x=node_x,
-        y=node_y,
+    node_trace = scatter(
+        x=node_xy[:, 0],
+        y=node_xy[:, 1],
         mode="markers",
         hoverinfo="text",
         text=node_text,
@@ -97,13 +94,19 @@ def create_network_graph(nodes: List[Dict], edges: List[Dict]) -> go.Figure:
             size=15,
             colorbar=dict(
                 thickness=15,
-                title="Utilization",
+                title=dict(text="Utilization", side="right"),
                 xanchor="left",
-                titleside="right",
             ),
         ),
     )
     
+    if layout == "geographic":
+        xaxis = dict(title="Longitude", showgrid=True, zeroline=False)
+        yaxis = dict(title="Latitude", showgrid=True, zeroline=False, scaleanchor="x")
+    else:
+        xaxis = dict(showgrid=False, zeroline=False, showticklabels=False)
+        yaxis = dict(showgrid=False, zeroline=False, showticklabels=False)
+    
     # Create figure
     fig = go.Figure(
         data=[edge_trace, node_trace],
@@ -112,65 +115,127 @@ def create_network_graph(nodes: List[Dict], edges: List[Dict]) -> go.Figure:
             showlegend=False,
             hovermode="closest",
             margin=dict(b=20, l=5, r=5, t=40),
-            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            xaxis=xaxis,
+            yaxis=yaxis,
+            # Keep zoom and pan across updates of the same network
+            uirevision=layout,
         ),
     )
     
     return fig
 
 
-def create_metrics_plot(metrics: Dict[str, List[Dict]]) -> go.Figure:
-    """Create a time series plot of supply chain metrics."""
-    # Prepare data for plotting
-    data = []
-    for node_id, node_metrics in metrics.items():
-        for metric in node_metrics:
-            data.append({
-                "timestamp": datetime.fromisoformat(metric["timestamp"]),
-                "node_id": node_id,
-                "throughput": metric["throughput"],
-                "inventory": metric["inventory_level"],
-                "lead_time": metric["lead_time"],
-                "cost": metric["cost_per_unit"],
-                "quality": metric["quality_score"],
-            })
+def create_cluster_graph(clusters: List[Dict], edges: List[Dict], layout: str = "force") -> go.Figure:
+    """Create a network graph of node clusters and bundled edges from the API."""
+    if layout == "geographic":
+        pos = {cluster["id"]: (cluster["longitude"], cluster["latitude"]) for cluster in clusters}
+    else:
+        pos = layout_cache.positions(clusters, edges, layout)
     
-    # Create figure with subplots
-    fig = go.Figure()
+    # One trace per tier of bundled edge count, drawn thicker for busier bundles
+    traces = []
+    counts = np.array([edge["edge_count"] for edge in edges])
+    tiers = np.quantile(counts, [1 / 3, 2 / 3]) if len(counts) else []
+    tier_of = np.searchsorted(tiers, counts, side="right")
+    for tier, width in enumerate((0.5, 1.5, 3.0)):
+        xs, ys = [], []
+        for edge, edge_tier in zip(edges, tier_of):
+            if edge_tier == tier:
+                (x0, y0), (x1, y1) = pos[edge["source_id"]], pos[edge["target_id"]]
+                xs.extend([x0, x1, None])
+                ys.extend([y0, y1, None])
+        traces.append(
+            go.Scatter(x=xs, y=ys, line=dict(width=width, color="#888"), hoverinfo="none", mode="lines")
+        )
     
-    # Add throughput trace
-    fig.add_trace(
+    sizes = np.sqrt([cluster["node_count"] for cluster in clusters])
+    traces.append(
         go.Scatter(
-            x=[d["timestamp"] for d in data],
-            y=[d["throughput"] for d in data],
-            name="Throughput",
-            mode="lines",
+            x=[pos[cluster["id"]][0] for cluster in clusters],
+            y=[pos[cluster["id"]][1] for cluster in clusters],
+            mode="markers",
+            hoverinfo="text",
+            text=[
+                f"{cluster['id']}<br>"
+                f"Nodes: {cluster['node_count']:,}<br>"
+                f"Capacity: {cluster['capacity']:,.0f}<br>"
+                f"Utilization: {cluster['utilization']:.1%}"
+                for cluster in clusters
+            ],
+            marker=dict(
+                showscale=True,
+                colorscale="YlOrRd",
+                color=[cluster["utilization"] for cluster in clusters],
+                size=10 + 30 * sizes / max(sizes.max(), 1) if len(sizes) else [],
+                colorbar=dict(
+                    thickness=15,
+                    title=dict(text="Utilization", side="right"),
+                    xanchor="left",
+                ),
+            ),
         )
     )
     
-    # Add inventory trace
-    fig.add_trace(
-        go.Scatter(
-            x=[d["timestamp"] for d in data],
-            y=[d["inventory"] for d in data],
-            name="Inventory",
-            mode="lines",
-        )
+    fig = go.Figure(
+        data=traces,
+        layout=go.Layout(
+            title="Semiconductor Supply Chain Network (clustered by region and type)",
+            showlegend=False,
+            hovermode="closest",
+            margin=dict(b=20, l=5, r=5, t=40),
+            xaxis=dict(showgrid=layout == "geographic", zeroline=False, showticklabels=layout == "geographic"),
+            yaxis=dict(showgrid=layout == "geographic", zeroline=False, showticklabels=layout == "geographic"),
+            uirevision=layout,
+        ),
     )
+    return fig
+
+
+def create_network_view(state: Dict, layout: str = "force", viewport: Optional[Dict] = None) -> go.Figure:
+    """Draw the network, or its clusters if it is too large to draw node by node.
     
-    # Add lead time trace
-    fig.add_trace(
-        go.Scatter(
-            x=[d["timestamp"] for d in data],
-            y=[d["lead_time"] for d in data],
-            name="Lead Time",
-            mode="lines",
+    In the geographic layout, a `viewport` of longitude and latitude ranges
+    that holds few enough nodes is drawn in full.
+    """
+    nodes, edges = state["nodes"], state["edges"]
+    if len(nodes) <= MAX_DRAWN_NODES:
+        return create_network_graph(nodes, edges, layout)
+    
+    if viewport is not None and layout == "geographic":
+        (x0, x1), (y0, y1) = sorted(viewport["x"]), sorted(viewport["y"])
+        visible = [
+            node for node in nodes
+            if x0 <= node["location"]["longitude"] <= x1 and y0 <= node["location"]["latitude"] <= y1
+        ]
+        if len(visible) <= MAX_DRAWN_NODES:
+            ids = {str(node["id"]) for node in visible}
+            inside = [
+                edge for edge in edges
+                if str(edge["source_id"]) in ids and str(edge["target_id"]) in ids
+            ]
+            fig = create_network_graph(visible, inside, layout)
+            fig.update_layout(xaxis_range=[x0, x1], yaxis_range=[y0, y1])
+            return fig
+    
+    clusters = api.get(f"/simulations/{state['sim_id']}/network/clusters")
+    return create_cluster_graph(clusters["clusters"], clusters["edges"], layout)
+
+
+def create_series_plot(series: Dict[str, Dict]) -> go.Figure:
+    """Plot network-wide metric series downsampled by the API."""
+    fig = go.Figure()
+    for label, data in series.items():
+        fig.add_trace(
+            go.Scattergl(
+                x=data["timestamps"],
+                y=data["values"],
+                name=label,
+                mode="lines",
+            )
         )
-    )
     
     fig.update_layout(
-        title="Supply Chain Metrics Over Time",
+        title="Supply Chain Metrics Over Time (network mean, downsampled)",
         xaxis_title="Time",
         yaxis_title="Value",
         hovermode="x unified",
@@ -179,6 +244,37 @@ def create_metrics_plot(metrics: Dict[str, List[Dict]]) -> go.Figure:
     return fig
 
 
+def create_metrics_view(state: Dict, view: str = "overview", metric: str = "throughput") -> go.Figure:
+    """Plot the metrics history; a large overview is downsampled on the API side."""
+    total_points = sum(len(node_metrics) for node_metrics in state["metrics"].values())
+    if view != "overview" or total_points <= MAX_PLOT_POINTS:
+        return create_metrics_plot(state["metrics"], view, metric, state["nodes"])
+    
+    series = {}
+    for label, metric in (("Throughput", "throughput"), ("Inventory", "inventory_level"), ("Lead Time", "lead_time")):
+        series[label] = api.get(
+            f"/simulations/{state['sim_id']}/metrics/series",
+            params={"metric": metric, "aggregate": "mean", "points": SERIES_POINTS},
+        )
+    return create_series_plot(series)
+
+
+def create_metrics_plot(
+    metrics: Dict[str, List[Dict]],
+    view: str = "overview",
+    metric: str = "throughput",
+    nodes: Optional[List[Dict]] = None,
+) -> go.Figure:
+    """Create a time series plot of supply chain metrics.
+    
+    `metrics` may also be a columnar or Arrow metrics table; see
+    `metrics_frame`. `nodes` supplies the node types of the "by_type" view.
+    """
+    frame = metrics_frame(metrics)
+    series = aggregate_metrics(frame, view, metric, node_type_map(nodes or []))
+    return create_metrics_figure(series, view, metric)
+
+
 def create_scenario_card(scenario):
     """Create a card displaying scenario information."""
     return dbc.Card(
@@ -251,6 +347,15 @@ app.layout = dbc.Container(
                                             options=[],
                                             placeholder="Select disruption scenario",
                                         ),
+                                        html.H6("Network Layout", className="mt-3"),
+                                        dcc.RadioItems(
+                                            id="layout-mode",
+                                            options=[
+                                                {"label": " Force-directed", "value": "force"},
+                                                {"label": " Geographic", "value": "geographic"},
+                                            ],
+                                            value="force",
+                                        ),
                                     ]
                                 ),
                             ],
@@ -288,7 +393,39 @@ app.layout = dbc.Container(
                             [
                                 dbc.CardHeader("Supply Chain Metrics"),
                                 dbc.CardBody(
-                                    dcc.Graph(id="metrics-graph"),
+                                    [
+                                        dbc.Row(
+                                            [
+                                                dbc.Col(
+                                                    dcc.Dropdown(
+                                                        id="metrics-view",
+                                                        options=[
+                                                            {"label": "Network overview", "value": "overview"},
+                                                            {"label": "By node type", "value": "by_type"},
+                                                            {"label": "Percentile bands", "value": "percentiles"},
+                                                        ],
+                                                        value="overview",
+                                                        clearable=False,
+                                                    ),
+                                                    width=6,
+                                                ),
+                                                dbc.Col(
+                                                    dcc.Dropdown(
+                                                        id="metrics-metric",
+                                                        options=[
+                                                            {"label": label, "value": name}
+                                                            for name, label in METRIC_LABELS.items()
+                                                        ],
+                                                        value="throughput",
+                                                        clearable=False,
+                                                    ),
+                                                    width=6,
+                                                ),
+                                            ],
+                                            className="mb-2",
+                                        ),
+                                        dcc.Graph(id="metrics-graph"),
+                                    ]
                                 ),
                             ],
                         ),
@@ -303,32 +440,47 @@ app.layout = dbc.Container(
 )
 
 
+def _expired(current_state):
+    """Callback outputs for a handle whose cached state has been dropped."""
+    return (
+        current_state,
+        dash.no_update,
+        html.H5("Simulation state expired: please initialize the simulation again"),
+    )
+
+
 # Callbacks
 @app.callback(
     [
         Output("simulation-state", "data"),
         Output("network-graph", "figure"),
-        Output("metrics-graph", "figure"),
         Output("health-metrics", "children"),
         Output("scenario-dropdown", "options"),
     ],
     [Input("init-sim-button", "n_clicks")],
-    [State("simulation-state", "data")],
+    [
+        State("simulation-state", "data"),
+        State("layout-mode", "value"),
+    ],
     prevent_initial_call=True,
 )
-def initialize_simulation(n_clicks, current_state):
+def initialize_simulation(n_clicks, current_state, layout_mode):
     if n_clicks is None:
         raise dash.exceptions.PreventUpdate
     
     try:
+        # Replace this browser's previous simulation session, if any
+        previous = states.pop(current_state)
+        if previous is not None:
+            with suppress(requests.exceptions.HTTPError):
+                api.delete(f"/simulations/{previous['sim_id']}")
+        
         # Initialize simulation
-        response = requests.post(f"{API_URL}/simulation/initialize")
-        response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = api.post("/simulations")
+        handle = states.put(data)
         
         # Create visualizations
-        network_fig = create_network_graph(data["nodes"], data["edges"])
-        metrics_fig = create_metrics_plot(data["metrics"])
+        network_fig = create_network_view(data, layout_mode)
         
         # Create health metrics display
         health_metrics = [
@@ -339,15 +491,13 @@ def initialize_simulation(n_clicks, current_state):
         ]
         
         # Get available scenarios
-        scenarios_response = requests.get(f"{API_URL}/simulation/scenarios")
-        scenarios_response.raise_for_status()
-        scenarios = scenarios_response.json()
+        scenarios = api.scenarios()
         scenario_options = [
             {"label": s["name"], "value": json.dumps(s)}
             for s in scenarios
         ]
         
-        return data, network_fig, metrics_fig, health_metrics, scenario_options
+        return handle, network_fig, health_metrics, scenario_options
         
     except requests.exceptions.RequestException as e:
         print(f"Error during API call: {str(e)}")
@@ -357,7 +507,6 @@ def initialize_simulation(n_clicks, current_state):
         return (
             {},  # empty simulation state
             empty_fig,  # empty network graph
-            empty_fig,  # empty metrics graph
             html.H5("Error: Could not connect to simulation server"),  # error message
             []  # empty scenario options
         )
@@ -367,26 +516,32 @@ def initialize_simulation(n_clicks, current_state):
     [
         Output("simulation-state", "data", allow_duplicate=True),
         Output("network-graph", "figure", allow_duplicate=True),
-        Output("metrics-graph", "figure", allow_duplicate=True),
         Output("health-metrics", "children", allow_duplicate=True),
     ],
     [Input("step-sim-button", "n_clicks")],
-    [State("simulation-state", "data")],
+    [
+        State("simulation-state", "data"),
+        State("layout-mode", "value"),
+    ],
     prevent_initial_call=True,
 )
-def step_simulation(n_clicks, current_state):
+def step_simulation(n_clicks, current_state, layout_mode):
     if n_clicks is None or not current_state:
         raise dash.exceptions.PreventUpdate
+    if states.get(current_state) is None:
+        return _expired(current_state)
     
     try:
-        # Step simulation
-        response = requests.post(f"{API_URL}/simulation/step")
-        response.raise_for_status()
-        data = response.json()
+        # Step simulation, fetching only what changed
+        response = api.post(
+            f"/simulations/{current_state['sim_id']}/step",
+            params={"since_version": current_state["version"]},
+        )
+        handle = states.merge(current_state, response, lambda: api.state(current_state["sim_id"]))
+        data = states.get(handle)
         
         # Create visualizations
-        network_fig = create_network_graph(data["nodes"], data["edges"])
-        metrics_fig = create_metrics_plot(data["metrics"])
+        network_fig = create_network_view(data, layout_mode)
         
         # Create health metrics display
         health_metrics = [
@@ -396,7 +551,7 @@ def step_simulation(n_clicks, current_state):
             html.H5(f"Active Disruptions: {data['health']['active_disruptions']}"),
         ]
         
-        return data, network_fig, metrics_fig, health_metrics
+        return handle, network_fig, health_metrics
         
     except requests.exceptions.RequestException as e:
         print(f"Error during API call: {str(e)}")
@@ -406,7 +561,6 @@ def step_simulation(n_clicks, current_state):
         return (
             current_state,  # keep current state
             empty_fig,  # empty network graph
-            empty_fig,  # empty metrics graph
             html.H5("Error: Could not connect to simulation server")  # error message
         )
 
@@ -415,33 +569,35 @@ def step_simulation(n_clicks, current_state):
     [
         Output("simulation-state", "data", allow_duplicate=True),
         Output("network-graph", "figure", allow_duplicate=True),
-        Output("metrics-graph", "figure", allow_duplicate=True),
         Output("health-metrics", "children", allow_duplicate=True),
     ],
-    [Input("apply-scenario-button", "n_clicks")],
+    [Input("disrupt-sim-button", "n_clicks")],
     [
         State("simulation-state", "data"),
         State("scenario-dropdown", "value"),
+        State("layout-mode", "value"),
     ],
     prevent_initial_call=True,
 )
-def apply_scenario(n_clicks, current_state, scenario_value):
+def apply_scenario(n_clicks, current_state, scenario_value, layout_mode):
     if n_clicks is None or not current_state or not scenario_value:
         raise dash.exceptions.PreventUpdate
+    if states.get(current_state) is None:
+        return _expired(current_state)
     
     try:
-        # Apply scenario
+        # Apply scenario, fetching only what changed
         scenario = json.loads(scenario_value)
-        response = requests.post(
-            f"{API_URL}/simulation/apply-scenario",
-            json=scenario
+        response = api.post(
+            f"/simulations/{current_state['sim_id']}/disruption",
+            params={"since_version": current_state["version"]},
+            json=scenario,
         )
-        response.raise_for_status()
-        data = response.json()
+        handle = states.merge(current_state, response, lambda: api.state(current_state["sim_id"]))
+        data = states.get(handle)
         
         # Create visualizations
-        network_fig = create_network_graph(data["nodes"], data["edges"])
-        metrics_fig = create_metrics_plot(data["metrics"])
+        network_fig = create_network_view(data, layout_mode)
         
         # Create health metrics display
         health_metrics = [
@@ -451,7 +607,7 @@ def apply_scenario(n_clicks, current_state, scenario_value):
             html.H5(f"Active Disruptions: {data['health']['active_disruptions']}"),
         ]
         
-        return data, network_fig, metrics_fig, health_metrics
+        return handle, network_fig, health_metrics
         
     except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
         print(f"Error during API call: {str(e)}")
@@ -461,11 +617,90 @@ def apply_scenario(n_clicks, current_state, scenario_value):
         return (
             current_state,  # keep current state
             empty_fig,  # empty network graph
-            empty_fig,  # empty metrics graph
             html.H5("Error: Could not apply scenario")  # error message
         )
 
 
+@app.callback(
+    Output("metrics-graph", "figure"),
+    [
+        Input("simulation-state", "data"),
+        Input("metrics-view", "value"),
+        Input("metrics-metric", "value"),
+    ],
+    prevent_initial_call=True,
+)
+def update_metrics(current_state, view, metric):
+    state = states.get(current_state)
+    if state is None:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(title="No simulation data")
+        return empty_fig
+    
+    try:
+        return create_metrics_view(state, view, metric)
+    except requests.exceptions.RequestException as e:
+        print(f"Error during API call: {str(e)}")
+        empty_fig = go.Figure()
+        empty_fig.update_layout(title="Error loading data")
+        return empty_fig
+
+
+@app.callback(
+    Output("network-graph", "figure", allow_duplicate=True),
+    [Input("layout-mode", "value")],
+    [State("simulation-state", "data")],
+    prevent_initial_call=True,
+)
+def change_layout(layout_mode, current_state):
+    state = states.get(current_state)
+    if state is None:
+        raise dash.exceptions.PreventUpdate
+    
+    try:
+        return create_network_view(state, layout_mode)
+    except requests.exceptions.RequestException as e:
+        print(f"Error during API call: {str(e)}")
+        raise dash.exceptions.PreventUpdate
+
+
+@app.callback(
+    Output("network-graph", "figure", allow_duplicate=True),
+    [Input("network-graph", "relayoutData")],
+    [
+        State("simulation-state", "data"),
+        State("layout-mode", "value"),
+    ],
+    prevent_initial_call=True,
+)
+def zoom_network(relayout_data, current_state, layout_mode):
+    """Swap between clusters and nodes as a large geographic network is zoomed."""
+    if not current_state or not relayout_data or layout_mode != "geographic":
+        raise dash.exceptions.PreventUpdate
+    if current_state["num_nodes"] <= MAX_DRAWN_NODES:
+        raise dash.exceptions.PreventUpdate
+    
+    if relayout_data.get("xaxis.autorange"):
+        viewport = None
+    elif "xaxis.range[0]" in relayout_data and "yaxis.range[0]" in relayout_data:
+        viewport = {
+            "x": [relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]],
+            "y": [relayout_data["yaxis.range[0]"], relayout_data["yaxis.range[1]"]],
+        }
+    else:
+        raise dash.exceptions.PreventUpdate
+    
+    state = states.get(current_state)
+    if state is None:
+        raise dash.exceptions.PreventUpdate
+    
+    try:
+        return create_network_view(state, layout_mode, viewport)
+    except requests.exceptions.RequestException as e:
+        print(f"Error during API call: {str(e)}")
+        raise dash.exceptions.PreventUpdate
+
+
 @app.callback(
     Output("scenario-details", "children"),
     [Input("scenario-dropdown", "value")],
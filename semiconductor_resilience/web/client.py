@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds; large networks take a while to build
+DEFAULT_TIMEOUT = (3.05, 120.0)
+
+# Seconds the scenario catalogue is reused before it is fetched again
+SCENARIO_TTL = 300.0
+
+# Metrics steps kept per node in a cached state
+HISTORY_LIMIT = 365
+
+
+class ApiClient:
+    """Pooled HTTP client for the simulation API.
+
+    One `requests.Session` is shared by all callbacks, so connections are
+    kept alive and reused. Every call has a timeout. Connection failures are
+    retried with backoff; gateway errors are retried for GET only, since a
+    repeated POST would advance the simulation twice.
+    """
+
+    def __init__(self, base_url: str, timeout: Any = DEFAULT_TIMEOUT, pool_size: int = 16, retries: int = 3):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "DELETE"}),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._scenarios: Optional[List[Dict]] = None
+        self._scenarios_fetched = 0.0
+        self._lock = threading.Lock()
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request and return the decoded JSON body. Raises on HTTP errors."""
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def get(self, path: str, **kwargs: Any) -> Any:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> Any:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> Any:
+        return self.request("DELETE", path, **kwargs)
+
+    def scenarios(self) -> List[Dict]:
+        """Return the scenario catalogue, fetched at most once per `SCENARIO_TTL`."""
+        with self._lock:
+            if self._scenarios is not None and time.monotonic() - self._scenarios_fetched < SCENARIO_TTL:
+                return self._scenarios
+        scenarios = self.get("/simulation/scenarios")
+        with self._lock:
+            self._scenarios = scenarios
+            self._scenarios_fetched = time.monotonic()
+        return scenarios
+
+    def state(self, sim_id: str) -> Dict:
+        """Fetch the full current state of a session without advancing it."""
+        return self.get(f"/simulations/{sim_id}")
+
+
+class StateCache:
+    """Simulation states held by the Dash server, keyed by handle.
+
+    The browser only stores a small handle, so the network and its history
+    are not sent back and forth with every callback. Responses requested
+    with `since_version` are merged into the cached state. The least
+    recently used states beyond `max_states` are dropped; a callback whose
+    state was dropped asks the user to initialize again.
+    """
+
+    def __init__(self, max_states: int = 64):
+        self.max_states = max_states
+        self._states: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, state: Dict) -> Dict:
+        """Cache a full state and return its handle for `dcc.Store`."""
+        handle = str(uuid4())
+        with self._lock:
+            self._states[handle] = state
+            while len(self._states) > self.max_states:
+                self._states.popitem(last=False)
+        return self.handle(handle, state)
+
+    def get(self, handle: Optional[Dict]) -> Optional[Dict]:
+        if not handle:
+            return None
+        with self._lock:
+            state = self._states.get(handle["handle"])
+            if state is not None:
+                self._states.move_to_end(handle["handle"])
+            return state
+
+    def pop(self, handle: Optional[Dict]) -> Optional[Dict]:
+        if not handle:
+            return None
+        with self._lock:
+            return self._states.pop(handle["handle"], None)
+
+    def merge(self, handle: Dict, response: Dict, refetch: Optional[Callable[[], Dict]] = None) -> Optional[Dict]:
+        """Apply an API response to a cached state and return the new handle.
+
+        A delta replaces the nodes and edges it contains and appends the
+        metrics steps it carries; a full response replaces the state. A
+        delta only holds what changed, so if its base state has been dropped
+        the full state is fetched with `refetch` instead. Without `refetch`,
+        None is returned and nothing is cached.
+        """
+        with self._lock:
+            if response.get("since_version") is None:
+                self._states[handle["handle"]] = response
+                self._states.move_to_end(handle["handle"])
+                return self.handle(handle["handle"], response)
+
+            state = self._states.get(handle["handle"])
+            if state is not None:
+                nodes = {str(node["id"]): node for node in state["nodes"]}
+                nodes.update((str(node["id"]), node) for node in response["nodes"])
+                edges = {str(edge["id"]): edge for edge in state["edges"]}
+                edges.update((str(edge["id"]), edge) for edge in response["edges"])
+                metrics = dict(state["metrics"])
+                for node_id, steps in response["metrics"].items():
+                    metrics[node_id] = (metrics.get(node_id, []) + steps)[-HISTORY_LIMIT:]
+
+                state = dict(
+                    response,
+                    nodes=list(nodes.values()),
+                    edges=list(edges.values()),
+                    metrics=metrics,
+                    since_version=None,
+                )
+                self._states[handle["handle"]] = state
+                self._states.move_to_end(handle["handle"])
+                return self.handle(handle["handle"], state)
+
+        # Fetched outside the lock; the full state is cached as is
+        if refetch is None:
+            return None
+        return self.merge(handle, refetch())
+
+    @staticmethod
+    def handle(handle: str, state: Dict) -> Dict:
+        """The browser-side reference to a cached state."""
+        return {
+            "handle": handle,
+            "sim_id": state["sim_id"],
+            "version": state["version"],
+            "num_nodes": len(state["nodes"]),
+        }
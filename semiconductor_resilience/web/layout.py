@@ -0,0 +1,241 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+# Graphs above this size use the grid-approximated force layout
+LARGE_GRAPH_NODES = 500
+
+# Offset in degrees between nodes sharing a location in the geographic layout
+GEOGRAPHIC_SPREAD = 0.8
+
+Positions = Dict[str, Tuple[float, float]]
+
+
+def topology_key(nodes: List[Dict], edges: List[Dict]) -> str:
+    """Hash the node ids and (source, target) pairs of a network."""
+    digest = hashlib.sha1()
+    for node_id in sorted(str(node["id"]) for node in nodes):
+        digest.update(node_id.encode())
+        digest.update(b"\0")
+    digest.update(b"\1")
+    for pair in sorted(f"{edge['source_id']}>{edge['target_id']}" for edge in edges):
+        digest.update(pair.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def geographic_layout(nodes: List[Dict]) -> Positions:
+    """Place nodes at their longitude and latitude.
+
+    Nodes sharing a location are spread on a small circle around it, so
+    every node of a city stays visible and hoverable.
+    """
+    by_location: Dict[Tuple[float, float], List[str]] = {}
+    for node in nodes:
+        location = node["location"]
+        by_location.setdefault((location["longitude"], location["latitude"]), []).append(str(node["id"]))
+
+    pos = {}
+    for (longitude, latitude), node_ids in by_location.items():
+        if len(node_ids) == 1:
+            pos[node_ids[0]] = (longitude, latitude)
+            continue
+        angles = np.linspace(0.0, 2 * np.pi, len(node_ids), endpoint=False)
+        radius = GEOGRAPHIC_SPREAD * np.sqrt(len(node_ids) / 2)
+        for node_id, angle in zip(sorted(node_ids), angles):
+            pos[node_id] = (
+                float(longitude + radius * np.cos(angle)),
+                float(latitude + radius * np.sin(angle)),
+            )
+    return pos
+
+
+def grid_force_layout(
+    edges: np.ndarray,
+    num_nodes: int,
+    pos: Optional[np.ndarray] = None,
+    iterations: int = 50,
+    cells: int = 16,
+    seed: int = 0,
+) -> np.ndarray:
+    """Fruchterman-Reingold layout with Barnes-Hut style grid repulsion.
+
+    Nodes are binned into a `cells` x `cells` grid each iteration. Nodes
+    are repelled exactly by others in the same cell and by the centre of
+    mass of every other cell, so an iteration is O(N * cells^2) instead of
+    O(N^2). `edges` is an (E, 2) array of node indices; `pos`, if given,
+    warm-starts the layout. Returns an (N, 2) array scaled to [-1, 1].
+    """
+    rng = np.random.default_rng(seed)
+    if pos is None:
+        pos = rng.uniform(-1.0, 1.0, (num_nodes, 2))
+    pos = pos.astype(float, copy=True)
+    if num_nodes < 2:
+        return pos
+
+    k = np.sqrt(4.0 / num_nodes)  # Optimal distance for a [-1, 1] square
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    source, target = edges[:, 0], edges[:, 1]
+    for _ in range(iterations):
+        # Bin nodes into grid cells at coordinate quantiles, which keeps cell
+        # populations balanced as clusters form, and take each cell's centre
+        # of mass
+        quantiles = np.linspace(0.0, 1.0, cells + 1)[1:-1]
+        column = np.searchsorted(np.quantile(pos[:, 0], quantiles), pos[:, 0])
+        row = np.searchsorted(np.quantile(pos[:, 1], quantiles), pos[:, 1])
+        cell = column * cells + row
+        counts = np.bincount(cell, minlength=cells * cells).astype(float)
+        centres = np.zeros((cells * cells, 2))
+        np.add.at(centres, cell, pos)
+        occupied = counts > 0
+        centres[occupied] /= counts[occupied, None]
+
+        # Repulsion from the other cells' centres of mass, weighted by size
+        others = np.flatnonzero(occupied)
+        displacement = np.zeros_like(pos)
+        own = np.searchsorted(others, cell)
+        for chunk in range(0, num_nodes, 4096):
+            rows = slice(chunk, chunk + 4096)
+            dx = pos[rows, 0, None] - centres[None, others, 0]
+            dy = pos[rows, 1, None] - centres[None, others, 1]
+            force = counts[others] * k * k / np.maximum(dx * dx + dy * dy, 1e-6)
+            # A node's own cell is handled exactly below
+            force[np.arange(len(dx)), own[rows]] = 0.0
+            displacement[rows, 0] = (dx * force).sum(axis=1)
+            displacement[rows, 1] = (dy * force).sum(axis=1)
+
+        # Exact repulsion between nodes of the same cell
+        order = np.argsort(cell, kind="stable")
+        starts = np.searchsorted(cell[order], others)
+        for start, count in zip(starts, counts[others].astype(np.int64)):
+            if count < 2:
+                continue
+            members = order[start:start + count]
+            delta = pos[members, None, :] - pos[None, members, :]
+            distance2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+            displacement[members] += (delta * (k * k / distance2)[:, :, None]).sum(axis=1)
+
+        # Attraction along edges
+        delta = pos[source] - pos[target]
+        distance = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-6)
+        pull = delta * (distance / k)[:, None]
+        np.add.at(displacement, source, -pull)
+        np.add.at(displacement, target, pull)
+
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 1e-9)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    pos -= pos.mean(axis=0)
+    return pos / max(np.abs(pos).max(), 1e-9)
+
+
+class LayoutCache:
+    """Network layouts cached by topology.
+
+    A step that only changes node and edge attributes reuses the cached
+    positions. When the topology changes, the layout is warm-started from
+    the most recent one: known nodes keep their positions and new nodes
+    start at the centre of their placed neighbours, so the picture does not
+    jump and fewer iterations are needed.
+    """
+
+    def __init__(self, max_entries: int = 16, iterations: int = 50, warm_iterations: int = 15):
+        self.max_entries = max_entries
+        self.iterations = iterations
+        self.warm_iterations = warm_iterations
+        self._layouts: "OrderedDict[Tuple[str, str], Positions]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def positions(self, nodes: List[Dict], edges: List[Dict], mode: str = "force") -> Positions:
+        """Return node positions for `mode` ("force" or "geographic")."""
+        if mode not in ("force", "geographic"):
+            raise ValueError(f"Unknown layout mode {mode!r}; expected 'force' or 'geographic'.")
+        key = (mode, topology_key(nodes, edges))
+        with self._lock:
+            if key in self._layouts:
+                self._layouts.move_to_end(key)
+                return self._layouts[key]
+            previous = next(
+                (layout for (cached_mode, _), layout in reversed(self._layouts.items()) if cached_mode == mode),
+                None,
+            )
+
+        if mode == "geographic":
+            pos = geographic_layout(nodes)
+        else:
+            pos = self._force_layout(nodes, edges, previous)
+
+        with self._lock:
+            self._layouts[key] = pos
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+        return pos
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layouts.clear()
+
+    def _force_layout(self, nodes: List[Dict], edges: List[Dict], previous: Optional[Positions]) -> Positions:
+        node_ids = [str(node["id"]) for node in nodes]
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        pairs = np.array(
+            [
+                (index[str(edge["source_id"])], index[str(edge["target_id"])])
+                for edge in edges
+                if str(edge["source_id"]) in index and str(edge["target_id"]) in index
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+
+        start = self._warm_start(node_ids, pairs, previous)
+        iterations = self.iterations if start is None else self.warm_iterations
+        if len(node_ids) > LARGE_GRAPH_NODES:
+            pos = grid_force_layout(pairs, len(node_ids), pos=start, iterations=iterations)
+        else:
+            graph = nx.Graph()
+            graph.add_nodes_from(range(len(node_ids)))
+            graph.add_edges_from(pairs.tolist())
+            initial = None if start is None else dict(enumerate(start))
+            layout = nx.spring_layout(graph, pos=initial, iterations=iterations, seed=0)
+            pos = np.array([layout[i] for i in range(len(node_ids))]).reshape(-1, 2)
+        return {node_id: (float(x), float(y)) for node_id, (x, y) in zip(node_ids, pos)}
+
+    @staticmethod
+    def _warm_start(node_ids: List[str], pairs: np.ndarray, previous: Optional[Positions]) -> Optional[np.ndarray]:
+        """Initial positions from a previous layout, or None if it shares no nodes."""
+        if not previous:
+            return None
+        known = np.array([node_id in previous for node_id in node_ids], dtype=bool)
+        if not known.any():
+            return None
+
+        pos = np.zeros((len(node_ids), 2))
+        pos[known] = [previous[node_id] for node_id, is_known in zip(node_ids, known) if is_known]
+        missing = np.flatnonzero(~known)
+        if len(missing):
+            # Centre of the already placed neighbours, plus a little jitter
+            totals = np.zeros((len(node_ids), 2))
+            degrees = np.zeros(len(node_ids))
+            for a, b in ((pairs[:, 0], pairs[:, 1]), (pairs[:, 1], pairs[:, 0])):
+                placed = known[b]
+                np.add.at(totals, a[placed], pos[b[placed]])
+                np.add.at(degrees, a[placed], 1)
+            has_neighbours = degrees[missing] > 0
+            pos[missing] = np.where(
+                has_neighbours[:, None],
+                totals[missing] / np.maximum(degrees[missing], 1)[:, None],
+                pos[known].mean(axis=0),
+            )
+            rng = np.random.default_rng(len(node_ids))
+            pos[missing] += rng.normal(0.0, 0.05, (len(missing), 2))
+        return pos
+
+
+# Shared by the Dash callbacks
+layout_cache = LayoutCache()
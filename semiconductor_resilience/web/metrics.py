@@ -0,0 +1,144 @@
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from ..core.engine import METRIC_NAMES
+
+# Display names of the metrics
+METRIC_LABELS = {
+    "throughput": "Throughput",
+    "inventory_level": "Inventory",
+    "lead_time": "Lead Time",
+    "cost_per_unit": "Cost per Unit",
+    "quality_score": "Quality",
+}
+
+# Views of the metrics history; all but "overview" show one metric
+METRIC_VIEWS = ("overview", "by_type", "percentiles")
+
+PERCENTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Aggregated series longer than this are averaged into equal time buckets
+MAX_SERIES_POINTS = 2000
+
+
+def metrics_frame(metrics: Any, node_ids: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Build a long-format frame with `node_id`, `timestamp` and one column per metric.
+
+    Accepts the `metrics` field of a JSON state (node id -> list of metric
+    dicts), the metrics table of an Arrow state, or the metrics columns of
+    a msgpack state together with its `metric_node_ids` as `node_ids`.
+    """
+    if hasattr(metrics, "to_pandas"):
+        frame = metrics.to_pandas()
+    elif isinstance(metrics, dict) and "node" in metrics:
+        frame = pd.DataFrame({key: value for key, value in metrics.items() if key != "node"})
+        frame.insert(0, "node_id", pd.Categorical.from_codes(np.asarray(metrics["node"]), categories=node_ids))
+    else:
+        # Flatten the per-node lists once and split the columns from it
+        lengths = [len(rows) for rows in metrics.values()]
+        rows = list(chain.from_iterable(metrics.values()))
+        frame = pd.DataFrame({
+            "node_id": pd.Categorical(np.repeat(list(metrics), lengths)),
+            "timestamp": pd.to_datetime([row["timestamp"] for row in rows], format="ISO8601"),
+            **{name: np.fromiter((row[name] for row in rows), dtype=np.float64, count=len(rows)) for name in METRIC_NAMES},
+        })
+    return frame
+
+
+def _bucket(series: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """Average a time-indexed frame into at most `max_points` equal time buckets."""
+    if len(series) <= max_points:
+        return series
+    seconds = (series.index - series.index[0]).total_seconds().to_numpy()
+    bucket = np.minimum((seconds / max(seconds[-1], 1e-9) * max_points).astype(np.int64), max_points - 1)
+    grouped = series.groupby(bucket)
+    result = grouped.mean()
+    result.index = pd.DatetimeIndex(series.index.to_series().groupby(bucket).min())
+    return result
+
+
+def aggregate_metrics(
+    frame: pd.DataFrame,
+    view: str = "overview",
+    metric: str = "throughput",
+    node_types: Optional[Dict[str, str]] = None,
+    max_points: int = MAX_SERIES_POINTS,
+) -> pd.DataFrame:
+    """Aggregate a metrics frame into one column per line, indexed by timestamp.
+
+    "overview" gives the network mean of throughput, inventory and lead
+    time; "by_type" the mean of `metric` per node type (from `node_types`,
+    node id -> type); "percentiles" the `PERCENTILES` of `metric` across
+    nodes. Each is a single groupby over the frame.
+    """
+    if view not in METRIC_VIEWS:
+        raise ValueError(f"Unknown metrics view {view!r}; expected one of {METRIC_VIEWS}.")
+    if metric not in METRIC_NAMES:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {METRIC_NAMES}.")
+
+    if view == "overview":
+        columns = ["throughput", "inventory_level", "lead_time"]
+        series = frame.groupby("timestamp")[columns].mean()
+        series.columns = [METRIC_LABELS[name] for name in columns]
+    elif view == "by_type":
+        types = frame["node_id"].astype(str).map(node_types or {}).fillna("unknown").rename("type")
+        series = frame.groupby(["timestamp", types])[metric].mean().unstack()
+    else:
+        series = frame.groupby("timestamp")[metric].quantile(list(PERCENTILES)).unstack()
+        series.columns = [f"p{round(q * 100)}" for q in series.columns]
+    return _bucket(series.sort_index(), max_points)
+
+
+def create_metrics_figure(
+    series: pd.DataFrame,
+    view: str = "overview",
+    metric: str = "throughput",
+) -> go.Figure:
+    """Plot the output of `aggregate_metrics`."""
+    scatter = go.Scattergl if len(series) * max(1, len(series.columns)) > 5000 else go.Scatter
+    fig = go.Figure()
+    x = series.index
+
+    if view == "percentiles" and len(series.columns):
+        # Outer and inner bands, then the median
+        for low, high, opacity in (("p5", "p95", 0.15), ("p25", "p75", 0.3)):
+            fig.add_trace(scatter(x=x, y=series[high], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+            fig.add_trace(
+                scatter(
+                    x=x,
+                    y=series[low],
+                    mode="lines",
+                    line=dict(width=0),
+                    fill="tonexty",
+                    fillcolor=f"rgba(31, 119, 180, {opacity})",
+                    name=f"{low}-{high}",
+                )
+            )
+        fig.add_trace(scatter(x=x, y=series["p50"], mode="lines", name="Median", line=dict(color="rgb(31, 119, 180)")))
+    else:
+        for column in series.columns:
+            fig.add_trace(scatter(x=x, y=series[column], name=str(column), mode="lines"))
+
+    if view == "overview":
+        title = "Supply Chain Metrics Over Time (network mean)"
+    elif view == "by_type":
+        title = f"{METRIC_LABELS[metric]} by Node Type (mean)"
+    else:
+        title = f"{METRIC_LABELS[metric]} across Nodes (percentile bands)"
+    fig.update_layout(
+        title=title,
+        xaxis_title="Time",
+        yaxis_title="Value",
+        hovermode="x unified",
+    )
+
+    return fig
+
+
+def node_type_map(nodes: List[Dict]) -> Dict[str, str]:
+    """Map node ids to node types."""
+    return {str(node["id"]): node["type"] for node in nodes}
@@ -0,0 +1,40 @@
+import copy
+
+import pytest
+from fastapi.testclient import TestClient
+
+from semiconductor_resilience.api import main
+from semiconductor_resilience.api.sessions import SessionRegistry
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator
+from semiconductor_resilience.core.simulation import SupplyChainSimulator
+
+
+@pytest.fixture(scope="session")
+def network():
+    """A small seeded network as `(generator, nodes, edges)`."""
+    generator = SupplyChainDataGenerator(seed=1)
+    nodes, edges = generator.generate_supply_chain(5, 10, 8)
+    return generator, nodes, edges
+
+
+@pytest.fixture
+def build_simulator(network):
+    """Build a fresh simulator over copies of the seeded network."""
+    _, nodes, edges = network
+
+    def build(engine: str = "python", **kwargs) -> SupplyChainSimulator:
+        simulator = SupplyChainSimulator(engine=engine, **kwargs)
+        for node in copy.deepcopy(nodes):
+            simulator.add_node(node)
+        for edge in copy.deepcopy(edges):
+            simulator.add_edge(edge)
+        return simulator
+
+    return build
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """A test client whose sessions live in a private registry."""
+    monkeypatch.setattr(main, "registry", SessionRegistry(spill_dir=tmp_path / "spill"))
+    return TestClient(main.app)
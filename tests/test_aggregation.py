@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.aggregation import (
+    cluster_network,
+    downsample,
+    lttb,
+    metric_series,
+    minmax_downsample,
+)
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[437] = 10.0
+    index = lttb(x, y, 100)
+
+    assert len(index) == 100
+    assert index[0] == 0 and index[-1] == 999
+    assert (np.diff(index) > 0).all()
+    assert 437 in index
+
+
+def test_lttb_returns_short_series_whole():
+    x = np.arange(10.0)
+    np.testing.assert_array_equal(lttb(x, x, 20), np.arange(10))
+    np.testing.assert_array_equal(lttb(x, x, 2), np.arange(10))
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    rng = np.random.default_rng(0)
+    x = np.arange(10000, dtype=float)
+    y = rng.normal(size=10000)
+    index = minmax_downsample(x, y, 50)
+
+    assert len(index) <= 100
+    assert (np.diff(index) > 0).all()
+    for bucket in np.array_split(np.arange(10000), 50):
+        assert bucket[np.argmax(y[bucket])] in index
+        assert bucket[np.argmin(y[bucket])] in index
+
+
+def test_downsample_methods():
+    x = np.arange(500, dtype=float)
+    y = np.cos(x)
+    assert len(downsample(x, y, 50, "lttb")[0]) == 50
+    assert len(downsample(x, y, 50, "minmax")[0]) <= 50
+    with pytest.raises(ValueError):
+        downsample(x, y, 50, "mean")
+
+
+def test_metric_series_sums_and_means(build_simulator):
+    simulator = build_simulator("vectorized")
+    steps = [simulator.simulate_step_arrays() for _ in range(3)]
+
+    times, totals = metric_series(simulator.state.metrics, "throughput")
+    assert len(times) == 3
+    np.testing.assert_allclose(totals, [step["throughput"].sum() for step in steps])
+
+    node_ids = steps[0].node_ids[:2]
+    _, means = metric_series(simulator.state.metrics, "throughput", "mean", node_ids)
+    np.testing.assert_allclose(means, [step["throughput"][:2].mean() for step in steps])
+    with pytest.raises(ValueError):
+        metric_series(simulator.state.metrics, "profit")
+
+
+def test_cluster_network_totals_match_nodes(build_simulator):
+    simulator = build_simulator("vectorized")
+    nodes = simulator.state.nodes
+    result = cluster_network(nodes, ["type"])
+    clusters = {cluster["type"]: cluster for cluster in result["clusters"]}
+
+    assert sum(cluster["node_count"] for cluster in clusters.values()) == len(nodes)
+    for node_type, cluster in clusters.items():
+        members = [nodes[node_id] for node_id in nodes if nodes[node_id].type.value == node_type]
+        assert cluster["node_count"] == len(members)
+        assert cluster["capacity"] == pytest.approx(sum(node.capacity for node in members))
+
+    # Edges between clusters are bundled, and the rest counted inside them
+    edges = [simulator.state.edges[edge_id] for edge_id in simulator.state.edges]
+    bundled = sum(edge["edge_count"] for edge in result["edges"])
+    internal = sum(cluster["internal_edges"] for cluster in clusters.values())
+    assert bundled + internal == len(edges)
+    assert {(edge["source_id"], edge["target_id"]) for edge in result["edges"]} == {
+        ("fab", "customer"),
+        ("supplier", "fab"),
+    }
+    with pytest.raises(ValueError):
+        cluster_network(nodes, ["city"])
+
+
+def test_api_clusters_and_series(client):
+    sim_id = client.post("/simulations", params={"seed": 3}).json()["sim_id"]
+    initial = client.get(f"/simulations/{sim_id}/metrics/series").json()["total_points"]
+    for _ in range(30):
+        client.post(f"/simulations/{sim_id}/step")
+
+    clusters = client.get(f"/simulations/{sim_id}/network/clusters", params={"group_by": "country"})
+    assert clusters.status_code == 200
+    assert all("country" in cluster for cluster in clusters.json()["clusters"])
+
+    series = client.get(f"/simulations/{sim_id}/metrics/series", params={"points": 10}).json()
+    assert series["total_points"] == initial + 30
+    assert len(series["values"]) == len(series["timestamps"]) == 10
+    assert client.get(f"/simulations/{sim_id}/metrics/series", params={"points": 2}).status_code == 400
+    assert client.get(f"/simulations/{sim_id}/network/clusters", params={"group_by": "city"}).status_code == 400
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.cascade import propagate_cascade
+from semiconductor_resilience.core.engine import NetworkArrays
+
+
+def network(edges, num_nodes):
+    """Build arrays over nodes `0..num_nodes-1` from `(source, target, capacity, lead_time)`."""
+    arrays = NetworkArrays()
+    for node in range(num_nodes):
+        arrays.add_node(str(node), capacity=1.0)
+    for index, (source, target, capacity, lead_time) in enumerate(edges):
+        arrays.add_edge(
+            f"e{index}", str(source), str(target), capacity=capacity, lead_time_days=lead_time
+        )
+    return arrays
+
+
+def direct(num_nodes, **impacts):
+    values = np.zeros(num_nodes)
+    for node, impact in impacts.items():
+        values[int(node[1:])] = impact
+    return values
+
+
+def test_shortfall_travels_down_a_chain():
+    arrays = network([(0, 1, 10.0, 3), (1, 2, 10.0, 4)], 4)
+    result = propagate_cascade(arrays, direct(4, n0=0.5))
+
+    assert np.allclose(result.inherited, [0, 0.5, 0.5, 0])
+    assert np.allclose(result.shortfall, [0.5, 0.5, 0.5, 0])
+    assert list(result.arrival_days[:3]) == [np.inf, 3, 7]
+    assert list(result.tier) == [0, 1, 2, -1]
+    assert list(result.affected()) == [0, 1, 2]
+    assert np.allclose(result.inherited_at(5), [0, 0.5, 0, 0])
+
+
+def test_shortfall_is_weighted_by_supplier_capacity():
+    arrays = network([(0, 2, 1.0, 2), (1, 2, 3.0, 9)], 3)
+    result = propagate_cascade(arrays, direct(3, n0=0.5))
+    assert result.inherited[2] == pytest.approx(0.5 * 1 / 4)
+    # Only the short supplier's lead time counts
+    assert result.arrival_days[2] == 2
+
+
+def test_direct_and_inherited_impacts_combine():
+    arrays = network([(0, 1, 1.0, 1)], 2)
+    result = propagate_cascade(arrays, direct(2, n0=0.5, n1=0.2))
+    assert result.shortfall[1] == pytest.approx(1 - 0.8 * 0.5)
+    assert result.arrival_days[1] == 1
+
+
+def test_earliest_supplier_sets_arrival():
+    arrays = network([(0, 1, 1.0, 10), (0, 2, 1.0, 1), (2, 1, 1.0, 1)], 3)
+    result = propagate_cascade(arrays, direct(3, n0=1.0))
+    assert result.arrival_days[1] == 2
+    assert result.tier[1] == 1
+
+
+def test_cycles_terminate():
+    arrays = network([(0, 1, 1.0, 1), (1, 2, 1.0, 1), (2, 1, 1.0, 1)], 3)
+    result = propagate_cascade(arrays, direct(3, n0=0.5), max_rounds=50)
+    assert result.rounds < 50
+    assert 0 < result.inherited[1] <= 0.5
+    assert list(result.tier) == [0, 1, 2]
+
+
+def test_inactive_edges_do_not_carry_shortfalls():
+    arrays = network([(0, 1, 1.0, 1)], 2)
+    # Re-adding the pair replaces the edge, so only one of them is active
+    arrays.add_edge("replacement", "0", "1", capacity=2.0, lead_time_days=5)
+    result = propagate_cascade(arrays, direct(2, n0=0.5))
+    assert result.inherited[1] == pytest.approx(0.5)
+    assert result.arrival_days[1] == 5
+
+
+def test_simulator_applies_cascades_once_they_arrive(network, build_simulator):
+    generator = network[0]
+    simulator = build_simulator("vectorized", cascade=True)
+    baseline = simulator.simulate_step_arrays()["throughput"]
+
+    simulator.apply_disruption(generator.scenario_from_template(generator.disruption_scenarios[2]))
+    [(_, result)] = simulator.cascades
+    reached = np.flatnonzero((result.inherited > 0) & (result.direct == 0))
+    assert len(reached)
+
+    first = simulator.simulate_step_arrays(duration_days=0)["throughput"]
+    later = int(np.nanmax(result.arrival_days[reached]))
+    simulator.simulate_step_arrays(duration_days=later)
+    arrived = simulator.simulate_step_arrays()["throughput"]
+
+    # Inherited shortfalls only lower throughput after their lead time
+    assert np.allclose(first[reached], baseline[reached])
+    assert (arrived[reached] < baseline[reached]).all()
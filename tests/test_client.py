@@ -0,0 +1,88 @@
+import pytest
+
+from semiconductor_resilience.web.client import HISTORY_LIMIT, ApiClient, StateCache
+
+
+@pytest.fixture
+def api(client):
+    """An `ApiClient` whose requests are served by the test app."""
+    api = ApiClient("http://testserver")
+
+    def request(method, path, **kwargs):
+        response = client.request(method, path, params=kwargs.get("params"), json=kwargs.get("json"))
+        response.raise_for_status()
+        return response.json()
+
+    api.request = request
+    return api
+
+
+def test_merge_applies_deltas(api):
+    full = api.post("/simulations", params={"seed": 3})
+    sim_id = full["sim_id"]
+    states = StateCache()
+    handle = states.put(full)
+
+    for _ in range(3):
+        delta = api.post(f"/simulations/{sim_id}/step", params={"since_version": handle["version"]})
+        assert delta["since_version"] == handle["version"]
+        handle = states.merge(handle, delta)
+
+    merged = states.get(handle)
+    current = api.state(sim_id)
+    assert merged["version"] == current["version"]
+    assert merged["since_version"] is None
+    assert {node["id"] for node in merged["nodes"]} == {node["id"] for node in current["nodes"]}
+    assert merged["metrics"] == current["metrics"]
+
+
+def test_merge_refetches_when_base_is_dropped(api):
+    sim_id = api.post("/simulations", params={"seed": 3})["sim_id"]
+    states = StateCache(max_states=1)
+    handle = states.put(api.state(sim_id))
+    states.put(api.state(sim_id))
+    assert states.get(handle) is None
+
+    delta = api.post(f"/simulations/{sim_id}/step", params={"since_version": handle["version"]})
+    # A delta alone is never cached as the state
+    assert states.merge(handle, delta) is None
+    assert states.get(handle) is None
+
+    handle = states.merge(handle, delta, lambda: api.state(sim_id))
+    state = states.get(handle)
+    assert state["since_version"] is None
+    assert state["version"] == delta["version"]
+    assert len(state["nodes"]) == handle["num_nodes"] == len(api.state(sim_id)["nodes"])
+
+
+def test_merge_caps_metrics_history():
+    node = {"id": "a"}
+    full = {
+        "sim_id": "s", "version": 1, "since_version": None,
+        "nodes": [node], "edges": [], "metrics": {"a": [0] * HISTORY_LIMIT},
+    }
+    delta = dict(full, version=2, since_version=1, nodes=[], metrics={"a": [1, 2]})
+    states = StateCache()
+    handle = states.merge(states.put(full), delta)
+
+    history = states.get(handle)["metrics"]["a"]
+    assert len(history) == HISTORY_LIMIT
+    assert history[-2:] == [1, 2]
+    assert states.get(handle)["nodes"] == [node]
+
+
+def test_state_endpoint_does_not_advance(client):
+    sim_id = client.post("/simulations", params={"seed": 3}).json()["sim_id"]
+    version = client.post(f"/simulations/{sim_id}/step").json()["version"]
+    state = client.get(f"/simulations/{sim_id}").json()
+    assert state["version"] == version
+    assert state["since_version"] is None
+    assert client.get("/simulations/unknown").status_code == 404
+
+
+def test_scenarios_are_cached(api, monkeypatch):
+    calls = []
+    fetch = api.get
+    monkeypatch.setattr(api, "get", lambda path, **kwargs: calls.append(path) or fetch(path, **kwargs))
+    assert api.scenarios() == api.scenarios()
+    assert calls == ["/simulation/scenarios"]
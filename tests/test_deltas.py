@@ -0,0 +1,71 @@
+from semiconductor_resilience.core.metrics_store import MetricsStore
+
+
+def test_changes_since_tracks_touched_slots(build_simulator):
+    simulator = build_simulator("vectorized")
+    simulator.simulate_step()
+    version = simulator.version
+    assert simulator.changes_since(version) == ([], [], simulator.state.metrics.steps_appended)
+
+    node_id = next(iter(simulator.state.nodes))
+    edge_id = next(iter(simulator.state.edges))
+    simulator.update_node(node_id, utilization=0.2)
+    simulator.update_edge(edge_id, capacity=10.0)
+    simulator.simulate_step()
+
+    node_ids, edge_ids, since_step = simulator.changes_since(version)
+    assert node_ids == [node_id]
+    assert edge_ids == [edge_id]
+    assert since_step == simulator.state.metrics.steps_appended - 1
+    assert simulator.version > version
+
+
+def test_changes_since_rejects_unknown_versions(build_simulator):
+    simulator = build_simulator("vectorized", metrics_store=MetricsStore(retention_steps=3))
+    version = simulator.version
+    assert simulator.changes_since(simulator.version + 1) is None
+
+    for _ in range(2):
+        simulator.simulate_step()
+    assert simulator.changes_since(version) is not None
+
+    # Steps recorded since `version` have left the full-resolution ring
+    for _ in range(3):
+        simulator.simulate_step()
+    assert simulator.changes_since(version) is None
+
+
+def test_step_returns_delta(client):
+    full = client.post("/simulation/initialize", params={"seed": 3}).json()
+    assert full["since_version"] is None
+    client.post("/simulation/step")
+    version = client.post("/simulation/step").json()["version"]
+
+    delta = client.post("/simulation/step", params={"since_version": version}).json()
+    assert delta["since_version"] == version
+    assert delta["version"] > version
+    assert delta["nodes"] == [] and delta["edges"] == []
+    assert {len(history) for history in delta["metrics"].values()} == {1}
+    assert len(delta["metrics"]) == len(full["nodes"])
+
+
+def test_disruption_delta_lists_affected_nodes(client):
+    client.post("/simulation/initialize", params={"seed": 3})
+    version = client.post("/simulation/step").json()["version"]
+    scenario = client.get("/simulation/scenarios").json()[0]
+
+    delta = client.post(
+        "/simulation/disruption", params={"since_version": version}, json=scenario
+    ).json()
+    full = client.post("/simulation/step").json()
+    assert delta["since_version"] == version
+    assert 0 < len(delta["nodes"]) <= len(full["nodes"])
+    # Applying a disruption also advances one step
+    assert {len(history) for history in delta["metrics"].values()} == {1}
+
+
+def test_unknown_version_falls_back_to_full_state(client):
+    client.post("/simulation/initialize", params={"seed": 3})
+    state = client.post("/simulation/step", params={"since_version": 10**12}).json()
+    assert state["since_version"] is None
+    assert state["nodes"]
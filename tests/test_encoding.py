@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from semiconductor_resilience.api import encoding
+from semiconductor_resilience.api.encoding import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiate,
+)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("", JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("text/html, application/*;q=0.5", JSON_MEDIA_TYPE),
+        ("application/json;q=0.5, application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        (f"{ARROW_MEDIA_TYPE}, {MSGPACK_MEDIA_TYPE}", ARROW_MEDIA_TYPE),
+        (f"{ARROW_MEDIA_TYPE};q=0.1, {MSGPACK_MEDIA_TYPE};q=0.9", MSGPACK_MEDIA_TYPE),
+        (f"{ARROW_MEDIA_TYPE};q=0, application/json", JSON_MEDIA_TYPE),
+    ],
+)
+def test_negotiate(accept, expected):
+    if expected == ARROW_MEDIA_TYPE and encoding.pa is None:
+        pytest.skip("pyarrow is not installed")
+    if expected == MSGPACK_MEDIA_TYPE and encoding.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    assert negotiate(accept) == expected
+
+
+@pytest.mark.parametrize("accept", ["text/csv", "application/json;q=0", "text/html;q=abc"])
+def test_negotiate_rejects_unsupported(accept):
+    with pytest.raises(HTTPException) as error:
+        negotiate(accept)
+    assert error.value.status_code == 406
+
+
+def test_missing_library_is_not_acceptable(monkeypatch):
+    monkeypatch.setattr(encoding, "msgpack", None)
+    assert MSGPACK_MEDIA_TYPE not in encoding.available_media_types()
+    assert negotiate(f"{MSGPACK_MEDIA_TYPE}, application/json;q=0.1") == JSON_MEDIA_TYPE
+    with pytest.raises(HTTPException) as error:
+        negotiate(MSGPACK_MEDIA_TYPE)
+    assert error.value.status_code == 406
+
+
+def test_unacceptable_request_returns_406(client):
+    client.post("/simulation/initialize", params={"seed": 3})
+    response = client.post("/simulation/step", headers={"Accept": "text/csv"})
+    assert response.status_code == 406
+    assert JSON_MEDIA_TYPE in response.json()["detail"]
+
+
+def test_json_matches_pydantic_encoding(client, monkeypatch):
+    client.post("/simulation/initialize", params={"seed": 3})
+    version = client.post("/simulation/step").json()["version"]
+    fast = client.post("/simulation/step", params={"since_version": version}).json()
+
+    # Without orjson the response model is validated and serialized by FastAPI
+    monkeypatch.setattr(encoding, "orjson", None)
+    slow = client.post("/simulation/step", params={"since_version": version}).json()
+
+    assert fast.keys() == slow.keys()
+    assert fast["metrics"].keys() == slow["metrics"].keys()
+    node_id = next(iter(fast["metrics"]))
+    fast_row, slow_row = fast["metrics"][node_id][0], slow["metrics"][node_id][0]
+    assert fast_row.keys() == slow_row.keys()
+    assert fast_row["id"] == slow_row["id"]
+
+
+@pytest.mark.skipif(encoding.pa is None, reason="pyarrow is not installed")
+def test_arrow_response(client):
+    state = client.post("/simulation/initialize", params={"seed": 3}).json()
+    response = client.post("/simulation/step", headers={"Accept": ARROW_MEDIA_TYPE})
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+
+    tables = encoding.read_arrow_state(response.content)
+    assert tables["nodes"].num_rows == len(state["nodes"])
+    assert tables["edges"].num_rows == len(state["edges"])
+    assert tables["metrics"].num_rows == 2 * len(state["nodes"])
+    assert tables["metrics"].schema.metadata[b"version"]
+
+
+@pytest.mark.skipif(encoding.msgpack is None, reason="msgpack is not installed")
+def test_msgpack_response(client):
+    state = client.post("/simulation/initialize", params={"seed": 3}).json()
+    response = client.post(
+        "/simulation/step",
+        params={"since_version": state["version"]},
+        headers={"Accept": MSGPACK_MEDIA_TYPE},
+    )
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+
+    payload = encoding.read_msgpack_state(response.content)
+    assert payload["since_version"] == state["version"]
+    assert isinstance(payload["metrics"]["throughput"], np.ndarray)
+    assert len(payload["metrics"]["node"]) == len(state["nodes"])
+    assert set(payload["metric_node_ids"]) == {node["id"] for node in state["nodes"]}
+
+
+@pytest.mark.parametrize("delta", [False, True])
+def test_json_nodes_and_edges_match_models(client, monkeypatch, delta):
+    scenario = client.get("/simulation/scenarios").json()[0]
+
+    def disrupt():
+        # Equal seeds build equal networks in independent sessions
+        state = client.post("/simulations", params={"seed": 3}).json()
+        params = {"since_version": state["version"]} if delta else {}
+        return client.post(
+            f"/simulations/{state['sim_id']}/disruption", params=params, json=scenario
+        ).json()
+
+    fast = disrupt()
+    monkeypatch.setattr(encoding, "orjson", None)
+    slow = disrupt()
+
+    def by_id(rows):
+        # Timestamps and location ids are not drawn from the seeded streams
+        for row in rows:
+            row.get("location", {}).pop("id", None)
+        return {
+            row["id"]: {key: value for key, value in row.items() if not key.endswith("_at")}
+            for row in rows
+        }
+
+    assert (fast["since_version"] is not None) == (slow["since_version"] is not None) == delta
+    assert fast["nodes"]
+    assert by_id(fast["nodes"]) == by_id(slow["nodes"])
+    assert by_id(fast["edges"]) == by_id(slow["edges"])
+    assert fast["nodes"][0].keys() == slow["nodes"][0].keys()
+
+
+@pytest.mark.skipif(encoding.pa is None, reason="pyarrow is not installed")
+def test_tables_match_models(build_simulator):
+    simulator = build_simulator("vectorized")
+    simulator.simulate_step()
+    metrics = simulator.state.metrics.to_columns()
+    tables = encoding.state_tables(simulator, None, None, metrics)
+
+    nodes = tables["nodes"]
+    for row, node_id in enumerate(nodes["id"]):
+        node = simulator.state.nodes[node_id]
+        assert nodes["type"][row] == node.type.value
+        assert nodes["country"][row] == node.location.country
+        assert nodes["capacity"][row] == node.capacity
+        assert nodes["risk_score"][row] == node.risk_score
+    edges = tables["edges"]
+    assert edges["id"] == list(simulator.state.edges)
+    for row, edge_id in enumerate(edges["id"]):
+        edge = simulator.state.edges[edge_id]
+        assert (edges["source_id"][row], edges["target_id"][row]) == (str(edge.source_id), str(edge.target_id))
+        assert edges["lead_time_days"][row] == edge.lead_time_days
+        assert edges["cost_per_unit"][row] == edge.cost_per_unit
+
+    edge_id = edges["id"][1]
+    selected = encoding.state_tables(simulator, [nodes["id"][2]], [edge_id], metrics)
+    assert selected["nodes"]["id"] == [nodes["id"][2]]
+    assert selected["edges"]["capacity"].tolist() == [edges["capacity"][1]]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.engine import METRIC_NAMES
+
+ENGINES = ("python", "vectorized", "incremental")
+
+
+def run_scenario(simulator, generator):
+    """Step through a disruption and attribute updates, returning metrics by step."""
+    steps = [simulator.simulate_step()]
+    simulator.apply_disruption(generator.scenario_from_template(generator.disruption_scenarios[2]))
+    steps += [simulator.simulate_step(duration_days=10) for _ in range(3)]
+    simulator.update_edge(next(iter(simulator.state.edges)), capacity=123.0, lead_time_days=3)
+    simulator.update_node(next(iter(simulator.state.nodes)), utilization=0.1)
+    steps += [simulator.simulate_step(duration_days=10) for _ in range(3)]
+    return [{str(metrics.node_id): metrics for metrics in step} for step in steps]
+
+
+@pytest.mark.parametrize("cascade", [False, True])
+def test_engines_agree(network, build_simulator, cascade):
+    generator = network[0]
+    results = {
+        engine: run_scenario(build_simulator(engine, cascade=cascade), generator)
+        for engine in ENGINES
+    }
+    expected = results["python"]
+    for engine in ENGINES[1:]:
+        for step, (want, got) in enumerate(zip(expected, results[engine])):
+            assert want.keys() == got.keys()
+            for node_id in want:
+                for name in METRIC_NAMES:
+                    assert np.isclose(
+                        getattr(got[node_id], name), getattr(want[node_id], name)
+                    ), (engine, step, node_id, name)
+
+
+def test_engines_record_the_same_history(build_simulator):
+    simulators = [build_simulator(engine) for engine in ENGINES]
+    for simulator in simulators:
+        for _ in range(4):
+            simulator.simulate_step()
+
+    reference = simulators[0].state.metrics
+    for simulator in simulators[1:]:
+        store = simulator.state.metrics
+        assert store.node_ids == reference.node_ids
+        for node_id in reference.node_ids:
+            times, values = store.query(node_id)
+            want_times, want_values = reference.query(node_id)
+            # Each simulator starts its clock when it is created
+            assert (np.diff(times) == np.diff(want_times)).all()
+            for name in METRIC_NAMES:
+                assert np.allclose(values[name], want_values[name])
+
@@ -0,0 +1,94 @@
+from uuid import uuid4
+
+import numpy as np
+
+from semiconductor_resilience.core.engine import NetworkArrays
+
+
+def test_fork_branches_independently(build_simulator):
+    simulator = build_simulator("incremental")
+    simulator.simulate_step()
+    fork = simulator.fork()
+    node_id = next(iter(simulator.state.nodes))
+    utilization = simulator.state.nodes[node_id].utilization
+
+    fork.update_node(node_id, utilization=0.01)
+    fork.simulate_step()
+
+    assert simulator.state.nodes[node_id].utilization == utilization
+    assert fork.state.nodes[node_id].utilization == 0.01
+    assert len(fork.state.metrics.query(node_id)[0]) == 2
+    assert len(simulator.state.metrics.query(node_id)[0]) == 1
+
+
+def test_parent_writes_do_not_reach_the_fork(build_simulator):
+    simulator = build_simulator("vectorized")
+    fork = simulator.fork()
+    edge_id = next(iter(simulator.state.edges))
+    capacity = simulator.state.edges[edge_id].capacity
+
+    simulator.update_edge(edge_id, capacity=1.0)
+    simulator.simulate_step()
+
+    assert fork.state.edges[edge_id].capacity == capacity
+    assert simulator.state.edges[edge_id].capacity == 1.0
+    assert fork.version < simulator.version
+    assert len(fork.state.metrics) == 0
+
+
+def test_fork_grows_without_touching_the_parent(build_simulator):
+    simulator = build_simulator("vectorized")
+    fork = simulator.fork()
+    node = simulator.state.nodes[next(iter(simulator.state.nodes))].copy(update={"id": uuid4()})
+
+    fork.add_node(node)
+
+    assert str(node.id) in fork.state.nodes
+    assert str(node.id) not in simulator.state.nodes
+    assert simulator.arrays.num_nodes == fork.arrays.num_nodes - 1
+
+
+def test_fork_of_disrupted_branch(build_simulator, network):
+    generator = network[0]
+    simulator = build_simulator("vectorized")
+    fork = simulator.fork()
+
+    fork.apply_disruption(generator.scenario_catalogue()[0])
+    fork.simulate_step()
+    simulator.simulate_step()
+
+    assert fork.state.active_scenarios and not simulator.state.active_scenarios
+    assert fork.get_supply_chain_health() != simulator.get_supply_chain_health()
+
+
+def test_fork_of_mapped_store_leaves_the_files_untouched(build_simulator, tmp_path):
+    simulator = build_simulator("vectorized")
+    simulator.arrays.save(tmp_path / "store")
+    arrays = NetworkArrays.load(tmp_path / "store", mmap_mode="r")
+    fork = arrays.copy()
+
+    fork.set_node(0, capacity=-1.0)
+    fork.set_edge(0, capacity=-1.0)
+
+    assert fork.node_column("capacity")[0] == -1.0
+    assert arrays.node_column("capacity")[0] == simulator.arrays.node_column("capacity")[0]
+    on_disk = NetworkArrays.load(tmp_path / "store", mmap_mode=None)
+    np.testing.assert_array_equal(on_disk.edge_column("capacity"), simulator.arrays.edge_column("capacity"))
+
+
+def test_session_snapshots_restore_and_fork(client):
+    sim_id = client.post("/simulations", params={"seed": 3}).json()["sim_id"]
+    snapshot = client.post(f"/simulations/{sim_id}/snapshots").json()["snapshot_id"]
+    before = client.get(f"/simulations/{sim_id}/health").json()
+    for _ in range(3):
+        client.post(f"/simulations/{sim_id}/step")
+
+    forked = client.post(f"/simulations/{sim_id}/fork", params={"snapshot_id": snapshot}).json()
+    assert forked["forked_from"] == sim_id
+    assert client.get(f"/simulations/{forked['sim_id']}/health").json() == before
+
+    restored = client.post(f"/simulations/{sim_id}/snapshots/{snapshot}/restore").json()
+    assert restored["health"] == before
+    assert [s["snapshot_id"] for s in client.get(f"/simulations/{sim_id}/snapshots").json()] == [snapshot]
+    assert client.delete(f"/simulations/{sim_id}/snapshots/{snapshot}").status_code == 200
+    assert client.post(f"/simulations/{sim_id}/snapshots/{snapshot}/restore").status_code == 404
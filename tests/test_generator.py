@@ -0,0 +1,87 @@
+import numpy as np
+
+from semiconductor_resilience.core.data_generator import (
+    CHIP_TYPES,
+    NODE_TYPES,
+    PROCESS_NODES,
+    SupplyChainDataGenerator,
+)
+from semiconductor_resilience.data.models import NodeType
+
+
+def test_generate_network_shapes():
+    network = SupplyChainDataGenerator(seed=3).generate_network(
+        num_fabs=20, num_suppliers=50, num_customers=40, num_distributors=10, num_logistics=5
+    )
+
+    assert network.num_nodes == 125
+    assert all(len(column) == network.num_nodes for column in network.nodes.values())
+    assert all(len(column) == network.num_edges for column in network.edges.values())
+    assert network.num_edges > 0
+    assert np.bincount(network.nodes["type"], minlength=len(NODE_TYPES))[
+        NODE_TYPES.index(NodeType.FAB)
+    ] == 20
+
+
+def test_generate_network_edges_are_distinct_and_bounded():
+    network = SupplyChainDataGenerator(seed=3).generate_network(
+        num_fabs=50, num_suppliers=200, num_customers=200, max_out_degree=4
+    )
+    source, target = network.edges["source"], network.edges["target"]
+
+    assert source.min() >= 0 and target.max() < network.num_nodes
+    pairs = source * network.num_nodes + target
+    assert len(np.unique(pairs)) == len(pairs)
+    # Every source connects to at most one tier of targets here
+    assert np.bincount(source).mean() < 3 * 4
+
+
+def test_generate_network_codes_are_in_range():
+    network = SupplyChainDataGenerator(seed=3).generate_network(num_fabs=30, num_suppliers=30)
+
+    assert network.nodes["country"].max() < len(network.countries)
+    assert 0 < network.nodes["process_nodes"].min()
+    assert network.nodes["process_nodes"].max() < 1 << len(PROCESS_NODES)
+    assert network.nodes["chip_types"].max() < 1 << len(CHIP_TYPES)
+    assert len(set(network.node_ids())) == network.num_nodes
+
+
+def test_generate_network_is_seeded():
+    first = SupplyChainDataGenerator(seed=3).generate_network(num_fabs=10, num_suppliers=20)
+    second = SupplyChainDataGenerator(seed=3).generate_network(num_fabs=10, num_suppliers=20)
+    other = SupplyChainDataGenerator(seed=4).generate_network(num_fabs=10, num_suppliers=20)
+
+    for name in first.nodes:
+        np.testing.assert_array_equal(first.nodes[name], second.nodes[name])
+    for name in first.edges:
+        np.testing.assert_array_equal(first.edges[name], second.edges[name])
+    assert first.node_ids() != other.node_ids()
+
+
+def test_to_models_matches_columns():
+    network = SupplyChainDataGenerator(seed=3).generate_network(num_fabs=5, num_suppliers=10)
+    nodes, edges = network.to_models()
+
+    assert [str(node.id) for node in nodes] == network.node_ids()
+    assert [node.capacity for node in nodes] == network.nodes["capacity"].tolist()
+    assert [node.location.country for node in nodes] == [
+        network.countries[code] for code in network.nodes["country"]
+    ]
+    for node, mask in zip(nodes, network.nodes["process_nodes"].tolist()):
+        assert [PROCESS_NODES.index(p) for p in node.process_nodes] == [
+            bit for bit in range(len(PROCESS_NODES)) if mask >> bit & 1
+        ]
+    assert [(edge.source_id, edge.target_id) for edge in edges] == [
+        (nodes[s].id, nodes[t].id) for s, t in zip(network.edges["source"], network.edges["target"])
+    ]
+
+
+def test_to_arrays_matches_columns():
+    network = SupplyChainDataGenerator(seed=3).generate_network(num_fabs=5, num_suppliers=10)
+    arrays = network.to_arrays()
+
+    assert arrays.num_nodes == network.num_nodes
+    assert arrays.num_edges == network.num_edges
+    assert list(arrays.node_ids) == network.node_ids()
+    np.testing.assert_array_equal(arrays.node_column("capacity"), network.nodes["capacity"])
+    np.testing.assert_array_equal(arrays.edge_column("lead_time_days"), network.edges["lead_time_days"])
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from semiconductor_resilience.api import main
+from semiconductor_resilience.api.jobs import JobManager, JobQueueFull
+
+
+def wait(job, timeout=10.0):
+    deadline = time.time() + timeout
+    while not job.done:
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+def test_job_reports_result_and_progress():
+    manager = JobManager(max_job_workers=1)
+
+    def work(job):
+        job.report(1, 2)
+        return 42
+
+    job = wait(manager.submit("run", work, sim_id="a"))
+    assert (job.status, job.result, job.progress) == ("succeeded", 42, 1.0)
+    assert job.started_at <= job.finished_at
+    assert manager.get(job.job_id) is job
+    assert manager.list()[0]["result"] is None
+    manager.shutdown()
+
+
+def test_failed_job_records_error():
+    manager = JobManager(max_job_workers=1)
+
+    def work(job):
+        raise ValueError("bad horizon")
+
+    job = wait(manager.submit("run", work))
+    assert job.status == "failed"
+    assert job.error == "ValueError: bad horizon"
+    manager.shutdown()
+
+
+def test_queue_is_bounded():
+    manager = JobManager(max_job_workers=1, max_queued=2)
+    release = threading.Event()
+    queued = [manager.submit("run", lambda job: release.wait(5)) for _ in range(2)]
+    with pytest.raises(JobQueueFull):
+        manager.submit("run", lambda job: None)
+    release.set()
+    for job in queued:
+        wait(job)
+    wait(manager.submit("run", lambda job: None))
+    manager.shutdown()
+
+
+def test_finished_jobs_are_pruned():
+    manager = JobManager(max_job_workers=1, max_finished=2)
+    finished = [wait(manager.submit("run", lambda job: None)) for _ in range(3)]
+    manager.submit("run", lambda job: None)
+    with pytest.raises(KeyError):
+        manager.get(finished[0].job_id)
+    assert manager.get(finished[2].job_id) is finished[2]
+    manager.shutdown()
+
+
+def test_run_uses_the_request_pool():
+    manager = JobManager(max_workers=1)
+
+    async def main_thread_free():
+        return await manager.run(threading.current_thread), threading.current_thread()
+
+    worker, loop_thread = asyncio.run(main_thread_free())
+    assert worker is not loop_thread
+    assert worker.name.startswith("simulation")
+    manager.shutdown()
+
+
+def test_api_runs_jobs(client):
+    sim_id = client.post("/simulations", params={"seed": 5}).json()["sim_id"]
+    submitted = client.post("/jobs", json={"kind": "run", "sim_id": sim_id, "n_steps": 5})
+    assert submitted.status_code == 202
+
+    job_id = submitted.json()["job_id"]
+    deadline = time.time() + 10
+    while (info := client.get(f"/jobs/{job_id}").json())["status"] not in ("succeeded", "failed"):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert info["status"] == "succeeded"
+    assert info["progress"] == 1.0
+    assert info["result"]["steps"] == 5
+    assert job_id in [job["job_id"] for job in client.get("/jobs").json()]
+
+
+def test_api_rejects_bad_jobs(client, monkeypatch):
+    assert client.post("/jobs", json={"kind": "sweep"}).status_code == 400
+    assert client.post("/jobs", json={"kind": "run", "sim_id": "missing"}).status_code == 404
+    assert client.get("/jobs/missing").status_code == 404
+
+    sim_id = client.post("/simulations").json()["sim_id"]
+    monkeypatch.setattr(main, "jobs", JobManager(max_queued=0))
+    assert client.post("/jobs", json={"kind": "run", "sim_id": sim_id}).status_code == 429
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.web.layout import (
+    LayoutCache,
+    geographic_layout,
+    grid_force_layout,
+    topology_key,
+)
+
+
+def chain(count, longitude=0.0):
+    """`count` nodes at one location, linked in a chain."""
+    nodes = [
+        {"id": f"n{i}", "location": {"longitude": longitude, "latitude": 10.0}} for i in range(count)
+    ]
+    edges = [{"source_id": f"n{i}", "target_id": f"n{i + 1}"} for i in range(count - 1)]
+    return nodes, edges
+
+
+def test_topology_key_ignores_order_and_attributes():
+    nodes, edges = chain(5)
+    shuffled = [dict(node, capacity=1.0) for node in reversed(nodes)]
+    assert topology_key(shuffled, list(reversed(edges))) == topology_key(nodes, edges)
+    assert topology_key(nodes, edges[:-1]) != topology_key(nodes, edges)
+    reversed_edge = dict(edges[0], source_id=edges[0]["target_id"], target_id=edges[0]["source_id"])
+    assert topology_key(nodes, [reversed_edge] + edges[1:]) != topology_key(nodes, edges)
+
+
+def test_geographic_layout_spreads_shared_locations():
+    nodes, _ = chain(4)
+    alone = {"id": "x", "location": {"longitude": 50.0, "latitude": -5.0}}
+    pos = geographic_layout(nodes + [alone])
+
+    assert pos["x"] == (50.0, -5.0)
+    shared = np.array([pos[node["id"]] for node in nodes])
+    assert len({tuple(point) for point in shared}) == 4
+    np.testing.assert_allclose(shared.mean(axis=0), (0.0, 10.0), atol=1e-9)
+
+
+def test_grid_force_layout_is_bounded_and_seeded():
+    rng = np.random.default_rng(0)
+    edges = rng.integers(0, 1000, size=(3000, 2))
+    pos = grid_force_layout(edges, 1000, iterations=10)
+
+    assert pos.shape == (1000, 2)
+    assert np.abs(pos).max() == pytest.approx(1.0)
+    np.testing.assert_array_equal(pos, grid_force_layout(edges, 1000, iterations=10))
+
+
+def test_grid_force_layout_keeps_neighbours_closer():
+    # Two dense communities joined by one edge end up apart
+    rng = np.random.default_rng(1)
+    left = rng.integers(0, 300, size=(1500, 2))
+    edges = np.vstack([left, left + 300, [[0, 300]]])
+    pos = grid_force_layout(edges, 600, iterations=50)
+    within = np.linalg.norm(pos[:300].mean(axis=0) - pos[:300], axis=1).mean()
+    between = np.linalg.norm(pos[:300].mean(axis=0) - pos[300:].mean(axis=0))
+    assert between > within
+
+
+def test_cache_reuses_layout_for_unchanged_topology():
+    cache = LayoutCache()
+    nodes, edges = chain(10)
+    first = cache.positions(nodes, edges)
+    again = cache.positions([dict(node, capacity=2.0) for node in nodes], edges)
+
+    assert again is first
+    assert cache.positions(nodes, edges, "geographic") is not first
+    with pytest.raises(ValueError):
+        cache.positions(nodes, edges, "circular")
+
+
+def test_cache_warm_starts_from_previous_layout():
+    cache = LayoutCache(warm_iterations=0)
+    nodes, edges = chain(10)
+    first = cache.positions(nodes, edges)
+    grown_nodes, grown_edges = chain(11)
+    second = cache.positions(grown_nodes, grown_edges)
+
+    # Without iterations the known nodes only move by the final rescaling,
+    # and the new one joins its neighbour
+    before = np.array([first[node["id"]] for node in nodes])
+    after = np.array([second[node["id"]] for node in nodes])
+    centred = before - before.mean(axis=0)
+    scale = np.abs(after - after.mean(axis=0)).max() / np.abs(centred).max()
+    np.testing.assert_allclose(after - after.mean(axis=0), centred * scale, atol=1e-9)
+    assert np.linalg.norm(np.subtract(second["n10"], second["n9"])) < 0.5
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LayoutCache(max_entries=2)
+    layouts = [cache.positions(*chain(count)) for count in (3, 4, 5)]
+    assert cache.positions(*chain(5)) is layouts[2]
+    assert cache.positions(*chain(3)) is not layouts[0]
+
+
+def test_large_graphs_use_the_grid_layout():
+    cache = LayoutCache(iterations=5)
+    nodes, edges = chain(600)
+    pos = cache.positions(nodes, edges)
+    assert len(pos) == 600
+    assert max(max(abs(x), abs(y)) for x, y in pos.values()) == pytest.approx(1.0)
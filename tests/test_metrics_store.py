@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.engine import METRIC_NAMES
+from semiconductor_resilience.core.metrics_store import MetricsStore, metric_ids
+
+START = datetime(2024, 1, 1)
+NODES = [str(uuid4()) for _ in range(3)]
+
+
+def values(step, count=len(NODES)):
+    """Metrics whose every value identifies its step and node."""
+    return step + np.arange(count)[:, None] / 10 + np.zeros((1, len(METRIC_NAMES)))
+
+
+def fill(store, steps, node_ids=NODES, first=0):
+    for step in range(first, first + steps):
+        store.append(START + timedelta(days=step), node_ids, values(step, len(node_ids)))
+
+
+def test_ring_grows_up_to_retention():
+    store = MetricsStore(retention_steps=20, downsample_days=None)
+    assert len(store._times) == 0
+    fill(store, 3)
+    assert 3 <= len(store._times) < 20
+    fill(store, 40, first=3)
+    assert len(store._times) == 20
+    assert len(store) == 20
+    assert store.steps_appended == 43
+    assert store.oldest_step == 23
+
+
+def test_query_returns_the_retained_window_in_order():
+    store = MetricsStore(retention_steps=5, downsample_days=None)
+    fill(store, 12)
+    times, series = store.query(NODES[1])
+    assert list(times.astype(datetime)) == [START + timedelta(days=step) for step in range(7, 12)]
+    assert np.allclose(series["throughput"], np.arange(7, 12) + 0.1)
+
+    times, _ = store.query(NODES[1], START + timedelta(days=8), START + timedelta(days=9))
+    assert len(times) == 2
+    times, series = store.query(NODES[0], since_step=10)
+    assert np.allclose(series["lead_time"], [10, 11])
+
+
+def test_evicted_steps_are_downsampled_to_bucket_means():
+    store = MetricsStore(retention_steps=7, downsample_days=7)
+    epoch_monday = datetime(1970, 1, 1) + timedelta(days=7 * 2800)
+    for step in range(21):
+        store.append(epoch_monday + timedelta(days=step), NODES, values(step))
+
+    times, series = store.query(NODES[2])
+    assert len(times) == 2 + 7
+    assert np.allclose(series["throughput"][:2], [3 + 0.2, 10 + 0.2])
+    assert np.allclose(series["throughput"][2:], np.arange(14, 21) + 0.2)
+
+
+def test_aggregates_are_bounded():
+    store = MetricsStore(retention_steps=2, downsample_days=1, max_aggregates=3)
+    fill(store, 10)
+    times, _ = store.query(NODES[0])
+    assert len(times) == 3 + 2
+    assert times[0] == np.datetime64(START + timedelta(days=5))
+
+
+def test_nodes_may_join_later():
+    store = MetricsStore(retention_steps=4)
+    fill(store, 2, NODES[:1])
+    fill(store, 2, NODES, first=2)
+    assert len(store.query(NODES[0])[0]) == 4
+    assert len(store.query(NODES[2])[0]) == 2
+
+    columns = store.to_columns()
+    assert len(columns["node"]) == 2 + 2 * 3
+    assert (np.diff(columns["timestamp"].astype(np.int64)) >= 0).all()
+
+
+def test_out_of_order_append_is_rejected():
+    store = MetricsStore()
+    fill(store, 2)
+    with pytest.raises(ValueError):
+        store.append(START, NODES, values(0))
+
+
+def test_fork_shares_history_until_written():
+    store = MetricsStore(retention_steps=4)
+    fill(store, 2)
+    fork = store.fork()
+    assert fork._columns["throughput"] is store._columns["throughput"]
+
+    fork.append(START + timedelta(days=5), NODES, values(5))
+    assert len(store.query(NODES[0])[0]) == 2
+    assert len(fork.query(NODES[0])[0]) == 3
+
+
+def test_models_carry_stable_ids_and_row_timestamps():
+    store = MetricsStore()
+    for step in range(3):
+        # Quality scores must stay within [0, 1] to validate
+        store.append(START + timedelta(days=step), NODES, values(step) / 10)
+    first = store.to_models(NODES[0])
+    again = store.to_model_dict()[NODES[0]]
+    assert [model.id for model in first] == [model.id for model in again]
+    assert len({model.id for model in first}) == 3
+    assert all(model.created_at == model.timestamp for model in first)
+
+    columns = store.to_columns()
+    ids = metric_ids(store.node_ids, columns["node"], columns["timestamp"])
+    assert {str(model.id) for model in first} <= set(ids)
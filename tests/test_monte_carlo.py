@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.monte_carlo import (
+    MonteCarloEnsemble,
+    StreamingHistogram,
+    ensemble_executor,
+)
+
+
+def assert_same(result, expected):
+    """Chunks merge in any order, so only the float totals may differ."""
+    for name in ("throughput_loss", "recovery_days"):
+        assert (getattr(result, name).counts == getattr(expected, name).counts).all()
+        assert getattr(result, name).mean == pytest.approx(getattr(expected, name).mean)
+    assert (result.scenario_counts == expected.scenario_counts).all()
+
+
+@pytest.fixture
+def ensemble(network, build_simulator):
+    generator = network[0]
+    return MonteCarloEnsemble(
+        build_simulator("vectorized"), generator.scenario_catalogue(), horizon_days=90
+    )
+
+
+def test_histogram_percentiles_and_merge():
+    values = np.linspace(0, 1, 10001)
+    whole = StreamingHistogram(0.0, 1.0, bins=1000)
+    whole.add(values)
+    parts = StreamingHistogram(0.0, 1.0, bins=1000)
+    for chunk in np.array_split(values, 7):
+        partial = StreamingHistogram(0.0, 1.0, bins=1000)
+        partial.add(chunk)
+        parts.merge(partial)
+
+    assert (parts.counts == whole.counts).all()
+    assert parts.count == whole.count == len(values)
+    assert parts.mean == pytest.approx(0.5)
+    assert parts.percentile(50) == pytest.approx(0.5, abs=1e-3)
+    assert parts.percentile(95) == pytest.approx(0.95, abs=1e-3)
+
+
+def test_results_do_not_depend_on_chunking(ensemble):
+    small = ensemble.run(200, seed=3, max_workers=1, chunk_size=7)
+    large = ensemble.run(200, seed=3, max_workers=1, chunk_size=256)
+    assert_same(small, large)
+    assert small.num_trajectories == 200
+    other = ensemble.run(200, seed=4, max_workers=1)
+    assert (other.throughput_loss.counts != small.throughput_loss.counts).any()
+
+
+def test_snapshot_is_independent_of_later_changes(ensemble):
+    base = ensemble.snapshot(seed=3)
+    expected = ensemble.run(100, max_workers=1, base=base).summary()
+    simulator = ensemble.simulator
+    for node_id in list(simulator.state.nodes):
+        simulator.update_node(node_id, utilization=0.01)
+    assert ensemble.run(100, max_workers=1, base=base).summary() == expected
+
+
+def test_progress_reports_every_chunk(ensemble):
+    reports = []
+    ensemble.run(100, max_workers=1, chunk_size=30, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(30, 100), (60, 100), (90, 100), (100, 100)]
+
+
+def test_process_pools_match_in_process_results(ensemble):
+    expected = ensemble.run(300, seed=5, max_workers=1, chunk_size=50)
+    private = ensemble.run(300, seed=5, max_workers=2, chunk_size=50)
+    with ensemble_executor(2) as executor:
+        shared = [
+            ensemble.run(300, seed=5, max_workers=2, chunk_size=50, executor=executor)
+            for _ in range(2)
+        ]
+    for result in (private, *shared):
+        assert_same(result, expected)
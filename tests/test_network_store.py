@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator
+from semiconductor_resilience.core.monte_carlo import MonteCarloEnsemble
+from semiconductor_resilience.core.simulation import SupplyChainSimulator
+
+
+@pytest.fixture
+def stored(build_simulator, tmp_path):
+    """A simulator and the same network reopened from a store."""
+    simulator = build_simulator("vectorized")
+    simulator.save_network_store(tmp_path / "store")
+    return simulator, SupplyChainSimulator.from_network_store(tmp_path / "store")
+
+
+def test_store_round_trips_nodes_and_edges(stored):
+    simulator, loaded = stored
+
+    assert list(loaded.state.nodes) == list(simulator.state.nodes)
+    assert list(loaded.state.edges) == list(simulator.state.edges)
+    for node_id in simulator.state.nodes:
+        # Process nodes and chip types are stored as sets, in enum order
+        node, expected = loaded.state.nodes[node_id].dict(), simulator.state.nodes[node_id].dict()
+        for name in ("process_nodes", "chip_types"):
+            assert sorted(node.pop(name)) == sorted(expected.pop(name))
+        assert node == expected
+    for edge_id in simulator.state.edges:
+        assert loaded.state.edges[edge_id] == simulator.state.edges[edge_id]
+
+
+def test_store_matches_scenarios_like_memory(stored, network):
+    simulator, loaded = stored
+    for scenario in network[0].scenario_catalogue():
+        assert loaded.match_scenario_nodes(scenario) == simulator.match_scenario_nodes(scenario)
+
+
+def test_store_disruption_matches_memory(stored, network):
+    simulator, loaded = stored
+    scenario = network[0].scenario_catalogue()[0]
+
+    for branch in (simulator, loaded):
+        branch.apply_disruption(scenario.copy(deep=True))
+    expected = simulator.simulate_step_arrays()
+    result = loaded.simulate_step_arrays()
+
+    assert result.node_ids == expected.node_ids
+    np.testing.assert_allclose(result.to_array(), expected.to_array())
+    assert loaded.get_supply_chain_health() == pytest.approx(simulator.get_supply_chain_health())
+
+
+def test_store_ensemble_matches_memory(stored, network):
+    simulator, loaded = stored
+    scenarios = network[0].scenario_catalogue()
+    expected = MonteCarloEnsemble(simulator, scenarios, horizon_days=90).run(200, seed=3, max_workers=1)
+    result = MonteCarloEnsemble(loaded, scenarios, horizon_days=90).run(200, seed=3, max_workers=1)
+
+    assert expected.throughput_loss.mean > 0
+    assert (result.throughput_loss.counts == expected.throughput_loss.counts).all()
+    assert result.throughput_loss.mean == pytest.approx(expected.throughput_loss.mean)
+
+
+def test_synthetic_store_matches_models(tmp_path):
+    network = SupplyChainDataGenerator(seed=3).generate_network(num_fabs=10, num_suppliers=20)
+    loaded = SupplyChainSimulator.from_network_store(network.save(tmp_path / "store"))
+    nodes, edges = network.to_models()
+
+    assert list(loaded.state.nodes) == network.node_ids()
+    assert len(loaded.state.edges) == network.num_edges
+    for node in nodes:
+        stored = loaded.state.nodes[str(node.id)]
+        assert stored.dict(exclude={"location", "created_at", "updated_at"}) == node.dict(
+            exclude={"location", "created_at", "updated_at"}
+        )
+        assert stored.location.dict(exclude={"id"}) == node.location.dict(exclude={"id"})
+    scenario = SupplyChainDataGenerator(seed=3).scenario_catalogue()[0]
+    assert loaded.match_scenario_nodes(scenario)
+
+
+def test_arrays_only_store_is_rejected(build_simulator, tmp_path):
+    build_simulator("vectorized").arrays.save(tmp_path / "store")
+    with pytest.raises(ValueError, match="no node records"):
+        SupplyChainSimulator.from_network_store(tmp_path / "store")
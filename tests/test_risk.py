@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator
+
+
+def mild_scenarios(severity: float = 1e-6):
+    """The predefined catalogue, scaled down so no impact score is capped."""
+    return [
+        scenario.copy(update={"impact_severity": severity * (i + 1)})
+        for i, scenario in enumerate(SupplyChainDataGenerator(seed=1).scenario_catalogue())
+    ]
+
+
+def test_matrix_matches_per_node_assessments(build_simulator):
+    simulator = build_simulator("vectorized")
+    simulator.simulate_step()
+    scenarios = mild_scenarios()
+    matrix = simulator.calculate_risk_matrix(scenarios)
+    assert matrix.shape == (len(scenarios), len(simulator.state.nodes))
+
+    for row, scenario in enumerate(scenarios):
+        for assessment in matrix.to_models(row):
+            expected = simulator.calculate_risk_assessment(str(assessment.node_id), scenario)
+            assert expected.impact_score < 1.0
+            assert assessment.risk_score == pytest.approx(expected.risk_score)
+            assert assessment.impact_score == pytest.approx(expected.impact_score)
+            assert assessment.mitigation_cost == pytest.approx(expected.mitigation_cost)
+            assert assessment.recovery_time_days == expected.recovery_time_days
+
+
+def test_top_k_ranks_highest_first(build_simulator):
+    matrix = build_simulator("vectorized").calculate_risk_matrix(mild_scenarios())
+    for by in ("risk_score", "mitigation_cost", "recovery_time_days"):
+        values = getattr(matrix, by)
+        for row, columns in enumerate(matrix.top_k(5, by=by)):
+            assert len(columns) == 5
+            ranked = values[row, columns]
+            assert (np.diff(ranked) <= 0).all()
+            assert ranked[-1] >= np.sort(values[row])[-5]
+    assert len(matrix.top_k(1000)[0]) == matrix.shape[1]
+    with pytest.raises(ValueError):
+        matrix.top_k(5, by="name")
+
+
+def test_affected_only_ranks_matched_nodes(build_simulator):
+    simulator = build_simulator("vectorized")
+    scenarios = mild_scenarios()
+    matrix = simulator.calculate_risk_matrix(scenarios, affected_only=True)
+
+    for row, (scenario, columns, summary) in enumerate(zip(scenarios, matrix.top_k(1000), matrix.summary())):
+        matched = {str(node_id) for node_id in simulator.match_scenario_nodes(scenario)}
+        assert {matrix.node_ids[column] for column in columns} == matched
+        assert summary["nodes_at_risk"] == len(matched)
+
+
+def test_api_risk_matrix(client):
+    client.post("/simulation/initialize", params={"seed": 3})
+    result = client.post("/simulation/risk/matrix", json={"top_k": 3, "sort_by": "impact_score"}).json()
+    assert result["num_scenarios"] == len(result["scenarios"]) > 0
+    for scenario in result["scenarios"]:
+        scores = [node["impact_score"] for node in scenario["top_nodes"]]
+        assert len(scores) == 3 and scores == sorted(scores, reverse=True)
+
+    assert client.post("/simulation/risk/matrix", json={"top_k": 0}).status_code == 400
+    assert client.post("/simulation/risk/matrix", json={"sort_by": "name"}).status_code == 400
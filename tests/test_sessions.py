@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+from semiconductor_resilience.api import main, sessions
+from semiconductor_resilience.api.sessions import SessionRegistry
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator
+
+
+def create(registry, build_simulator, steps=1):
+    simulator = build_simulator("vectorized")
+    for _ in range(steps):
+        simulator.simulate_step()
+    return registry.create(simulator, SupplyChainDataGenerator(seed=1)).sim_id
+
+
+def resident(registry):
+    return {entry["sim_id"] for entry in registry.list() if not entry["spilled"]}
+
+
+def test_least_recently_used_session_is_spilled(tmp_path, build_simulator):
+    registry = SessionRegistry(max_sessions=2, spill_dir=tmp_path)
+    first, second = create(registry, build_simulator), create(registry, build_simulator)
+    with registry.lease(first):
+        pass
+    third = create(registry, build_simulator)
+
+    assert resident(registry) == {first, third}
+    assert second in registry
+    assert len(list(tmp_path.glob(f"{second}-*.pkl"))) == 1
+
+
+def test_spilled_session_round_trips(tmp_path, build_simulator):
+    registry = SessionRegistry(max_sessions=1, spill_dir=tmp_path)
+    sim_id = create(registry, build_simulator, steps=3)
+    with registry.lease(sim_id) as session:
+        session.snapshot()
+        before = session.simulator
+        state = (before.version, before.state.timestamp, dict(before.get_supply_chain_health()))
+        history = before.state.metrics.query(before.state.metrics.node_ids[0])
+
+    create(registry, build_simulator)
+    assert sim_id not in resident(registry)
+
+    with registry.lease(sim_id) as session:
+        after = session.simulator
+        assert after is not before
+        assert (after.version, after.state.timestamp, after.get_supply_chain_health()) == state
+        times, values = after.state.metrics.query(after.state.metrics.node_ids[0])
+        assert (times == history[0]).all()
+        assert all((values[name] == history[1][name]).all() for name in values)
+        assert len(session.snapshots) == 1
+        after.simulate_step()
+    assert not list(tmp_path.glob(f"{sim_id}-*.pkl"))
+
+
+def test_leased_session_is_not_evicted(tmp_path, build_simulator):
+    registry = SessionRegistry(max_sessions=1, spill_dir=tmp_path)
+    sim_id = create(registry, build_simulator)
+    with registry.lease(sim_id):
+        other = create(registry, build_simulator)
+        assert resident(registry) == {sim_id, other}
+    create(registry, build_simulator)
+    assert sim_id not in resident(registry)
+
+
+def test_failed_load_keeps_spilled_session(tmp_path, build_simulator, monkeypatch):
+    registry = SessionRegistry(max_sessions=1, spill_dir=tmp_path)
+    sim_id = create(registry, build_simulator)
+    create(registry, build_simulator)
+
+    def fail(handle):
+        raise OSError("read failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(sessions.pickle, "load", fail)
+        with pytest.raises(OSError):
+            registry.acquire(sim_id)
+    assert sim_id in registry
+    with registry.lease(sim_id) as session:
+        assert session.simulator.state.nodes
+
+
+def test_session_leased_while_spilling_stays_resident(tmp_path, build_simulator, monkeypatch):
+    registry = SessionRegistry(max_sessions=1, spill_dir=tmp_path)
+    first = create(registry, build_simulator)
+    spill, leased = registry._spill, []
+
+    def spill_and_lease(session):
+        path = spill(session)
+        if not leased:
+            # The registry lock is not held while writing, so this cannot block
+            worker = threading.Thread(target=lambda: leased.append(registry.acquire(first)))
+            worker.start()
+            worker.join(timeout=5)
+            assert leased
+        return path
+
+    monkeypatch.setattr(registry, "_spill", spill_and_lease)
+    second = create(registry, build_simulator)
+
+    assert resident(registry) == {first, second}
+    assert not list(tmp_path.glob("*.pkl"))
+    registry.release(leased[0])
+    create(registry, build_simulator)
+    assert first not in resident(registry)
+
+
+def test_memory_budget_drops_sessions_without_spill_dir(build_simulator):
+    registry = SessionRegistry(memory_budget_bytes=1)
+    first = create(registry, build_simulator)
+    second = create(registry, build_simulator)
+    assert first not in registry
+    assert resident(registry) == {second}
+    with pytest.raises(KeyError):
+        registry.acquire(first)
+
+
+def test_api_reloads_spilled_sessions(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "registry", SessionRegistry(max_sessions=1, spill_dir=tmp_path))
+    first = client.post("/simulations", params={"seed": 5}).json()
+    client.post("/simulations")
+    assert [entry["spilled"] for entry in client.get("/simulations").json()] == [False, True]
+
+    health = client.get(f"/simulations/{first['sim_id']}/health")
+    assert health.status_code == 200
+    assert health.json() == first["health"]
+    assert client.delete(f"/simulations/{first['sim_id']}").status_code == 200
+    assert client.get(f"/simulations/{first['sim_id']}/health").status_code == 404
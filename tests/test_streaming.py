@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from semiconductor_resilience.api.jobs import JobManager
+from semiconductor_resilience.api.sessions import SessionRegistry
+from semiconductor_resilience.api.streaming import SimulationStream
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator
+
+
+def collect(stream):
+    async def run():
+        return [event async for event in stream.events()]
+
+    return asyncio.run(run())
+
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_samples_steps(build_simulator):
+    registry = SessionRegistry()
+    session = registry.create(build_simulator("vectorized"), SupplyChainDataGenerator(seed=1))
+    events = collect(SimulationStream(registry, session.sim_id, JobManager(), n_steps=10, sample_every=4))
+
+    assert [event["event"] for event in events] == ["step", "step", "step", "end"]
+    assert [event["step"] for event in events[:-1]] == [4, 8, 10]
+    assert events[-1]["steps"] == 10
+    assert events[-1]["version"] == session.simulator.version
+    assert len(events[0]["changed"]["node_ids"]) == len(session.simulator.state.nodes)
+    assert session.health == session.simulator.get_supply_chain_health()
+    assert not session.leases and not session.lock.locked()
+
+
+def test_stream_reports_unknown_sessions():
+    events = collect(SimulationStream(SessionRegistry(), "missing", JobManager(), n_steps=3))
+    assert events == [{"event": "error", "steps": 0, "detail": "Simulation missing not found."}]
+
+
+def test_stream_releases_the_lock_between_steps(build_simulator):
+    registry = SessionRegistry()
+    session = registry.create(build_simulator("vectorized"), SupplyChainDataGenerator(seed=1))
+    stream = SimulationStream(registry, session.sim_id, JobManager(), n_steps=5)
+
+    async def run():
+        events = stream.events()
+        first = await events.__anext__()
+        # Another request can step the session while the stream is paused
+        locked = session.lock.locked()
+        with session.lock:
+            session.simulator.simulate_step()
+        rest = [event async for event in events]
+        return first, locked, rest
+
+    first, locked, rest = asyncio.run(run())
+    assert not locked
+    assert [event["step"] for event in rest[:-1]] == [2, 3, 4, 5]
+    assert rest[-1]["version"] > first["version"] + 4
+
+
+def test_sse_endpoint(client):
+    client.post("/simulation/initialize", params={"seed": 3})
+    response = client.get("/simulation/stream", params={"n_steps": 6, "sample_every": 3})
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(response.text)
+    assert [name for name, _ in events] == ["step", "step", "end"]
+    assert events[0][1]["totals"]["throughput"] > 0
+
+
+def test_websocket_endpoint_serves_other_requests_mid_stream(client):
+    sim_id = client.post("/simulations", params={"seed": 3}).json()["sim_id"]
+    with client.websocket_connect(f"/simulations/{sim_id}/ws") as websocket:
+        websocket.send_json({"n_steps": 4})
+        first = websocket.receive_json()
+        assert client.post(f"/simulations/{sim_id}/step").status_code == 200
+        events = [first] + [websocket.receive_json() for _ in range(4)]
+
+    assert [event["event"] for event in events] == ["step"] * 4 + ["end"]
+    assert events[-1]["steps"] == 4
+
+
+def test_websocket_rejects_bad_requests(client):
+    with client.websocket_connect("/simulations/missing/ws") as websocket:
+        websocket.send_json({"n_steps": 4})
+        assert websocket.receive_json()["event"] == "error"
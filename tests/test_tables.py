@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+import pytest
+
+from semiconductor_resilience.api import main
+from semiconductor_resilience.core.data_generator import SupplyChainDataGenerator
+
+
+def test_edge_replaced_between_the_same_nodes_leaves_the_table(build_simulator):
+    simulator = build_simulator("vectorized")
+    edges = simulator.state.edges
+    count = len(edges)
+    old_id = next(iter(edges))
+    replacement = edges[old_id].copy(update={"id": uuid4(), "capacity": 1.0})
+
+    simulator.add_edge(replacement)
+
+    assert len(edges) == count == len(list(edges))
+    assert old_id not in edges and str(replacement.id) in edges
+    assert old_id not in list(edges)
+    with pytest.raises(KeyError):
+        edges[old_id]
+    with pytest.raises(KeyError):
+        simulator.update_edge(old_id, capacity=2.0)
+    assert edges[str(replacement.id)].capacity == 1.0
+
+
+def test_edge_moved_to_other_nodes_keeps_its_slot(build_simulator):
+    simulator = build_simulator("vectorized")
+    edges = simulator.state.edges
+    count = len(edges)
+    edge_id, other_id = list(edges)[:2]
+    other = edges[other_id]
+    slot = edges.slot(edge_id)
+
+    # Moving an edge onto another edge's endpoints replaces that edge
+    simulator.add_edge(edges[edge_id].copy(update={"source_id": other.source_id, "target_id": other.target_id}))
+
+    assert edges.slot(edge_id) == slot
+    assert (edges[edge_id].source_id, edges[edge_id].target_id) == (other.source_id, other.target_id)
+    assert other_id not in edges
+    assert len(edges) == count - 1 == len(list(edges))
+
+
+def test_forks_and_responses_list_live_edges(build_simulator, client):
+    simulator = build_simulator("vectorized")
+    old_id = next(iter(simulator.state.edges))
+    simulator.add_edge(simulator.state.edges[old_id].copy(update={"id": uuid4()}))
+    fork = simulator.fork()
+    assert list(fork.state.edges) == list(simulator.state.edges)
+    assert old_id not in fork.state.edges
+
+    sim_id = main.registry.create(simulator, SupplyChainDataGenerator(seed=1)).sim_id
+    state = client.post(f"/simulations/{sim_id}/step").json()
+    assert [edge["id"] for edge in state["edges"]] == list(simulator.state.edges)